@@ -11,7 +11,6 @@ import argparse
 import pkg_resources
 
 from vsgen.suite import VSGSuite
-from vsgen.util.config import VSGConfigParser
 from vsgen.util.argparse import DirectoryType
 
 
@@ -27,17 +26,8 @@ class VSGDemoSuite(VSGSuite):
 
         :param kwargs:         List of arbitrary keyworded arguments to be processed as instance variable data.
         """
-        # Read the configuration file
-        config = VSGConfigParser()
-        if self.__template__ not in config.read([self.__template__]):
-            raise ValueError('Could not read VSG template configuration file %s.' % __template__)
-
-        # Override the template values with the override values.
-        for s in config.sections():
-            for o in config.options(s):
-                override = kwargs.pop(o, None)
-                if override:
-                    config.set(s, o, override)
+        # Overlay the override values on the template configuration file.
+        config = self.template_config(**kwargs)
 
         super(VSGDemoSuite, self).__init__(config)
 
@@ -6,16 +6,27 @@ import sys
 import os
 import importlib
 import shutil
+import tempfile
 import unittest
 import logging
 
 
+_cache = None
+_environ = None
+
+
 def setUpModule():
     """
     The module specific setUp method
     """
+    global _cache, _environ
     logging.disable(logging.CRITICAL)
 
+    # Keep the cache files out of the user's cache directory
+    _cache = tempfile.mkdtemp()
+    _environ = os.environ.get('VSGEN_CACHE_DIR')
+    os.environ['VSGEN_CACHE_DIR'] = _cache
+
 
 def tearDownModule():
     """
@@ -23,6 +34,12 @@ def tearDownModule():
     """
     logging.disable(logging.NOTSET)
 
+    if _environ is None:
+        del os.environ['VSGEN_CACHE_DIR']
+    else:
+        os.environ['VSGEN_CACHE_DIR'] = _environ
+    shutil.rmtree(_cache)
+
 
 class TestIntegrationPackage(unittest.TestCase):
     """
@@ -6,18 +6,29 @@ import sys
 import os
 import unittest
 import shutil
+import tempfile
 import logging
 import pkg_resources
 
 from vsgen import __main__
 
 
+_cache = None
+_environ = None
+
+
 def setUpModule():
     """
     The module specific setUp method
     """
+    global _cache, _environ
     logging.disable(logging.CRITICAL)
 
+    # Keep the cache files out of the user's cache directory
+    _cache = tempfile.mkdtemp()
+    _environ = os.environ.get('VSGEN_CACHE_DIR')
+    os.environ['VSGEN_CACHE_DIR'] = _cache
+
     # Ensure that the Demo Python packages are available
     datadir = os.path.join(os.path.dirname(__file__), '..', 'data')
     if datadir not in sys.path:
@@ -53,6 +64,12 @@ def tearDownModule():
     """
     logging.disable(logging.NOTSET)
 
+    if _environ is None:
+        del os.environ['VSGEN_CACHE_DIR']
+    else:
+        os.environ['VSGEN_CACHE_DIR'] = _environ
+    shutil.rmtree(_cache)
+
 
 class TestIntegrationConfigurationFile(unittest.TestCase):
     """
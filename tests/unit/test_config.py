@@ -0,0 +1,305 @@
+# -*- coding: utf-8 -*-
+"""
+This module provides all unit tests for the configuration parser functionality.
+"""
+import os
+import glob
+import json
+import shutil
+import tempfile
+import threading
+import unittest
+import configparser
+from multiprocessing.pool import ThreadPool
+
+from vsgen.util import config
+from vsgen.util.config import VSGConfigParser
+
+CONFIG = """
+[DEFAULT]
+label = ${name} project
+
+[vsgen]
+root = ..
+
+[vsgen.project.test]
+name = test
+root = ${vsgen:root}/test
+price = $$5
+"""
+
+
+class VSGUncachedConfigParser(VSGConfigParser):
+    """
+    A configuration parser that fails to parse files, so only cached files can be read.
+    """
+
+    def read(self, filenames, encoding=None):
+        """
+        Fails to read any file.
+        """
+        raise AssertionError('The configuration file was parsed.')
+
+
+class TestConfigCache(unittest.TestCase):
+    """
+    Tests the cache of resolved configuration files.
+    """
+
+    def setUp(self):
+        """
+        The class specific setUp method
+        """
+        self._root = tempfile.mkdtemp()
+        self._environ = os.environ.get('VSGEN_CACHE_DIR')
+        os.environ['VSGEN_CACHE_DIR'] = os.path.join(self._root, 'cache')
+        self._filename = os.path.join(self._root, 'test.cfg')
+        with open(self._filename, 'wt') as f:
+            f.write(CONFIG)
+
+    def tearDown(self):
+        """
+        The class specific tearDown method
+        """
+        if self._environ is None:
+            del os.environ['VSGEN_CACHE_DIR']
+        else:
+            os.environ['VSGEN_CACHE_DIR'] = self._environ
+        shutil.rmtree(self._root)
+
+    def test_cache(self):
+        """
+        Tests that a resolved configuration file is loaded from the cache until it or its overrides change.
+        """
+        overrides = {'vsgen': {'root': 'base'}}
+        config = VSGConfigParser()
+        self.assertEqual(config.read_cached(self._filename, overrides=overrides), [self._filename])
+
+        cached = VSGUncachedConfigParser()
+        self.assertEqual(cached.read_cached(self._filename, overrides=overrides), [self._filename])
+        self.assertEqual(cached.sections(), config.sections())
+        self.assertEqual(cached.items('vsgen.project.test'), config.items('vsgen.project.test'))
+        self.assertEqual(cached.get('vsgen', 'label', raw=True), '${name} project')
+        self.assertEqual(cached.get('vsgen.project.test', 'root'), 'base/test')
+        self.assertEqual(cached.get('vsgen.project.test', 'label'), 'test project')
+        self.assertEqual(cached.get('vsgen.project.test', 'price'), '$5')
+        self.assertEqual(cached.defaults(), config.defaults())
+
+        self.assertRaises(AssertionError, VSGUncachedConfigParser().read_cached, self._filename, overrides={'vsgen': {'root': 'other'}})
+        with open(self._filename, 'at') as f:
+            f.write('type = test\n')
+        self.assertRaises(AssertionError, VSGUncachedConfigParser().read_cached, self._filename, overrides=overrides)
+
+    def test_single_entry(self):
+        """
+        Tests that each configuration file has a single cache file, replaced when it is stale, and that an invalid cache file is ignored.
+        """
+        cache = os.environ['VSGEN_CACHE_DIR']
+        VSGConfigParser().read_cached(self._filename, overrides={'vsgen': {'root': 'base'}})
+        VSGConfigParser().read_cached(self._filename, overrides={'vsgen': {'root': 'other'}})
+        self.assertEqual(len(os.listdir(cache)), 1)
+
+        filename = os.path.join(cache, os.listdir(cache)[0])
+        with open(filename, 'rt') as f:
+            cached = json.load(f)
+        cached['resolved'] = [[], [['vsgen', {'root': 'invalid'}]]]
+        with open(filename, 'wt') as f:
+            json.dump(cached, f)
+        config = VSGConfigParser()
+        self.assertEqual(config.read_cached(self._filename, overrides={'vsgen': {'root': 'other'}}), [self._filename])
+        self.assertEqual(config.get('vsgen.project.test', 'root'), 'other/test')
+
+    def test_missing(self):
+        """
+        Tests that a missing configuration file is not read.
+        """
+        self.assertEqual(VSGConfigParser().read_cached(os.path.join(self._root, 'missing.cfg')), [])
+
+
+class TestConfigMemo(unittest.TestCase):
+    """
+    Tests the memoized values of the configuration parser.
+    """
+
+    def setUp(self):
+        """
+        The class specific setUp method
+        """
+        self._config = VSGConfigParser()
+        self._config.read_string(CONFIG)
+        self._calls = []
+        before_get = self._config._interpolation.before_get
+        self._config._interpolation.before_get = lambda *args: self._calls.append(args[2]) or before_get(*args)
+
+    def test_memoized(self):
+        """
+        Tests that interpolated and converted values are computed once.
+        """
+        for _ in range(3):
+            self.assertEqual(self._config.get('vsgen.project.test', 'root'), '../test')
+            self.assertEqual(self._config.getdir('vsgen.project.test', 'root'), os.path.normpath('../test'))
+        self.assertEqual(self._calls, ['root'])
+
+        values = self._config.getlist('vsgen.project.test', 'label', delimiters=' ')
+        values.append('modified')
+        self.assertEqual(self._config.getlist('vsgen.project.test', 'label', delimiters=' '), ['test', 'project'])
+        self.assertEqual(self._config.getlist('vsgen.project.test', 'missing'), [])
+        self.assertEqual(self._config.get('vsgen.project.test', 'missing', fallback='default'), 'default')
+        self.assertRaises(configparser.NoOptionError, self._config.get, 'vsgen.project.test', 'missing')
+
+    def test_invalidated(self):
+        """
+        Tests that the memoized values are discarded when the parser changes.
+        """
+        self.assertEqual(self._config.get('vsgen.project.test', 'root'), '../test')
+        self._config.set('vsgen', 'root', 'base')
+        self.assertEqual(self._config.get('vsgen.project.test', 'root'), 'base/test')
+        self._config.read_string('[vsgen]\nroot = other\n')
+        self.assertEqual(self._config.get('vsgen.project.test', 'root'), 'other/test')
+        self._config.remove_option('vsgen.project.test', 'root')
+        self.assertEqual(self._config.get('vsgen.project.test', 'root', fallback=None), None)
+
+    def test_threads(self):
+        """
+        Tests that the memoized values are shared between threads.
+        """
+        pool = ThreadPool(8)
+        try:
+            values = pool.map(lambda i: self._config.getlist('vsgen.project.test', 'label', delimiters=' '), range(64))
+        finally:
+            pool.close()
+            pool.join()
+        self.assertEqual(values, [['test', 'project']] * 64)
+
+
+class TestConfigTemplate(unittest.TestCase):
+    """
+    Tests the overlays of template configuration files.
+    """
+
+    def setUp(self):
+        """
+        The class specific setUp method
+        """
+        self._root = tempfile.mkdtemp()
+        self._filename = os.path.join(self._root, 'template.cfg')
+        with open(self._filename, 'wt') as f:
+            f.write(CONFIG)
+
+    def tearDown(self):
+        """
+        The class specific tearDown method
+        """
+        shutil.rmtree(self._root)
+
+    def test_overlay(self):
+        """
+        Tests that a template is parsed once and that its overlays do not affect each other.
+        """
+        first = VSGConfigParser.from_template(self._filename, root='first', missing='ignored')
+        second = VSGConfigParser.from_template(self._filename)
+        self.assertIs(first._sections['vsgen.project.test'], second._sections['vsgen.project.test'])
+
+        self.assertEqual(first.get('vsgen', 'root'), 'first')
+        self.assertEqual(first.get('vsgen.project.test', 'root'), 'first/test')
+        self.assertEqual(first.get('vsgen.project.test', 'label'), 'test project')
+        self.assertEqual(second.get('vsgen.project.test', 'root'), '../test')
+        self.assertEqual(second.get('vsgen.project.test', 'label'), 'test project')
+
+        second.read_string('[vsgen.project.test]\nprice = 10\n')
+        second.remove_option('vsgen.project.test', 'label')
+        second.set('DEFAULT', 'extra', 'value')
+        third = VSGConfigParser.from_template(self._filename)
+        self.assertEqual(third.get('vsgen.project.test', 'price'), '$5')
+        self.assertEqual(third.get('vsgen.project.test', 'label'), 'test project')
+        self.assertFalse(third.has_option('vsgen', 'extra'))
+        self.assertTrue(second.has_option('vsgen', 'extra'))
+
+    def test_assign(self):
+        """
+        Tests that assigning or deleting a whole section of an overlay does not affect the template's other overlays.
+        """
+        first = VSGConfigParser.from_template(self._filename)
+        first['vsgen.project.test'] = {'name': 'replaced'}
+        first['DEFAULT'] = {'label': 'replaced'}
+        del first['vsgen']
+        second = VSGConfigParser.from_template(self._filename)
+        self.assertEqual(first.get('vsgen.project.test', 'label'), 'replaced')
+        self.assertFalse(first.has_option('vsgen.project.test', 'root'))
+        self.assertEqual(second.get('vsgen.project.test', 'root'), '../test')
+        self.assertEqual(second.get('vsgen.project.test', 'label'), 'test project')
+
+        first['vsgen'] = {'root': 'first'}
+        self.assertEqual(first.get('vsgen', 'root'), 'first')
+        self.assertEqual(second.get('vsgen', 'root'), '..')
+
+    def test_update(self):
+        """
+        Tests that an override value sets the option in the first section that has it.
+        """
+        config = VSGConfigParser()
+        config.read_string(CONFIG)
+        self.assertEqual(config.update(root='base', name='', missing='value'), {'name': '', 'missing': 'value'})
+        self.assertEqual(config.get('vsgen', 'root'), 'base')
+        self.assertEqual(config.get('vsgen.project.test', 'root', raw=True), '${vsgen:root}/test')
+
+    def test_missing(self):
+        """
+        Tests that a missing template cannot be read.
+        """
+        self.assertRaises(ValueError, VSGConfigParser.from_template, os.path.join(self._root, 'missing.cfg'))
+
+
+class TestConfigGlobs(unittest.TestCase):
+    """
+    Tests the expansion of the directory patterns.
+    """
+
+    def setUp(self):
+        """
+        The class specific setUp method
+        """
+        self._root = tempfile.mkdtemp()
+        for directory in ['lib/one', 'lib/two', 'src/one', '.hidden/one']:
+            os.makedirs(os.path.join(self._root, *directory.split('/')))
+        open(os.path.join(self._root, 'lib', 'file'), 'w').close()
+        config.clear_globs()
+
+    def tearDown(self):
+        """
+        The class specific tearDown method
+        """
+        config.clear_globs()
+        shutil.rmtree(self._root)
+
+    def test_getdirs(self):
+        """
+        Tests that the patterns match the same directories as glob and that each expansion is cached.
+        """
+        patterns = [os.path.join(self._root, *p.split('/')) for p in ['lib/*', '*/one', 'src', 'lib/file', 'missing/*', '.*']]
+        parser = VSGConfigParser()
+        parser.read_dict({'vsgen.project.test': {'search_path': ', '.join(patterns)}})
+        expected = [d for p in patterns for d in sorted(glob.glob(p)) if os.path.isdir(d)]
+        self.assertEqual(sorted(parser.getdirs('vsgen.project.test', 'search_path')), sorted(expected))
+
+        os.makedirs(os.path.join(self._root, 'lib', 'three'))
+        self.assertEqual(sorted(parser.getdirs('vsgen.project.test', 'search_path')), sorted(expected))
+        config.clear_globs()
+        self.assertIn(os.path.join(self._root, 'lib', 'three'), parser.getdirs('vsgen.project.test', 'search_path'))
+        self.assertEqual(parser.getdirs('vsgen.project.test', 'missing'), [])
+
+    def test_getdirs_threads(self):
+        """
+        Tests that the expansions share one pool of threads.
+        """
+        patterns = [os.path.join(self._root, *p.split('/')) for p in ['lib/*', 'src/*', '*/one']]
+        self.assertEqual(len(config.expand_dirs(patterns)), 5)
+        pool, threads = config._pool(), threading.active_count()
+
+        config.clear_globs()
+        self.assertEqual(len(config.expand_dirs(patterns)), 5)
+        self.assertIs(config._pool(), pool)
+        self.assertEqual(threading.active_count(), threads)
+
+if __name__ == '__main__':
+    unittest.main()
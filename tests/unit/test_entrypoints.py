@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+"""
+This module provides all unit tests for the entry point functionality.
+"""
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+import pkg_resources
+
+from vsgen.util import entrypoints
+
+SECTION = 'vsgen.unittest.entrypoints'
+
+
+class TestEntryPoints(unittest.TestCase):
+    """
+    Tests the lazy, cached resolution of entry points.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        The class specific setUp method
+        """
+        # Simulate an installed package with one valid and one broken plugin.
+        distribution = pkg_resources.Distribution(os.path.dirname(__file__), project_name='vsgenunittest', version="0.0")
+        distribution._ep_map = {SECTION: {
+            'valid': pkg_resources.EntryPoint('valid', 'os.path', attrs=('join',), dist=distribution),
+            'broken': pkg_resources.EntryPoint('broken', 'vsgen.missing_module', attrs=('Missing',), dist=distribution)
+        }}
+        pkg_resources.working_set.add(distribution, 'vsgenunittest')
+
+    def setUp(self):
+        """
+        The class specific setUp method
+        """
+        self._cache = tempfile.mkdtemp()
+        self._environ = os.environ.get('VSGEN_CACHE_DIR')
+        os.environ['VSGEN_CACHE_DIR'] = self._cache
+        entrypoints.clear()
+
+    def tearDown(self):
+        """
+        The class specific tearDown method
+        """
+        entrypoints.clear()
+        if self._environ is None:
+            del os.environ['VSGEN_CACHE_DIR']
+        else:
+            os.environ['VSGEN_CACHE_DIR'] = self._environ
+        shutil.rmtree(self._cache)
+
+    def test_lazy(self):
+        """
+        Tests that only the requested entry point is loaded, once.
+        """
+        self.assertEqual(entrypoints.names(SECTION), ['broken', 'valid'])
+        self.assertIs(entrypoints.entrypoint(SECTION, 'valid'), os.path.join)
+
+        ep = entrypoints._entrypoints(SECTION)['valid']
+        ep.load = None
+        self.assertIs(entrypoints.entrypoint(SECTION, 'valid'), os.path.join)
+        self.assertRaises(KeyError, entrypoints.entrypoint, SECTION, 'unknown')
+        self.assertRaises(ImportError, entrypoints.entrypoint, SECTION, 'broken')
+
+
+class TestEntryPointIndex(unittest.TestCase):
+    """
+    Tests the on-disk index of the entry points.
+    """
+
+    def setUp(self):
+        """
+        The class specific setUp method
+        """
+        self._cache = tempfile.mkdtemp()
+        self._environ = os.environ.get('VSGEN_CACHE_DIR')
+        os.environ['VSGEN_CACHE_DIR'] = self._cache
+        self._scan, self._fingerprint = entrypoints._scan, entrypoints._fingerprint
+        self._scans = []
+        entrypoints._scan = lambda: self._scans.append(1) or {SECTION: {'valid': 'os.path:join'}}
+        entrypoints._fingerprint = lambda: 'fingerprint'
+
+    def tearDown(self):
+        """
+        The class specific tearDown method
+        """
+        entrypoints._scan, entrypoints._fingerprint = self._scan, self._fingerprint
+        if self._environ is None:
+            del os.environ['VSGEN_CACHE_DIR']
+        else:
+            os.environ['VSGEN_CACHE_DIR'] = self._environ
+        shutil.rmtree(self._cache)
+
+    def test_index(self):
+        """
+        Tests that the index is only rebuilt when the environment changes.
+        """
+        self.assertEqual(entrypoints.load_index(), {SECTION: {'valid': 'os.path:join'}})
+        self.assertTrue(os.path.isfile(os.path.join(self._cache, entrypoints._index_filename())))
+        self.assertEqual(entrypoints.load_index(), {SECTION: {'valid': 'os.path:join'}})
+        self.assertEqual(len(self._scans), 1)
+
+        entrypoints._fingerprint = lambda: 'changed'
+        entrypoints.load_index()
+        self.assertEqual(len(self._scans), 2)
+        entrypoints.load_index(refresh=True)
+        self.assertEqual(len(self._scans), 3)
+
+    def test_fingerprint(self):
+        """
+        Tests that the fingerprint ignores the current directory and tracks the distributions added to pkg_resources in-process.
+        """
+        fingerprint = self._fingerprint()
+        cwd = os.getcwd()
+        os.chdir(self._cache)
+        try:
+            sys.path.insert(0, '')
+            before = self._fingerprint()
+            open(os.path.join(self._cache, 'written.sln'), 'w').close()
+            self.assertEqual(self._fingerprint(), before)
+        finally:
+            sys.path.remove('')
+            os.chdir(cwd)
+        self.assertEqual(self._fingerprint(), fingerprint)
+
+        distribution = pkg_resources.Distribution(self._cache, project_name='vsgenfingerprint', version="0.0")
+        pkg_resources.working_set.add(distribution, 'vsgenfingerprint')
+        self.assertNotEqual(self._fingerprint(), fingerprint)
+
+    def test_environments(self):
+        """
+        Tests that each interpreter and environment has its own index.
+        """
+        filename = entrypoints._index_filename()
+        prefix = sys.prefix
+        try:
+            sys.prefix = os.path.join(prefix, 'venv')
+            self.assertNotEqual(entrypoints._index_filename(), filename)
+            entrypoints.load_index()
+        finally:
+            sys.prefix = prefix
+        entrypoints.load_index()
+        self.assertEqual(len(self._scans), 2)
+
+    def test_egg_link(self):
+        """
+        Tests that the fingerprint tracks the entry points of a develop install's source tree.
+        """
+        source = os.path.join(self._cache, 'source')
+        site = os.path.join(self._cache, 'site')
+        os.makedirs(os.path.join(source, 'vsgenlink.egg-info'))
+        os.makedirs(site)
+        with open(os.path.join(site, 'vsgenlink.egg-link'), 'wt') as f:
+            f.write(os.path.join(os.pardir, 'source') + '\n.\n')
+        entry_points = os.path.join(source, 'vsgenlink.egg-info', 'entry_points.txt')
+        with open(entry_points, 'wt') as f:
+            f.write('[vsgen.unittest]\n')
+
+        sys.path.append(site)
+        try:
+            before = self._fingerprint()
+            mtime = os.stat(entry_points).st_mtime + 10
+            os.utime(entry_points, (mtime, mtime))
+            self.assertNotEqual(self._fingerprint(), before)
+        finally:
+            sys.path.remove(site)
+
+    def test_load(self):
+        """
+        Tests that an indexed entry point is loaded without pkg_resources.
+        """
+        self.assertIs(entrypoints.VSGEntryPoint('valid', 'os.path:join').load(), os.path.join)
+        self.assertIs(entrypoints.VSGEntryPoint('valid', 'os.path').load(), os.path)
+        self.assertIs(entrypoints.VSGEntryPoint('valid', 'vsgen.util.entrypoints:VSGEntryPoint.load [extra]').load(), entrypoints.VSGEntryPoint.load)
+        self.assertEqual(sorted(self._scan()), [s for s in sorted(self._scan()) if s.startswith('vsgen')])
+
+if __name__ == '__main__':
+    unittest.main()
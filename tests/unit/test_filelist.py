@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+"""
+This module provides all unit tests for the file collection functionality.
+"""
+import os
+import unittest
+
+from vsgen.util.filelist import VSGPathTable, VSGRelativeView, VSGFileStream, VSGFileSource
+
+
+class TestPathTable(unittest.TestCase):
+    """
+    Tests the list compatibility of the path table.
+    """
+
+    def setUp(self):
+        """
+        The class specific setUp method
+        """
+        self._home = os.path.abspath(os.path.join(os.sep, 'project'))
+        self._paths = [
+            os.path.join(self._home, 'main.py'),
+            os.path.join(self._home, 'pkg', 'module.py'),
+            os.path.join(self._home, 'pkg', u'mödule.py'),
+            'relative.py'
+        ]
+
+    def test_list_compatibility(self):
+        """
+        Tests the common list operations.
+        """
+        table = VSGPathTable(self._paths)
+        self.assertEqual(len(table), 4)
+        self.assertEqual(list(table), self._paths)
+        self.assertEqual(table, self._paths)
+        self.assertEqual(table[1], self._paths[1])
+        self.assertEqual(table[-1], self._paths[-1])
+        self.assertEqual(table[1:3], self._paths[1:3])
+        self.assertIn(self._paths[2], table)
+
+        table.remove(self._paths[0])
+        table[0] = self._paths[0]
+        table.append('other.py')
+        self.assertEqual(table, [self._paths[0]] + self._paths[2:] + ['other.py'])
+
+        table[:] = []
+        self.assertEqual(len(table), 0)
+
+    def test_sequence_compatibility(self):
+        """
+        Tests that the mutable sequence operations match those of a list.
+        """
+        table, paths = VSGPathTable(self._paths), list(self._paths)
+        self.assertEqual(list(reversed(table)), list(reversed(paths)))
+        self.assertEqual(table.index(self._paths[2]), paths.index(self._paths[2]))
+        self.assertRaises(ValueError, table.index, self._paths[0], 1)
+        self.assertRaises(ValueError, table.index, 'missing.py')
+        self.assertEqual(table.count(self._paths[1]), paths.count(self._paths[1]))
+        self.assertEqual(table.count('missing.py'), 0)
+
+        self.assertEqual(table.pop(), paths.pop())
+        self.assertEqual(table.pop(0), paths.pop(0))
+        self.assertEqual(table, paths)
+
+        table.sort(reverse=True)
+        paths.sort(reverse=True)
+        self.assertEqual(table, paths)
+        table.reverse()
+        paths.reverse()
+        self.assertEqual(table, paths)
+
+        copy = table.copy()
+        self.assertIsInstance(copy, VSGPathTable)
+        copy += ['other.py', self._paths[1]]
+        self.assertEqual(copy, paths + ['other.py'])
+        self.assertEqual(table, paths)
+
+        table.clear()
+        self.assertEqual(len(table), 0)
+        self.assertNotIn(self._paths[1], table)
+
+    def test_relative(self):
+        """
+        Tests the relative iteration and the distinct directories.
+        """
+        table = VSGPathTable(self._paths[:3])
+        self.assertEqual(list(table.relative(self._home)), [os.path.relpath(p, self._home) for p in self._paths[:3]])
+        self.assertEqual(table.directories(), [self._home, os.path.join(self._home, 'pkg')])
+
+    def test_dedupe(self):
+        """
+        Tests that paths that normalize to an existing path are not added again.
+        """
+        table = VSGPathTable(self._paths + self._paths)
+        self.assertEqual(table, self._paths)
+        self.assertFalse(table.append(os.path.join(self._home, 'pkg', os.curdir, 'module.py')))
+        self.assertFalse(table.append(os.path.join(self._home, 'pkg', os.pardir, 'main.py')))
+        self.assertTrue(table.append(os.path.join(self._home, 'other.py')))
+        self.assertEqual(table.extend([self._paths[0], 'relative.py', 'new.py', 'new.py']), 1)
+        self.assertEqual(len(table), 6)
+        self.assertIn(os.path.join(self._home, 'pkg', '.', 'module.py'), table)
+        self.assertNotIn(os.path.join(self._home, 'missing.py'), table)
+
+    def test_mutations(self):
+        """
+        Tests that assignments, deletions and insertions keep the membership of the paths consistent.
+        """
+        table = VSGPathTable(self._paths)
+        other = os.path.join(self._home, 'other.py')
+        table[0] = other
+        self.assertNotIn(self._paths[0], table)
+        self.assertEqual(table.index(other), 0)
+        self.assertTrue(table.append(self._paths[0]))
+
+        table[1] = other
+        self.assertEqual(table, [other] + self._paths[2:] + [self._paths[0]])
+
+        table[1:3] = [self._paths[1], self._paths[1]]
+        self.assertEqual(table, [other, self._paths[1], self._paths[0]])
+
+        del table[::2]
+        self.assertEqual(table, [self._paths[1]])
+        self.assertNotIn(other, table)
+
+        table.insert(0, self._paths[1])
+        table.insert(0, other)
+        self.assertEqual(table, [other, self._paths[1]])
+        self.assertRaises(ValueError, table.index, other, 1)
+
+    def test_stream_dedupe(self):
+        """
+        Tests that a lazy collection does not produce a file twice.
+        """
+        stream = VSGFileStream('compile', self._paths[:2])
+        stream.add_source(lambda: [('compile', self._paths[1]), ('content', self._paths[2]), ('compile', self._paths[3])])
+        self.assertEqual(list(stream), [self._paths[0], self._paths[1], self._paths[3]])
+        self.assertEqual(list(stream), list(stream))
+
+    def test_held_source(self):
+        """
+        Tests that the streams sharing a held source generate its files once.
+        """
+        calls = []
+
+        def generate():
+            calls.append(True)
+            return [('compile', self._paths[0]), ('content', self._paths[1]), ('compile', self._paths[2])]
+
+        source = VSGFileSource(generate)
+        compile, content = VSGFileStream('compile'), VSGFileStream('content')
+        compile.add_source(source)
+        content.add_source(source)
+
+        source.hold()
+        self.assertTrue(compile)
+        self.assertEqual(list(compile), [self._paths[0], self._paths[2]])
+        self.assertEqual(list(content), [self._paths[1]])
+        self.assertEqual(len(calls), 1)
+        source.release()
+
+        self.assertEqual(len(compile), 2)
+        self.assertEqual(len(calls), 2)
+
+
+class TestRelativeView(unittest.TestCase):
+    """
+    Tests the incremental maintenance of the relative view.
+    """
+
+    def setUp(self):
+        """
+        The class specific setUp method
+        """
+        self._home = os.path.abspath(os.path.join(os.sep, 'project'))
+
+    def _expected(self, table, start):
+        """
+        Returns the relative paths computed without the view.
+        """
+        return [os.path.relpath(p, start) for p in sorted(table, key=lambda p: p.lower())]
+
+    def test_incremental(self):
+        """
+        Tests that appended paths are merged into the view and that modifications rebuild it.
+        """
+        table = VSGPathTable(os.path.join(self._home, 'pkg%d' % (i % 7), 'File%03d.py' % i) for i in range(100))
+        view = VSGRelativeView(table, key=lambda p: p.lower())
+        self.assertEqual(list(view.files(self._home)), self._expected(table, self._home))
+
+        table.append(os.path.join(self._home, 'a.py'))
+        self.assertEqual(list(view.files(self._home)), self._expected(table, self._home))
+
+        table.extend(os.path.join(self._home, 'new', 'file%03d.py' % i) for i in range(50))
+        self.assertEqual(list(view.files(self._home)), self._expected(table, self._home))
+        self.assertIn('new', view.directories(self._home))
+
+        del table[0]
+        self.assertEqual(list(view.files(self._home)), self._expected(table, self._home))
+
+        start = os.path.join(self._home, 'pkg1')
+        self.assertEqual(list(view.files(start)), self._expected(table, start))
+
+if __name__ == '__main__':
+    unittest.main()
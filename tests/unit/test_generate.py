@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+This module provides all unit tests for the concurrent generation of configuration files.
+"""
+import os
+import sys
+import shutil
+import logging
+import tempfile
+import unittest
+
+from vsgen.suite import VSGSuite
+from vsgen.util.logger import VSGLogger
+
+
+class VSGFailingSuite(VSGSuite):
+    """
+    A suite class that cannot generate any configuration file.
+    """
+
+    @classmethod
+    def from_args(cls, **kwargs):
+        """
+        Fails to create the suites.
+        """
+        raise ValueError('VSGFailingSuite cannot create suites.')
+
+
+class TestGenerate(unittest.TestCase):
+    """
+    Tests the generation of configuration files in a process pool.
+    """
+
+    def setUp(self):
+        """
+        The class specific setUp method
+        """
+        self._root = tempfile.mkdtemp()
+        self._environ = os.environ.get('VSGEN_CACHE_DIR')
+        os.environ['VSGEN_CACHE_DIR'] = os.path.join(self._root, 'cache')
+        self._filenames = []
+        for name, text in [('a.cfg', '[vsgen]\nroot = .\n'), ('b.cfg', '[vsgen]\nroot = missing\n'), ('c.cfg', '[vsgen]\nroot = .\n')]:
+            filename = os.path.join(self._root, name)
+            with open(filename, 'wt') as f:
+                f.write(text)
+            self._filenames.append(filename)
+
+        self._records = []
+        self._handler = logging.Handler()
+        self._handler.emit = self._records.append
+        self._logger = VSGLogger.getLogger(None)
+        self._level = self._logger.level
+        self._logger.setLevel(logging.INFO)
+        self._logger.addHandler(self._handler)
+
+    def tearDown(self):
+        """
+        The class specific tearDown method
+        """
+        self._logger.removeHandler(self._handler)
+        self._logger.setLevel(self._level)
+        if self._environ is None:
+            del os.environ['VSGEN_CACHE_DIR']
+        else:
+            os.environ['VSGEN_CACHE_DIR'] = self._environ
+        shutil.rmtree(self._root)
+
+    def test_generate(self):
+        """
+        Tests that failures are reported and that the messages of every suite are logged.
+        """
+        failures = VSGSuite.generate(self._filenames, 2)
+        self.assertEqual(failures, [self._filenames[1]])
+
+        messages = [r.getMessage() for r in self._records]
+        self.assertTrue(any(m.startswith('Could not generate {}'.format(self._filenames[1])) for m in messages))
+        self.assertIn('Generated 2 of 3 configuration files.', messages)
+        self.assertEqual(sum(1 for r in self._records if r.name == 'VSG.Writing VSG Projects' and r.getMessage().startswith('Wrote')), 2)
+
+    def test_subclass(self):
+        """
+        Tests that the worker processes generate the suites with the class generate is called on.
+        """
+        failures = VSGFailingSuite.generate(self._filenames, 2)
+        self.assertEqual(failures, self._filenames)
+
+    def test_jobs(self):
+        """
+        Tests that the number of processes is validated.
+        """
+        parser = VSGSuite.make_parser()
+        self.assertEqual(parser.parse_args(['generate', '-j', '3'] + self._filenames).jobs, 3)
+        stderr, sys.stderr = sys.stderr, open(os.devnull, 'w')
+        try:
+            for jobs in ['0', '-1', 'x']:
+                self.assertRaises(SystemExit, parser.parse_args, ['generate', '-j', jobs] + self._filenames)
+        finally:
+            sys.stderr.close()
+            sys.stderr = stderr
+        self.assertRaises(ValueError, VSGSuite.generate, self._filenames, -1)
+
+if __name__ == '__main__':
+    unittest.main()
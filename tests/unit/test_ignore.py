@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+This module provides all unit tests for the .vsgenignore functionality.
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+from vsgen.util.ignore import VSGIgnoreFile, ignore_walk
+
+
+class TestIgnoreFile(unittest.TestCase):
+    """
+    Tests the gitignore-style pattern semantics.
+    """
+
+    def test_patterns(self):
+        """
+        Tests the common pattern forms.
+        """
+        ignore = VSGIgnoreFile(['# comment', '', '*.pyc', 'build/', '/docs', 'src/**/gen', '!keep.pyc'])
+        self.assertTrue(ignore.match('a.pyc', False))
+        self.assertTrue(ignore.match('pkg/a.pyc', False))
+        self.assertFalse(ignore.match('keep.pyc', False))
+        self.assertTrue(ignore.match('pkg/build', True))
+        self.assertIsNone(ignore.match('pkg/build', False))
+        self.assertTrue(ignore.match('docs', True))
+        self.assertIsNone(ignore.match('pkg/docs', True))
+        self.assertTrue(ignore.match('src/gen', True))
+        self.assertTrue(ignore.match('src/a/b/gen', True))
+        self.assertIsNone(ignore.match('a.py', False))
+
+
+class TestIgnoreWalk(unittest.TestCase):
+    """
+    Tests the application of nested .vsgenignore files during a walk.
+    """
+
+    def setUp(self):
+        """
+        The class specific setUp method
+        """
+        self._root = tempfile.mkdtemp()
+        files = {
+            '.vsgenignore': 'vendor/\n*.log\n',
+            'main.py': '',
+            'main.log': '',
+            os.path.join('vendor', 'lib.py'): '',
+            os.path.join('pkg', '.vsgenignore'): '!*.log\ngenerated.py\n',
+            os.path.join('pkg', 'module.py'): '',
+            os.path.join('pkg', 'module.log'): '',
+            os.path.join('pkg', 'generated.py'): '',
+        }
+        for path, text in files.items():
+            filename = os.path.join(self._root, path)
+            if not os.path.isdir(os.path.dirname(filename)):
+                os.makedirs(os.path.dirname(filename))
+            with open(filename, 'wt') as f:
+                f.write(text)
+
+    def tearDown(self):
+        """
+        The class specific tearDown method
+        """
+        shutil.rmtree(self._root)
+
+    def test_walk(self):
+        """
+        Tests that excluded subtrees are not visited and deeper files take precedence.
+        """
+        visited = []
+        files = []
+        for root, dirnames, filenames in ignore_walk(os.walk(self._root)):
+            visited.append(os.path.relpath(root, self._root))
+            files.extend(os.path.relpath(os.path.join(root, f), self._root) for f in filenames if f != '.vsgenignore')
+        self.assertNotIn('vendor', visited)
+        self.assertEqual(sorted(files), ['main.py', os.path.join('pkg', 'module.log'), os.path.join('pkg', 'module.py')])
+
+if __name__ == '__main__':
+    unittest.main()
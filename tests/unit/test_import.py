@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+This module provides all unit tests for the package's import time.
+"""
+import os
+import sys
+import json
+import shutil
+import tempfile
+import subprocess
+import unittest
+
+# The generous wall clock budget, in seconds, of running ``vsgen --help`` in a fresh interpreter.
+IMPORT_BUDGET = 2.0
+
+IMPORT_SCRIPT = """
+import os, sys, json, time
+start = time.time()
+import vsgen.__main__
+stdout, sys.stdout = sys.stdout, open(os.devnull, 'w')
+try:
+    vsgen.__main__.main(['vsgen', '--help'])
+except SystemExit:
+    pass
+sys.stdout = stdout
+elapsed = time.time() - start
+print(json.dumps({'elapsed': elapsed, 'modules': sorted(sys.modules)}))
+"""
+
+
+class TestImport(unittest.TestCase):
+    """
+    Tests that starting vsgen's command line interface is cheap.
+    """
+
+    def _import(self):
+        """
+        Runs ``vsgen --help`` in a fresh interpreter.
+        """
+        root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        cache = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache)
+        env = dict(os.environ)
+        env['PYTHONPATH'] = os.pathsep.join([root] + [p for p in [env.get('PYTHONPATH')] if p])
+        env['VSGEN_CACHE_DIR'] = cache
+        output = subprocess.check_output([sys.executable, '-c', IMPORT_SCRIPT], env=env)
+        return json.loads(output.decode('utf-8').strip().splitlines()[-1])
+
+    @unittest.skipIf(sys.version_info < (3, 7), "requires module level __getattr__")
+    def test_deferred_imports(self):
+        """
+        Tests that the heavy dependencies are not imported to build the command line parser.
+        """
+        result = self._import()
+        self.assertIn('vsgen.suite', result['modules'])
+        for module in ['pkg_resources', 'jinja2', 'sqlite3', 'vsgen.writer', 'vsgen.solution', 'vsgen.project', 'tarfile', 'subprocess', 'pickle', 'multiprocessing', 'mmap']:
+            self.assertNotIn(module, result['modules'])
+        self.assertLess(result['elapsed'], IMPORT_BUDGET)
+
+    def test_project_imports(self):
+        """
+        Tests that importing a project does not import the modules that scan, index or snapshot its files.
+        """
+        root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        script = 'import sys, json, vsgen.project; print(json.dumps(sorted(sys.modules)))'
+        output = subprocess.check_output([sys.executable, '-c', script], cwd=root)
+        modules = json.loads(output.decode('utf-8').strip().splitlines()[-1])
+        for module in ['sqlite3', 'pickle', 'mmap', 'vsgen.util.index', 'vsgen.util.snapshot', 'vsgen.util.profiler', 'vsgen.util.scan', 'vsgen.util.filesource']:
+            self.assertNotIn(module, modules)
+
+    def test_public_names(self):
+        """
+        Tests that the package's public names resolve on access.
+        """
+        import vsgen
+        from vsgen.suite import VSGSuite
+        self.assertIs(vsgen.VSGSuite, VSGSuite)
+        self.assertTrue(vsgen.__version__)
+        self.assertIn('VSGWriter', dir(vsgen))
+        self.assertRaises(AttributeError, getattr, vsgen, 'VSGMissing')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""
+This module provides all unit tests for the producer/consumer pipeline functionality.
+"""
+import time
+import threading
+import unittest
+
+from vsgen.util.pipeline import VSGPipeline
+
+
+class TestPipeline(unittest.TestCase):
+    """
+    Tests consuming items while they are produced.
+    """
+
+    def test_backpressure(self):
+        """
+        Tests that a producer blocks while the queue is full and that every item is consumed.
+        """
+        release = threading.Event()
+        produced = []
+
+        def consume(item):
+            release.wait()
+            if item == 3:
+                raise ValueError(item)
+
+        def produce():
+            for i in range(8):
+                pipeline.put(i)
+                produced.append(i)
+
+        with VSGPipeline(consume, workers=1, size=2) as pipeline:
+            producer = threading.Thread(target=produce)
+            producer.start()
+            deadline = time.time() + 5
+            while len(produced) < 3 and time.time() < deadline:
+                time.sleep(0.01)
+            producer.join(0.05)
+            # One item is being consumed and two are queued.
+            self.assertEqual(produced, [0, 1, 2])
+            release.set()
+            producer.join()
+
+        self.assertEqual(sorted(pipeline.consumed), [0, 1, 2, 4, 5, 6, 7])
+        self.assertEqual([(item, str(error)) for item, error in pipeline.failures], [(3, '3')])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+This module provides all unit tests for the scan profiler functionality.
+"""
+import os
+import json
+import shutil
+import tempfile
+import unittest
+
+from vsgen.project import VSGProject
+from vsgen.util.profiler import VSGScanProfiler
+
+
+class TestScanProfiler(unittest.TestCase):
+    """
+    Tests the collection and reporting of scan profiles.
+    """
+
+    def setUp(self):
+        """
+        The class specific setUp method
+        """
+        self._root = tempfile.mkdtemp()
+        for path in ['main.py', 'readme.txt', os.path.join('pkg', 'module.py'), os.path.join('build', 'output.py')]:
+            filename = os.path.join(self._root, path)
+            if not os.path.isdir(os.path.dirname(filename)):
+                os.makedirs(os.path.dirname(filename))
+            with open(filename, 'wt') as f:
+                f.write('')
+        VSGScanProfiler.enable()
+
+    def tearDown(self):
+        """
+        The class specific tearDown method
+        """
+        VSGScanProfiler.disable()
+        shutil.rmtree(self._root)
+
+    def test_profile(self):
+        """
+        Tests that the profile records the scan without changing its result.
+        """
+        project = VSGProject(Name='profiled', CompileInFilter=['*.cpp', '*.py'], ContentInFilter=['*.txt'], DirectoryExFilter=['*build'])
+        project.insert_files(self._root)
+        self.assertEqual(sorted(os.path.relpath(f, self._root) for f in project.CompileFiles), ['main.py', os.path.join('pkg', 'module.py')])
+
+        summary = VSGScanProfiler.profile('profiled').summary()
+        self.assertEqual(summary['directories'], 3)
+        self.assertEqual(summary['files'], 3)
+        self.assertEqual(summary['subtrees'][0]['directory'], self._root)
+        patterns = dict(((p['option'], p['pattern']), (p['evaluations'], p['matches'])) for p in summary['patterns'])
+        self.assertEqual(patterns[('compile_in_filter', '*.cpp')], (3, 0))
+        self.assertEqual(patterns[('compile_in_filter', '*.py')], (3, 2))
+        self.assertEqual(patterns[('content_in_filter', '*.txt')], (1, 1))
+        self.assertEqual(patterns[('directory_ex_filter', '*build')], (3, 1))
+
+        report = json.loads(VSGScanProfiler.report('json'))
+        self.assertEqual([r['project'] for r in report], ['profiled'])
+        self.assertIn('Project profiled: 3 directories, 3 files', VSGScanProfiler.report('text'))
+        self.assertRaises(ValueError, VSGScanProfiler.report, 'xml')
+
+    def test_shared_filters(self):
+        """
+        Tests that the patterns of options sharing one list are recorded under each option.
+        """
+        filters = ['*.py']
+        project = VSGProject(Name='shared', CompileInFilter=filters, ContentInFilter=filters)
+        project.insert_files(self._root)
+
+        summary = VSGScanProfiler.profile('shared').summary()
+        patterns = dict(((p['option'], p['pattern']), (p['evaluations'], p['matches'])) for p in summary['patterns'])
+        self.assertEqual(patterns[('compile_in_filter', '*.py')], (4, 3))
+        self.assertEqual(patterns[('content_in_filter', '*.py')], (1, 0))
+
+if __name__ == '__main__':
+    unittest.main()
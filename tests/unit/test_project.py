@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+"""
+This module provides all unit tests for the project's file insertion functionality.
+"""
+import os
+import shutil
+import tarfile
+import tempfile
+import subprocess
+import unittest
+
+from vsgen.project import VSGProject
+from vsgen.util.filesource import link_walk
+from vsgen.util.index import VSGFileIndex, VSGIndexedFiles
+from vsgen.util.scan import VSGScanService
+
+
+class TestProjectInsertFiles(unittest.TestCase):
+    """
+    Tests the insertion of files into a project.
+    """
+
+    def setUp(self):
+        """
+        The class specific setUp method
+        """
+        self._root = tempfile.mkdtemp()
+        for path in ['main.py', 'readme.txt', os.path.join('pkg', 'module.py'), os.path.join('build', 'output.py')]:
+            filename = os.path.join(self._root, path)
+            if not os.path.isdir(os.path.dirname(filename)):
+                os.makedirs(os.path.dirname(filename))
+            with open(filename, 'wt') as f:
+                f.write('')
+
+    def tearDown(self):
+        """
+        The class specific tearDown method
+        """
+        shutil.rmtree(self._root)
+
+    def _project(self, **kwargs):
+        """
+        Creates a project with the test filters.
+        """
+        return VSGProject(CompileInFilter=['*.py'], ContentInFilter=['*.txt'], **kwargs)
+
+    def _relative(self, files):
+        """
+        Returns the files relative to the test root.
+        """
+        return sorted(os.path.relpath(f, self._root) for f in files)
+
+    def test_walk_source(self):
+        """
+        Tests the default file system walk.
+        """
+        project = self._project()
+        project.insert_files(self._root)
+        self.assertEqual(self._relative(project.CompileFiles), [os.path.join('build', 'output.py'), 'main.py', os.path.join('pkg', 'module.py')])
+        self.assertEqual(self._relative(project.ContentFiles), ['readme.txt'])
+
+    def test_git_source(self):
+        """
+        Tests that the git index source only returns tracked files.
+        """
+        try:
+            subprocess.check_output(['git', 'init', '-q', self._root], stderr=subprocess.STDOUT)
+            subprocess.check_output(['git', 'add', 'main.py', 'readme.txt', 'pkg'], cwd=self._root, stderr=subprocess.STDOUT)
+        except (OSError, subprocess.CalledProcessError):
+            self.skipTest('git is not available')
+
+        project = self._project(FileSource='git', DirectoryExFilter=['*pkg'])
+        project.insert_files(self._root)
+        self.assertEqual(self._relative(project.CompileFiles), ['main.py'])
+        self.assertEqual(self._relative(project.ContentFiles), ['readme.txt'])
+
+        # Git's traces go to stderr and must not be mixed into the listing.
+        self.addCleanup(os.environ.pop, 'GIT_TRACE', None)
+        os.environ['GIT_TRACE'] = '1'
+        project = self._project(FileSource='git', DirectoryExFilter=['*pkg'])
+        project.insert_files(self._root)
+        self.assertEqual(self._relative(project.CompileFiles), ['main.py'])
+
+        # The errors of a failed command are reported.
+        project = self._project(FileSource='git')
+        with self.assertRaises(ValueError) as context:
+            project.insert_files(os.path.dirname(self._root))
+        self.assertIn('fatal', str(context.exception))
+
+    def test_manifest_source(self):
+        """
+        Tests that the files listed in a manifest or an archive are used instead of the file system.
+        """
+        manifest = os.path.join(self._root, 'manifest.txt')
+        with open(manifest, 'wt') as f:
+            f.write('./main.py\n{}\nmissing.py\npkg/\n\n{}\n'.format(os.path.join(self._root, 'readme.txt'), os.path.join(os.path.dirname(self._root), 'outside.py')))
+        project = self._project(FileManifest=manifest)
+        project.insert_files(self._root)
+        self.assertEqual(self._relative(project.CompileFiles), ['main.py', 'missing.py'])
+        self.assertEqual(self._relative(project.ContentFiles), ['readme.txt'])
+
+        archive = os.path.join(self._root, 'source.tar')
+        with tarfile.open(archive, 'w') as f:
+            f.add(os.path.join(self._root, 'pkg'), arcname='pkg')
+        project = self._project(FileManifest=archive)
+        project.insert_files(self._root)
+        self.assertEqual(self._relative(project.CompileFiles), [os.path.join('pkg', 'module.py')])
+
+        project = self._project(FileManifest=os.path.join(self._root, 'none.txt'))
+        self.assertRaises(ValueError, project.insert_files, self._root)
+
+    def test_iter_files(self):
+        """
+        Tests that the generator yields the same files as the insertion.
+        """
+        project = self._project()
+        files = list(project.iter_files(self._root))
+        self.assertEqual(self._relative(p for k, p in files if k == 'compile'), [os.path.join('build', 'output.py'), 'main.py', os.path.join('pkg', 'module.py')])
+        self.assertEqual(self._relative(p for k, p in files if k == 'content'), ['readme.txt'])
+        self.assertEqual(project.CompileFiles, [])
+
+    def test_lazy_files(self):
+        """
+        Tests that lazy files are generated each time they are iterated.
+        """
+        project = self._project(LazyFiles=True, CompileFiles=['explicit.py'])
+        project.insert_files(self._root)
+        self.assertEqual(list(project.CompileFiles)[0], 'explicit.py')
+        self.assertEqual(len(project.CompileFiles), 4)
+
+        with open(os.path.join(self._root, 'pkg', 'other.py'), 'wt') as f:
+            f.write('')
+        self.assertEqual(len(project.CompileFiles), 5)
+        self.assertEqual(self._relative(project.ContentFiles), ['readme.txt'])
+
+    def test_lazy_files_rendering(self):
+        """
+        Tests that lazy files are generated once while a project is rendered.
+        """
+        project = self._project(LazyFiles=True, ProjectHome=self._root)
+        walks = []
+        walk = project._walk
+
+        def counting_walk(*args, **kwargs):
+            walks.append(args[0])
+            return walk(*args, **kwargs)
+
+        project._walk = counting_walk
+        project.insert_files(self._root)
+        with project.rendering():
+            self.assertTrue(project.CompileFiles)
+            self.assertEqual(len(project.CompileFiles), 3)
+            self.assertEqual(sorted(project.CompileFilesRelative), [os.path.join('build', 'output.py'), 'main.py', os.path.join('pkg', 'module.py')])
+            self.assertEqual(list(project.ContentFilesRelative), ['readme.txt'])
+            self.assertIn('pkg', project.DirectoriesRelative)
+        self.assertEqual(walks, [self._root])
+
+        self.assertEqual(len(project.CompileFiles), 3)
+        self.assertEqual(len(walks), 2)
+
+    def test_duplicates(self):
+        """
+        Tests that repeated insertions and explicit files do not duplicate files.
+        """
+        project = self._project(CompileFiles=[os.path.join(self._root, 'main.py')])
+        project.insert_files(self._root)
+        project.insert_files(self._root)
+        self.assertEqual(self._relative(project.CompileFiles), [os.path.join('build', 'output.py'), 'main.py', os.path.join('pkg', 'module.py')])
+        self.assertEqual(self._relative(project.ContentFiles), ['readme.txt'])
+
+    def test_follow_links(self):
+        """
+        Tests that linked directories are walked once and that link cycles are broken.
+        """
+        shared = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, shared)
+        with open(os.path.join(shared, 'lib.py'), 'wt') as f:
+            f.write('')
+        try:
+            os.symlink(shared, os.path.join(self._root, 'shared'))
+            os.symlink(shared, os.path.join(self._root, 'pkg', 'shared'))
+            os.symlink(self._root, os.path.join(self._root, 'pkg', 'cycle'))
+        except (AttributeError, NotImplementedError, OSError):
+            self.skipTest('symbolic links are not available')
+
+        project = self._project()
+        project.insert_files(self._root)
+        self.assertEqual(self._relative(project.CompileFiles), [os.path.join('build', 'output.py'), 'main.py', os.path.join('pkg', 'module.py')])
+
+        project = self._project(FollowLinks=True)
+        project.insert_files(self._root)
+        self.assertEqual(self._relative(project.CompileFiles), [os.path.join('build', 'output.py'), 'main.py', os.path.join('pkg', 'module.py'), os.path.join('shared', 'lib.py')])
+
+        aliases = []
+        for root, dirnames, filenames in link_walk(self._root, aliases):
+            dirnames.sort()
+        self.assertEqual(sorted(os.path.relpath(a, self._root) for a, p in aliases), [os.path.join('pkg', 'cycle'), os.path.join('pkg', 'shared')])
+
+    def test_file_index(self):
+        """
+        Tests that indexed files are stored in the index and that updates only write the changed files.
+        """
+        filename = os.path.join(self._root, 'index.sqlite')
+        self.addCleanup(VSGFileIndex.close_all)
+        project = self._project(Name='indexed', ProjectHome=self._root, FileIndex=filename, CompileFiles=[os.path.join(self._root, 'explicit.py')], DirectoryExFilter=['*build'])
+        self.addCleanup(VSGScanService.clear)
+        VSGScanService.expect(('walk', self._root, i) for i in range(2))
+        project.insert_files(self._root)
+        self.assertEqual(VSGScanService._listings, {})
+        self.assertIsInstance(project.CompileFiles, VSGIndexedFiles)
+        self.assertEqual(list(project.CompileFiles), sorted(os.path.join(self._root, f) for f in ['explicit.py', 'main.py', os.path.join('pkg', 'module.py')]))
+        self.assertEqual(list(project.ContentFiles), [os.path.join(self._root, 'readme.txt')])
+        self.assertIn(os.path.join(self._root, 'main.py'), project.CompileFiles)
+        self.assertFalse(project.CompileFiles.append(os.path.join(self._root, 'main.py')))
+        self.assertFalse(project.rescan())
+
+        with open(os.path.join(self._root, 'pkg', 'other.py'), 'wt') as f:
+            f.write('')
+        self.assertTrue(project.rescan())
+        self.assertEqual(len(project.CompileFiles), 4)
+        self.assertEqual(list(project.CompileFilesRelative), ['explicit.py', 'main.py', os.path.join('pkg', 'module.py'), os.path.join('pkg', 'other.py')])
+
+        index = VSGFileIndex.open(filename)
+        self.assertEqual(index.update('indexed', self._root, project.iter_files(self._root, directoryExFilter=['*build'])), 0)
+
+    def test_unknown_source(self):
+        """
+        Tests that an unknown file source is rejected.
+        """
+        project = self._project(FileSource='unknown')
+        self.assertRaises(ValueError, project.insert_files, self._root)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+This module provides all unit tests for the shared scan functionality.
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+from vsgen.project import VSGProject
+from vsgen.util.scan import VSGScanService
+
+
+class TestScanService(unittest.TestCase):
+    """
+    Tests the sharing of root path listings between projects.
+    """
+
+    def setUp(self):
+        """
+        The class specific setUp method
+        """
+        self._root = tempfile.mkdtemp()
+        for path in ['main.py', 'readme.txt', os.path.join('pkg', 'module.py'), os.path.join('tests', 'test_module.py')]:
+            filename = os.path.join(self._root, path)
+            if not os.path.isdir(os.path.dirname(filename)):
+                os.makedirs(os.path.dirname(filename))
+            with open(filename, 'wt') as f:
+                f.write('')
+        VSGScanService.clear()
+
+    def tearDown(self):
+        """
+        The class specific tearDown method
+        """
+        VSGScanService.clear()
+        shutil.rmtree(self._root)
+
+    def test_shared_listing(self):
+        """
+        Tests that projects with the same root path share one walk but apply their own filters.
+        """
+        VSGScanService.expect(('walk', self._root, i) for i in range(3))
+        source = VSGProject(CompileInFilter=['*.py'], DirectoryExFilter=['*tests'])
+        source.insert_files(self._root)
+        tests = VSGProject(CompileInFilter=['*.py'], DirectoryInFilter=['*tests'])
+        tests.insert_files(self._root)
+        content = VSGProject(CompileInFilter=['*.none'], ContentInFilter=['*.txt'])
+        content.insert_files(self._root)
+
+        self.assertEqual(sorted(os.path.relpath(f, self._root) for f in source.CompileFiles), ['main.py', os.path.join('pkg', 'module.py')])
+        self.assertEqual([os.path.relpath(f, self._root) for f in tests.CompileFiles], [os.path.join('tests', 'test_module.py')])
+        self.assertEqual([os.path.relpath(f, self._root) for f in content.ContentFiles], ['readme.txt'])
+        self.assertEqual(VSGScanService.walks, 1)
+        self.assertEqual(VSGScanService.saved, 2)
+        self.assertEqual(VSGScanService._listings, {})
+
+    def test_unshared_listing(self):
+        """
+        Tests that a root path expected once is walked, and pruned, by its project alone.
+        """
+        walked = []
+        VSGScanService.expect([('walk', self._root, 0)])
+        project = VSGProject(CompileInFilter=['*.py'], DirectoryExFilter=['*tests'])
+        walker = project._walk(self._root)
+        for root, dirnames, filenames in walker:
+            walked.append(root)
+            dirnames[:] = [d for d in dirnames if d != 'tests']
+        self.assertNotIn(os.path.join(self._root, 'tests'), walked)
+        self.assertEqual(VSGScanService._listings, {})
+        self.assertEqual(VSGScanService._expected, {})
+
+    def test_sources(self):
+        """
+        Tests that the listings are only shared between walks of the same source and that repeated declarations are ignored.
+        """
+        VSGScanService.expect([('walk', self._root, 0), ('walk', self._root, 0), ('walk+links', self._root, 1)])
+        VSGProject(CompileInFilter=['*.py']).insert_files(self._root)
+        VSGProject(CompileInFilter=['*.py'], FollowLinks=True).insert_files(self._root)
+        self.assertEqual((VSGScanService.walks, VSGScanService.saved), (2, 0))
+        self.assertEqual(VSGScanService._listings, {})
+        self.assertEqual(VSGScanService._expected, {})
+
+    def test_invalidate(self):
+        """
+        Tests that an invalidated listing is walked again.
+        """
+        VSGScanService.expect(('walk', self._root, i) for i in range(2))
+        project = VSGProject(CompileInFilter=['*.py'])
+        project.insert_files(self._root)
+        with open(os.path.join(self._root, 'pkg', 'other.py'), 'wt') as f:
+            f.write('')
+        VSGScanService.invalidate(os.path.join(self._root, 'pkg'))
+
+        other = VSGProject(CompileInFilter=['*.py'])
+        other.insert_files(self._root)
+        self.assertEqual(len(other.CompileFiles), len(project.CompileFiles) + 1)
+        self.assertEqual(VSGScanService.walks, 2)
+
+if __name__ == '__main__':
+    unittest.main()
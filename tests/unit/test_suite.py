@@ -0,0 +1,397 @@
+# -*- coding: utf-8 -*-
+"""
+This module provides all unit tests for the suite's construction functionality.
+"""
+import os
+import time
+import tempfile
+import shutil
+import threading
+import unittest
+
+from vsgen.suite import VSGSuite
+from vsgen.project import VSGProject
+from vsgen.util.config import VSGConfigParser
+from vsgen.util.pipeline import VSGPipeline
+from vsgen.util.scan import VSGScanService
+from vsgen.util.snapshot import VSGSnapshotTable
+
+
+class VSGTestSuite(VSGSuite):
+    """
+    A suite that constructs plain projects, recording the threads that construct them.
+    """
+
+    def _getproject(self, config, section, **kwargs):
+        """
+        Creates a project after a delay that decreases with its position in the solution.
+        """
+        time.sleep(0.01 * (10 - int(section.rsplit('.', 1)[-1])))
+        self.threads.add(threading.current_thread().name)
+        return VSGProject(Name=section, **kwargs)
+
+
+class VSGScanSuite(VSGTestSuite):
+    """
+    A suite whose projects insert the files of their root paths, recording the number of walks.
+    """
+    walks = []
+
+    def _getproject(self, config, section, **kwargs):
+        """
+        Creates a project and inserts the files of its root path.
+        """
+        project = VSGProject(Name=section, LazyFiles=config.getboolean(section, 'lazy_files', fallback=False), **kwargs)
+        project.insert_files(config.get(section, 'root_path'))
+        self.walks.append(VSGScanService.walks)
+        return project
+
+
+class VSGStreamProject(VSGProject):
+    """
+    A project that records when it is written and registered.
+    """
+    failing = set()
+
+    def write(self):
+        """
+        Records the write; fails once for the projects in :attr:`failing`.
+        """
+        if self.Name in self.failing:
+            self.failing.remove(self.Name)
+            raise IOError('Could not write project %s.' % self.Name)
+        self.events.append(('write', self.Name))
+
+    def register(self):
+        """
+        Records the registration.
+        """
+        self.events.append(('register', self.Name))
+
+
+class VSGStreamSuite(VSGTestSuite):
+    """
+    A suite that constructs recording projects.
+    """
+
+    def _getproject(self, config, section, **kwargs):
+        """
+        Creates a recording project.
+        """
+        self.events.append(('construct', section))
+        return VSGStreamProject(Name=section, **kwargs)
+
+    def _getsolution(self, config, section, **kwargs):
+        """
+        Creates a solution that records when it is written.
+        """
+        s = super(VSGStreamSuite, self)._getsolution(config, section, **kwargs)
+        s.write = lambda: self.events.append(('write', s.Name))
+        return s
+
+
+class TestSuiteConstruction(unittest.TestCase):
+    """
+    Tests the construction of a suite's solutions and projects.
+    """
+
+    def setUp(self):
+        """
+        The class specific setUp method
+        """
+        self._root = tempfile.mkdtemp()
+        self._environ = os.environ.get('VSGEN_CACHE_DIR')
+        os.environ['VSGEN_CACHE_DIR'] = os.path.join(self._root, 'cache')
+        self._config = VSGConfigParser()
+        self._config.read_dict({
+            'vsgen': {'root': self._root, 'threads': '4'},
+            'vsgen.solution.test': {'name': 'test', 'filename': 'test.sln', 'visual_studio_version': '14.0', 'projects': ', '.join('vsgen.project.%d' % i for i in range(8))}
+        })
+        VSGTestSuite.threads = set()
+
+    def tearDown(self):
+        """
+        The class specific tearDown method
+        """
+        if self._environ is None:
+            del os.environ['VSGEN_CACHE_DIR']
+        else:
+            os.environ['VSGEN_CACHE_DIR'] = self._environ
+        shutil.rmtree(self._root)
+
+    def test_concurrent_projects(self):
+        """
+        Tests that projects are constructed concurrently and kept in the order of the solution.
+        """
+        suite = VSGTestSuite(self._config)
+        self.assertEqual([p.Name for p in suite._solutions[0].Projects], ['vsgen.project.%d' % i for i in range(8)])
+        self.assertGreater(len(VSGTestSuite.threads), 1)
+
+    def test_shared_scans(self):
+        """
+        Tests that the root paths of several projects are shared while the suite is constructed and released by the last walk, and that lazy projects are not expected to share them.
+        """
+        self.addCleanup(VSGScanService.clear)
+        self._config.read_dict(dict(('vsgen.project.%d' % i, {'root_path': self._root}) for i in range(8)))
+        self._config.set('vsgen.project.7', 'lazy_files', 'true')
+        VSGScanSuite.walks = []
+        VSGScanSuite(self._config)
+        self.assertEqual(max(VSGScanSuite.walks), 1)
+        self.assertEqual((VSGScanService.walks, VSGScanService.saved, VSGScanService._listings, VSGScanService._expected), (1, 6, {}, {}))
+
+    def test_shared_scans_files(self):
+        """
+        Tests that the suites of several configuration files share the listings of their root paths.
+        """
+        self.addCleanup(VSGScanService.clear)
+        filenames = []
+        for name in ['one', 'two']:
+            filename = os.path.join(self._root, name + '.cfg')
+            with open(filename, 'wt') as f:
+                f.write('[vsgen]\nroot = .\n\n[vsgen.solution.{0}]\nname = {0}\nfilename = {0}.sln\nvisual_studio_version = 14.0\nprojects = vsgen.project.a, vsgen.project.b\n\n'.format(name))
+                for project in ['a', 'b']:
+                    f.write('[vsgen.project.{}]\nroot_path = {}\n\n'.format(project, self._root))
+            filenames.append(filename)
+
+        VSGScanSuite.walks = []
+        suites = VSGScanSuite.from_args(suite_commands='generate', configuration_filenames=filenames)
+        self.assertEqual(len(suites), 2)
+        self.assertEqual((VSGScanService.walks, VSGScanService.saved, VSGScanService._listings, VSGScanService._expected), (1, 3, {}, {}))
+
+    def test_serial_projects(self):
+        """
+        Tests that a single thread constructs the projects one after another.
+        """
+        self._config.set('vsgen', 'threads', '1')
+        suite = VSGTestSuite(self._config)
+        self.assertEqual([p.Name for p in suite._solutions[0].Projects], ['vsgen.project.%d' % i for i in range(8)])
+        self.assertEqual(VSGTestSuite.threads, set([threading.current_thread().name]))
+
+    def test_shared_projects(self):
+        """
+        Tests that a project section referenced by several solutions is constructed once.
+        """
+        self._config.read_dict({
+            'vsgen.solution.other': {'name': 'other', 'filename': 'other.sln', 'visual_studio_version': '14.0', 'projects': 'vsgen.project.9, vsgen.project.1'},
+            'vsgen.solution.legacy': {'name': 'legacy', 'filename': 'legacy.sln', 'visual_studio_version': '12.0', 'projects': 'vsgen.project.1'}
+        })
+        suite = VSGTestSuite(self._config)
+        solutions = dict((s.Name, s) for s in suite._solutions)
+        self.assertIs(solutions['other'].Projects[1], solutions['test'].Projects[1])
+        self.assertIsNot(solutions['legacy'].Projects[0], solutions['test'].Projects[1])
+        self.assertEqual(len(set(p for s in suite._solutions for p in s.Projects)), 10)
+
+    def test_stream_projects(self):
+        """
+        Tests that projects are written while the suite is constructed and are not written again.
+        """
+        self._config.set('vsgen', 'threads', '1')
+        events = VSGStreamSuite.events = VSGStreamProject.events = []
+        lock = threading.Lock()
+
+        def consume(project):
+            project.write()
+            with lock:
+                project.register()
+
+        with VSGPipeline(consume, 1, 1) as pipeline:
+            suite = VSGStreamSuite(self._config, pipeline)
+        self.assertEqual(sorted(p.Name for p in pipeline.consumed), ['vsgen.project.%d' % i for i in range(8)])
+        self.assertLess(events.index(('write', 'vsgen.project.0')), events.index(('construct', 'vsgen.project.7')))
+
+        del events[:]
+        suite.write(False, written=pipeline.consumed)
+        self.assertEqual(events, [('write', 'test')])
+
+    def test_write_failure(self):
+        """
+        Tests that a project that fails to write is not registered and does not prevent the registration of the other projects.
+        """
+        self._config.set('vsgen', 'threads', '1')
+        events = VSGStreamSuite.events = VSGStreamProject.events = []
+        VSGStreamProject.failing = set(['vsgen.project.3'])
+        suite = VSGStreamSuite(self._config)
+        self.assertRaises(IOError, suite.write, False)
+        self.assertEqual([e[1] for e in events if e[0] == 'register'], ['vsgen.project.%d' % i for i in range(8) if i != 3])
+        self.assertNotIn(('write', 'test'), events)
+
+    def test_stream_failure(self):
+        """
+        Tests that a project whose write fails while streaming is written again with the solution.
+        """
+        filename = os.path.join(self._root, 'test.cfg')
+        with open(filename, 'w') as f:
+            self._config.set('vsgen', 'threads', '1')
+            self._config.write(f)
+        events = VSGStreamSuite.events = VSGStreamProject.events = []
+        VSGStreamProject.failing = set(['vsgen.project.3'])
+
+        suite = VSGStreamSuite.stream(filename, parallel=False)
+        self.assertIsInstance(suite, VSGStreamSuite)
+        written = [e[1] for e in events if e[0] == 'write']
+        self.assertEqual(sorted(written[:-2]), ['vsgen.project.%d' % i for i in range(8) if i != 3])
+        self.assertEqual(written[-2:], ['vsgen.project.3', 'test'])
+        self.assertEqual(sorted(e[1] for e in events if e[0] == 'register'), ['vsgen.project.%d' % i for i in range(8)])
+
+
+class TestSuiteSnapshot(unittest.TestCase):
+    """
+    Tests saving a suite to a snapshot and loading it back.
+    """
+
+    def setUp(self):
+        """
+        The class specific setUp method
+        """
+        self._root = tempfile.mkdtemp()
+        self._source = os.path.join(self._root, 'source')
+        os.makedirs(os.path.join(self._source, 'package'))
+        os.makedirs(os.path.join(self._source, 'build'))
+        for name in ['main.py', 'README.txt', os.path.join('package', 'module.py')]:
+            open(os.path.join(self._source, name), 'w').close()
+
+        self._filename = os.path.join(self._root, 'test.cfg')
+        with open(self._filename, 'w') as f:
+            f.write('[vsgen]\nroot = {}\nthreads = 2\n'.format(self._root))
+            f.write('[vsgen.solution.test]\nname = test\nfilename = test.sln\nvisual_studio_version = 14.0\nprojects = vsgen.project.1, vsgen.project.2\n')
+            f.write('[vsgen.solution.other]\nname = other\nfilename = other.sln\nvisual_studio_version = 14.0\nprojects = vsgen.project.2\n')
+        self._config = VSGConfigParser()
+        self._config.read([self._filename])
+        self._snapshot = os.path.join(self._root, 'test.snapshot')
+        self._environ = os.environ.get('VSGEN_CACHE_DIR')
+        os.environ['VSGEN_CACHE_DIR'] = os.path.join(self._root, 'cache')
+        VSGTestSuite.threads = set()
+
+    def tearDown(self):
+        """
+        The class specific tearDown method
+        """
+        if self._environ is None:
+            del os.environ['VSGEN_CACHE_DIR']
+        else:
+            os.environ['VSGEN_CACHE_DIR'] = self._environ
+        shutil.rmtree(self._root)
+
+    def _suite(self):
+        """
+        Creates a suite whose projects insert the files of the source directory.
+        """
+        suite = VSGTestSuite(self._config)
+        for p in set(p for s in suite._solutions for p in s.Projects):
+            p.CompileInFilter = ['*.py']
+            p.DirectoryExFilter = ['*build']
+            p.insert_files(self._source)
+        return suite
+
+    def test_snapshot(self):
+        """
+        Tests that a snapshot restores the solutions, projects, files and GUIDs of a suite and loads the files lazily.
+        """
+        suite = self._suite()
+        self.assertTrue(suite.snapshot(self._snapshot, [self._filename]))
+
+        loaded = VSGSuite.from_snapshot(self._snapshot, [self._filename])
+        self.assertIsNotNone(loaded)
+        self.assertEqual([s.GUID for s in loaded._solutions], [s.GUID for s in suite._solutions])
+        solutions = dict((s.Name, s) for s in loaded._solutions)
+        self.assertIs(solutions['test'].Projects[1], solutions['other'].Projects[0])
+
+        project, original = solutions['test'].Projects[1], suite._solutions[0].Projects[1]
+        self.assertIsInstance(project.__dict__['_compile_files'], VSGSnapshotTable)
+        self.assertEqual(project.GUID, original.GUID)
+        self.assertEqual(list(project.CompileFiles), list(original.CompileFiles))
+        self.assertEqual(list(project.ContentFiles), [os.path.join(self._source, 'README.txt')])
+        self.assertEqual(project.RootPaths, [self._source])
+
+    def test_relative_filename(self):
+        """
+        Tests that the root of a configuration file read with a relative filename is absolute, even when it is read from the cache in another working directory.
+        """
+        with open(os.path.join(self._root, 'relative.cfg'), 'w') as f:
+            f.write('[vsgen]\nroot = source\n')
+        self.addCleanup(os.chdir, os.getcwd())
+        roots = []
+        for directory, filename in [(self._root, 'relative.cfg'), (self._source, os.path.join(os.pardir, 'relative.cfg'))]:
+            os.chdir(directory)
+            roots.append(VSGSuite.read_config(filename).get('vsgen', 'root'))
+        for root in roots:
+            self.assertTrue(os.path.isabs(root))
+            self.assertTrue(os.path.samefile(root, self._source))
+
+    def test_close(self):
+        """
+        Tests that the snapshot file is closed once every table is loaded.
+        """
+        self._suite().snapshot(self._snapshot, [self._filename])
+        loaded = VSGSuite.from_snapshot(self._snapshot, [self._filename])
+        reader = loaded._snapshot_reader
+        projects = set(p for s in loaded._solutions for p in s.Projects)
+        for p in projects:
+            list(p.CompileFiles)
+            list(p.ContentFiles)
+        self.assertFalse(reader.closed)
+        for p in projects:
+            list(p.Directories)
+        self.assertTrue(reader.closed)
+
+    def test_tampered(self):
+        """
+        Tests that a snapshot whose content or key changed is ignored.
+        """
+        self._suite().snapshot(self._snapshot, [self._filename])
+        with open(self._snapshot, 'r+b') as f:
+            f.seek(-40, os.SEEK_END)
+            data = f.read(1)
+            f.seek(-40, os.SEEK_END)
+            f.write(bytearray([data[0] ^ 0xff]))
+        self.assertIsNone(VSGSuite.from_snapshot(self._snapshot, [self._filename]))
+
+        self._suite().snapshot(self._snapshot, [self._filename])
+        os.remove(os.path.join(self._root, 'cache', 'snapshot.key'))
+        self.assertIsNone(VSGSuite.from_snapshot(self._snapshot, [self._filename]))
+
+        if hasattr(os, 'getuid'):
+            self._suite().snapshot(self._snapshot, [self._filename])
+            os.chmod(os.path.join(self._root, 'cache', 'snapshot.key'), 0o644)
+            self.assertIsNone(VSGSuite.from_snapshot(self._snapshot, [self._filename]))
+
+    def test_stale(self):
+        """
+        Tests that a snapshot is ignored once its inputs change.
+        """
+        self.assertIsNone(VSGSuite.from_snapshot(self._snapshot))
+        self._suite().snapshot(self._snapshot, [self._filename])
+        self.assertIsNone(VSGSuite.from_snapshot(self._snapshot, [self._filename], validate=lambda header: False))
+        self.assertIsNone(VSGSuite.from_snapshot(self._snapshot, []))
+
+        open(os.path.join(self._source, 'build', 'output.py'), 'w').close()
+        self.assertIsNotNone(VSGSuite.from_snapshot(self._snapshot, [self._filename]))
+        open(os.path.join(self._source, 'package', 'added.py'), 'w').close()
+        self.assertIsNone(VSGSuite.from_snapshot(self._snapshot, [self._filename]))
+
+        self._suite().snapshot(self._snapshot, [self._filename])
+        self.assertIsNotNone(VSGSuite.from_snapshot(self._snapshot, [self._filename]))
+        with open(self._filename, 'a') as f:
+            f.write('[vsgen.project.3]\n')
+        self.assertIsNone(VSGSuite.from_snapshot(self._snapshot, [self._filename]))
+
+    def test_modified_during_construction(self):
+        """
+        Tests that a snapshot is not valid for the inputs modified after the suite started to be built.
+        """
+        self._suite().snapshot(self._snapshot, [self._filename], since=time.time())
+        self.assertIsNone(VSGSuite.from_snapshot(self._snapshot, [self._filename]))
+
+    def test_replace(self):
+        """
+        Tests that a suite loaded from a snapshot can replace it.
+        """
+        self._suite().snapshot(self._snapshot, [self._filename])
+        loaded = VSGSuite.from_snapshot(self._snapshot, [self._filename])
+        self.assertTrue(loaded.snapshot(self._snapshot, [self._filename]))
+        self.assertNotIn('_snapshot_reader', loaded.__dict__)
+        self.assertEqual(len(loaded._solutions[0].Projects[0].CompileFiles), 2)
+        self.assertEqual(len(VSGSuite.from_snapshot(self._snapshot, [self._filename])._solutions[0].Projects[0].CompileFiles), 2)
+
+if __name__ == '__main__':
+    unittest.main()
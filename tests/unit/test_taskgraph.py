@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+This module provides all unit tests for the task graph functionality.
+"""
+import time
+import threading
+import unittest
+
+from vsgen.util.taskgraph import VSGTaskGraph
+
+
+class TestTaskGraph(unittest.TestCase):
+    """
+    Tests running a graph of dependent tasks.
+    """
+
+    def setUp(self):
+        """
+        The class specific setUp method
+        """
+        self._events = []
+        self._lock = threading.Lock()
+
+    def _task(self, name, delay=0.0, error=None):
+        """
+        Returns a task function that records its start and end.
+        """
+        def task():
+            with self._lock:
+                self._events.append(('start', name))
+            time.sleep(delay)
+            with self._lock:
+                self._events.append(('end', name))
+            if error:
+                raise error
+        return task
+
+    def _graph(self):
+        """
+        Creates a graph where 'c' depends on 'a' and 'b', and 'd' on 'c'.
+        """
+        graph = VSGTaskGraph()
+        graph.add('a', self._task('a', 0.05))
+        graph.add('b', self._task('b', 0.01))
+        graph.add('c', self._task('c', 0.01), ['a', 'b'])
+        graph.add('d', self._task('d'), ['c'])
+        graph.add('e', self._task('e', 0.01))
+        return graph
+
+    def test_serial(self):
+        """
+        Tests that a single thread runs the tasks in the order they were added.
+        """
+        graph = self._graph()
+        self.assertEqual(graph.run(1), [])
+        self.assertEqual([n for e, n in self._events if e == 'start'], ['a', 'b', 'c', 'd', 'e'])
+        self.assertEqual([t.key for t in graph.critical_path()], ['a', 'c', 'd'])
+
+    def test_concurrent(self):
+        """
+        Tests that independent tasks overlap and that dependent tasks wait for their dependencies.
+        """
+        graph = self._graph()
+        self.assertEqual(graph.run(4), [])
+        order = dict((event, i) for i, event in enumerate(self._events))
+        self.assertLess(order[('start', 'e')], order[('end', 'a')])
+        self.assertLess(order[('end', 'a')], order[('start', 'c')])
+        self.assertLess(order[('end', 'b')], order[('start', 'c')])
+        self.assertLess(order[('end', 'c')], order[('start', 'd')])
+        self.assertEqual([t.key for t in graph.critical_path()], ['a', 'c', 'd'])
+        self.assertGreaterEqual(graph.span(['a', 'c']), graph['a'].duration + graph['c'].duration)
+
+    def test_failure(self):
+        """
+        Tests that the dependents of a failed task are skipped and that independent tasks complete.
+        """
+        for threads in [1, 4]:
+            self._events = []
+            graph = VSGTaskGraph()
+            graph.add('a', self._task('a', error=ValueError('a')))
+            graph.add('b', self._task('b'), ['a'])
+            graph.add('c', self._task('c'), ['b'])
+            graph.add('d', self._task('d', 0.01))
+            failures = graph.run(threads)
+            self.assertEqual([t.key for t in failures], ['a'])
+            self.assertEqual(sorted(n for e, n in self._events if e == 'end'), ['a', 'd'])
+            self.assertIsNone(graph['c'].start)
+
+    def test_after(self):
+        """
+        Tests that a task ordered after another one waits for it but still runs when it fails.
+        """
+        for threads in [1, 4]:
+            self._events = []
+            graph = VSGTaskGraph()
+            graph.add('a', self._task('a', 0.01, ValueError('a')))
+            graph.add('b', self._task('b'))
+            graph.add('ra', self._task('ra'), ['a'])
+            graph.add('rb', self._task('rb'), ['b'], after=['ra'])
+            failures = graph.run(threads)
+            self.assertEqual([t.key for t in failures], ['a'])
+            self.assertIsNone(graph['ra'].start)
+            self.assertEqual(self._events[-2:], [('start', 'rb'), ('end', 'rb')])
+            self.assertEqual([t.key for t in graph.critical_path()], ['a', 'ra', 'rb'])
+
+    def test_invalid(self):
+        """
+        Tests that tasks must be unique and depend on tasks already in the graph.
+        """
+        graph = VSGTaskGraph()
+        graph.add('a', self._task('a'))
+        self.assertRaises(ValueError, graph.add, 'a', self._task('a'))
+        self.assertRaises(ValueError, graph.add, 'b', self._task('b'), ['c'])
+        self.assertRaises(ValueError, graph.add, 'b', self._task('b'), after=['c'])
+        self.assertEqual(VSGTaskGraph().run(4), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+"""
+This module provides all unit tests for the watch functionality.
+"""
+import errno
+import os
+import shutil
+import tempfile
+import unittest
+
+from vsgen.project import VSGProject
+from vsgen.util.config import VSGConfigParser, clear_globs
+from vsgen.util.ignore import IGNORE_FILENAME
+from vsgen.util.watch import VSGPollingWatcher, VSGInotifyWatcher
+
+
+class VSGSearchProject(VSGProject):
+    """
+    A project with a search path, like the projects of the plugins.
+    """
+
+    def _import(self, datadict):
+        """
+        Imports the search path in addition to the project's variables.
+        """
+        super(VSGSearchProject, self)._import(datadict)
+        self.SearchPath = datadict.get('SearchPath', [])
+
+
+class TestWatch(unittest.TestCase):
+    """
+    Tests the detection of changes and the rescanning of projects.
+    """
+
+    def setUp(self):
+        """
+        The class specific setUp method
+        """
+        self._root = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self._root, 'pkg'))
+        self._touch('main.py')
+        self._touch(IGNORE_FILENAME)
+        self._other = tempfile.mkdtemp()
+        self._manifest = os.path.join(self._other, 'manifest.txt')
+        self._modify(self._manifest)
+
+    def tearDown(self):
+        """
+        The class specific tearDown method
+        """
+        shutil.rmtree(self._root)
+        shutil.rmtree(self._other)
+        clear_globs()
+
+    def _touch(self, *paths):
+        """
+        Creates an empty file under the test root.
+        """
+        with open(os.path.join(self._root, *paths), 'wt') as f:
+            f.write('')
+
+    def _modify(self, path):
+        """
+        Rewrites a file in place and moves its modification time forward.
+        """
+        with open(path, 'at') as f:
+            f.write('main.py\n')
+        mtime = os.stat(path).st_mtime + 10
+        os.utime(path, (mtime, mtime))
+
+    def _test_watcher(self, watcher):
+        """
+        Tests that a watcher reports a new file.
+        """
+        with watcher:
+            self.assertEqual(watcher.wait(0.1), set())
+            self._touch('pkg', 'module.py')
+            changes = watcher.wait(5.0)
+            self.assertTrue(any(c.startswith(os.path.join(self._root, 'pkg')) for c in changes))
+
+    def _test_control_files(self, watcher):
+        """
+        Tests that a watcher reports the control files modified in place but not the other files of their directories.
+        """
+        with watcher:
+            self._modify(os.path.join(self._root, IGNORE_FILENAME))
+            self.assertIn(os.path.join(self._root, IGNORE_FILENAME), watcher.wait(5.0))
+            while watcher.wait(0.2):
+                pass
+
+            self._modify(self._manifest)
+            self.assertIn(self._manifest, watcher.wait(5.0))
+            while watcher.wait(0.2):
+                pass
+
+            with open(os.path.join(self._other, 'unrelated.txt'), 'wt') as f:
+                f.write('')
+            self.assertEqual(watcher.wait(0.2), set())
+
+    def _test_exclusions(self, watcher):
+        """
+        Tests that a watcher skips the ``.git`` and excluded directories and ignores the ignored paths.
+        """
+        with watcher:
+            self._touch('.git', 'index')
+            self._touch('build', 'output.py')
+            self._touch('project.pyproj')
+            self.assertEqual(watcher.wait(0.2), set())
+
+            self._touch('pkg', 'module.py')
+            changes = watcher.wait(5.0)
+            self.assertTrue(changes)
+            self.assertTrue(all(c.startswith(os.path.join(self._root, 'pkg')) for c in changes))
+
+    def _exclusion_args(self):
+        """
+        Returns the keyword arguments of the watchers tested by :meth:`_test_exclusions`.
+        """
+        os.makedirs(os.path.join(self._root, '.git'))
+        os.makedirs(os.path.join(self._root, 'build'))
+        project = VSGProject(DirectoryExFilter=['*build'])
+        project.insert_files(self._root)
+        self.assertTrue(project.excludes(os.path.join(self._root, 'build')))
+        self.assertTrue(project.excludes(self._other))
+        self.assertFalse(project.excludes(os.path.join(self._root, 'pkg')))
+        return {'exclude': project.excludes, 'ignore': [os.path.join(self._root, 'project.pyproj')]}
+
+    def test_polling_exclusions(self):
+        """
+        Tests the polling watcher's exclusions.
+        """
+        self._test_exclusions(VSGPollingWatcher([self._root], interval=0.05, **self._exclusion_args()))
+
+    def test_inotify_exclusions(self):
+        """
+        Tests the inotify watcher's exclusions.
+        """
+        if not VSGInotifyWatcher.available():
+            self.skipTest('inotify is not available')
+        self._test_exclusions(VSGInotifyWatcher([self._root], **self._exclusion_args()))
+
+    def test_polling_watcher(self):
+        """
+        Tests the polling watcher.
+        """
+        self._test_watcher(VSGPollingWatcher([self._root], interval=0.05))
+
+    def test_inotify_watcher(self):
+        """
+        Tests the inotify watcher.
+        """
+        if not VSGInotifyWatcher.available():
+            self.skipTest('inotify is not available')
+        self._test_watcher(VSGInotifyWatcher([self._root]))
+
+    def test_polling_control_files(self):
+        """
+        Tests the polling watcher's control files.
+        """
+        self._test_control_files(VSGPollingWatcher([self._root], interval=0.05, files=[self._manifest]))
+
+    def test_inotify_control_files(self):
+        """
+        Tests the inotify watcher's control files.
+        """
+        if not VSGInotifyWatcher.available():
+            self.skipTest('inotify is not available')
+        self._test_control_files(VSGInotifyWatcher([self._root], files=[self._manifest]))
+
+    def test_inotify_fallback(self):
+        """
+        Tests that the inotify watcher falls back to polling when a new directory cannot be watched.
+        """
+        if not VSGInotifyWatcher.available():
+            self.skipTest('inotify is not available')
+
+        def add(root):
+            raise OSError(errno.ENOSPC, os.strerror(errno.ENOSPC))
+
+        with VSGInotifyWatcher([self._root], interval=0.05) as watcher:
+            watcher._add = add
+            os.makedirs(os.path.join(self._root, 'new'))
+            self.assertIn(self._root, watcher.wait(5.0))
+            self.assertIsInstance(watcher._fallback, VSGPollingWatcher)
+
+            self._touch('new', 'module.py')
+            self.assertIn(os.path.join(self._root, 'new'), watcher.wait(5.0))
+
+    def test_rescan(self):
+        """
+        Tests that a rescan replaces the inserted files but keeps the explicit ones.
+        """
+        project = VSGProject(CompileInFilter=['*.py'], CompileFiles=['explicit.py'])
+        project.insert_files(self._root)
+        self.assertEqual(project.RootPaths, [self._root])
+        self.assertFalse(project.rescan())
+
+        self._touch('pkg', 'module.py')
+        os.remove(os.path.join(self._root, 'main.py'))
+        self.assertTrue(project.rescan())
+        self.assertEqual(project.CompileFiles, ['explicit.py', os.path.join(self._root, 'pkg', 'module.py')])
+
+    def test_rescan_search_path(self):
+        """
+        Tests that a rescan expands the search path patterns again once the expansions are discarded.
+        """
+        parser = VSGConfigParser()
+        parser.read_dict({'vsgen.project.test': {'search_path': os.path.join(self._root, '*')}})
+        project = VSGSearchProject.from_section(parser, 'vsgen.project.test')
+        self.assertEqual(project.SearchPath, [os.path.join(self._root, 'pkg')])
+
+        os.makedirs(os.path.join(self._root, 'lib'))
+        self.assertFalse(project.rescan())
+        clear_globs()
+        self.assertTrue(project.rescan())
+        self.assertEqual(sorted(project.SearchPath), [os.path.join(self._root, 'lib'), os.path.join(self._root, 'pkg')])
+
+if __name__ == '__main__':
+    unittest.main()
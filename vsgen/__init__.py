@@ -1,22 +1,11 @@
 # -*- coding: utf-8 -*-
 """
 Main __init__.py for the vsgen package
+
+The package's public names and its ``__version__`` are resolved on first access so that importing vsgen (e.g. for ``vsgen --help``) does not import every module, `Jinja2 <http://jinja.pocoo.org/>`_ or ``pkg_resources``.  Python versions without module level ``__getattr__`` (before 3.7) import the names eagerly.
 """
-import pkg_resources
-try:
-    pkg = pkg_resources.get_distribution("vsgen")
-    __version__ = pkg.version
-except pkg_resources.DistributionNotFound:
-    __version__ = "0.0.0.0"
-
-from vsgen.solution import VSGSolution
-from vsgen.project import VSGProject
-from vsgen.register import VSGRegisterable, VSGRegisterCommand
-from vsgen.writer import VSGWriter, VSGWritable, VSGWriteCommand
-from vsgen.suite import VSGSuite
-from vsgen.util.logger import VSGLogger
-from vsgen.util.timer import VSGTimer
-from vsgen.util.config import VSGConfigParser
+import sys
+import importlib
 
 __all__ = [
     'VSGSolution',
@@ -31,3 +20,65 @@ __all__ = [
     'VSGTimer',
     'VSGConfigParser'
 ]
+
+_modules = {
+    'VSGSolution': 'vsgen.solution',
+    'VSGProject': 'vsgen.project',
+    'VSGRegisterable': 'vsgen.register',
+    'VSGRegisterCommand': 'vsgen.register',
+    'VSGWriter': 'vsgen.writer',
+    'VSGWritable': 'vsgen.writer',
+    'VSGWriteCommand': 'vsgen.writer',
+    'VSGSuite': 'vsgen.suite',
+    'VSGLogger': 'vsgen.util.logger',
+    'VSGTimer': 'vsgen.util.timer',
+    'VSGConfigParser': 'vsgen.util.config'
+}
+
+
+def _version():
+    """
+    Returns the version of the installed vsgen distribution.
+    """
+    try:
+        from importlib import metadata
+    except ImportError:
+        import pkg_resources
+        try:
+            return pkg_resources.get_distribution("vsgen").version
+        except pkg_resources.DistributionNotFound:
+            return "0.0.0.0"
+    try:
+        return metadata.version("vsgen")
+    except metadata.PackageNotFoundError:
+        return "0.0.0.0"
+
+
+def __getattr__(name):
+    """
+    Resolves the package's public names and ``__version__`` on first access.
+
+    :param str name:  The name of the attribute.
+    """
+    if name == '__version__':
+        value = _version()
+    elif name in _modules:
+        value = getattr(importlib.import_module(_modules[name]), name)
+    else:
+        raise AttributeError("module 'vsgen' has no attribute '{}'".format(name))
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """
+    Lists the package's attributes, including the names that are not resolved yet.
+    """
+    return sorted(set(globals()) | set(__all__) | set(['__version__']))
+
+
+if sys.version_info < (3, 7):
+    __version__ = _version()
+    for _name in __all__:
+        __getattr__(_name)
+    del _name
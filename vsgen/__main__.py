@@ -22,6 +22,8 @@ def main(argv=None):
     """
     from vsgen import VSGSuite
     from vsgen import VSGLogger
+    from vsgen.util.profiler import VSGScanProfiler
+    from vsgen.util.scan import VSGScanService
 
     # Special case to use the sys.argv when main called without a list.
     if argv is None:
@@ -32,8 +34,39 @@ def main(argv=None):
 
     # Construct a command line parser and parse the command line
     args = VSGSuite.make_parser(description='Executes the vsgen package as an application.').parse_args(argv[1:])
-    for s in VSGSuite.from_args(**vars(args)):
+    profile = getattr(args, 'profile_scan', None)
+    if profile:
+        VSGScanProfiler.enable()
+    # Generate several configuration files in a pool of processes.
+    if args.suite_commands == 'generate' and args.jobs != 1 and len(args.configuration_filenames) > 1:
+        failures = VSGSuite.generate(args.configuration_filenames, args.jobs, args.snapshot, args.stream)
+        if profile:
+            VSGScanProfiler.write(profile, args.profile_format)
+        return 1 if failures else 0
+
+    # Write the projects of each configuration file while they are constructed.
+    if args.suite_commands == 'generate' and args.stream:
+        for filename in args.configuration_filenames:
+            VSGSuite.stream(filename, args.snapshot, False)
+        suites = []
+    else:
+        suites = VSGSuite.from_args(**vars(args))
+    for s in suites:
         s.write(False)
+
+    # Release the listings shared by the suites of the command.
+    VSGScanService.clear()
+
+    # Report the scans, including the scans of any lazy files while writing.
+    if profile:
+        VSGScanProfiler.write(profile, args.profile_format)
+
+    # Keep regenerating the suite until interrupted.
+    if args.suite_commands == 'watch':
+        try:
+            suites[0].watch(poll=args.poll, interval=args.interval, debounce=args.debounce, parallel=False)
+        except KeyboardInterrupt:
+            pass
     return 0
 
 
@@ -4,9 +4,33 @@ This module provides the neccessary defintions to support a base project file de
 """
 
 import os
+import sys
 import fnmatch
 import itertools
+import functools
+import contextlib
 import uuid
+from timeit import default_timer
+
+from vsgen.util.config import expand_dirs
+from vsgen.util.filelist import VSGPathTable, VSGRelativeView, VSGFileStream, VSGFileSource
+from vsgen.util.ignore import IGNORE_FILENAME, ignore_walk
+
+# The modules needed to scan, index and snapshot a project's files are imported by the methods using them, so importing a project stays cheap.
+
+
+def _imported(module, name):
+    """
+    Returns a class of a module if the module is already imported.
+
+    Instances of the class cannot exist before its module is imported, so checking a value against the class does not need to import the module.
+
+    :param str module:  The name of the module.
+    :param str name:    The name of the class.
+    :return:  The class; or a tuple of no classes if the module is not imported.
+    """
+    module = sys.modules.get(module)
+    return getattr(module, name) if module else ()
 
 
 class VSGProject(object):
@@ -21,15 +45,20 @@ class VSGProject(object):
     :ivar str   RootNamespace:          The name of the root namespace of the project; if not provide the value is "". `Ignored`.
     :ivar str   ProjectHome:            The absolute directory of the project's source root folder; if not provide the value is ""
     :ivar str   StartupFile:            The absolute path to the Startup file; if not provide the value is ""
-    :ivar list  CompileFiles:           The list of absolute files that will comprise the projects compile group; if not provide the value is [].
-    :ivar list  ContentFiles:           The list of absolute files that will comprise the projects content group; if not provide the value is [].
-    :ivar list  Directories:            The list of absolute directories that will comprise the projects directory group; if not provide the value is [].
+    :ivar list  CompileFiles:           The list of absolute files that will comprise the projects compile group, stored in a :class:`~vsgen.util.filelist.VSGPathTable`; if not provide the value is [].
+    :ivar list  ContentFiles:           The list of absolute files that will comprise the projects content group, stored in a :class:`~vsgen.util.filelist.VSGPathTable`; if not provide the value is [].
+    :ivar list  Directories:            The list of absolute directories that will comprise the projects directory group, stored in a :class:`~vsgen.util.filelist.VSGPathTable`; if not provide the value is [].
     :ivar list  DirectoryInFilter:      A list of fnmatch expressions to match directories to be included during the item generation step; if not provided the value is [].
     :ivar list  DirectoryExFilter:      A list of fnmatch expressions to match directories to be excludes during the item generation step; if not provided the value is [].
     :ivar list  CompileInFilter:        A list of fnmatch expressions to match compile files to be included during the item generation step; if not provide the value is [].
     :ivar list  CompileExFilter:        A list of fnmatch expressions to match compile files to be excluded during the item generation step; if not provide the value is [].
     :ivar list  ContentInFilter:        A list of fnmatch expressions to match content files to be included during the item generation step; if not provide the value is [].
     :ivar list  ContentExFilter:        A list of fnmatch expressions to match content files to be excluded during the item generation step; if not provide the value is [].
+    :ivar str   FileSource:             The source of the candidate files during the item generation step; either ``walk`` (the file system) or ``git`` (the git index); if not provide the value is ``walk``.
+    :ivar str   FileManifest:           The path to a text file listing one file per line, or to a tar or zip archive, whose entries are used as the candidate files instead of the :attr:`FileSource`; if not provide the value is "".
+    :ivar str   FileIndex:              The path to a SQLite database that stores the compile and content files instead of memory; the database is kept between runs and only the changed files are written.  If not provide the value is "".
+    :ivar bool  FollowLinks:            The boolean flag to follow symbolic links to directories when walking the file system; each physical directory is still only walked once.  If not provide the value is False.
+    :ivar bool  LazyFiles:              The boolean flag to generate the compile and content files while they are iterated instead of while they are inserted; if not provide the value is False.
     :ivar float VSVersion:              The Visual Studio version; if not provide the value is ``None``.
     """
     __project_type__ = None
@@ -41,6 +70,9 @@ class VSGProject(object):
         :param kwargs:         List of arbitrary keyworded arguments to be processed as instance variable data
         """
         super(VSGProject, self).__init__()
+        self._insertions = []
+        self._inserted = set()
+        self._search_patterns = []
         self._import(kwargs)
 
     def _import(self, datadict):
@@ -66,6 +98,11 @@ class VSGProject(object):
         self.CompileExFilter = datadict.get("CompileExFilter", [])
         self.ContentInFilter = datadict.get("ContentInFilter", [])
         self.ContentExFilter = datadict.get("ContentExFilter", [])
+        self.FileSource = datadict.get("FileSource", "walk")
+        self.FileManifest = datadict.get("FileManifest", "")
+        self.FileIndex = datadict.get("FileIndex", "")
+        self.FollowLinks = datadict.get("FollowLinks", False)
+        self.LazyFiles = datadict.get("LazyFiles", False)
         self.VSVersion = datadict.get("VSVersion", None)
 
     @classmethod
@@ -83,6 +120,7 @@ class VSGProject(object):
         p.Name = config.get(section, 'name', fallback=p.Name)
         p.FileName = config.getfile(section, 'filename', fallback=p.FileName)
         p.SearchPath = config.getdirs(section, 'search_path', fallback=p.SearchPath)
+        p._search_patterns = config.getlist(section, 'search_path', fallback=[])
         p.OutputPath = config.getdir(section, 'output_path', fallback=p.OutputPath)
         p.WorkingDirectory = config.getdir(section, 'working_directory', fallback=p.WorkingDirectory)
         p.RootNamespace = config.get(section, 'root_namespace', fallback=p.RootNamespace)
@@ -96,12 +134,24 @@ class VSGProject(object):
         p.ContentExFilter = config.getlist(section, 'content_ex_filter', fallback=p.ContentExFilter)
         p.DirectoryInFilter = config.getlist(section, 'directory_in_filter', fallback=p.DirectoryInFilter)
         p.DirectoryExFilter = config.getlist(section, 'directory_ex_filter', fallback=p.DirectoryExFilter)
+        p.FileSource = config.get(section, 'file_source', fallback=p.FileSource)
+        p.FileManifest = config.get(section, 'file_manifest', fallback=p.FileManifest)
+        p.FileIndex = config.get(section, 'file_index', fallback=p.FileIndex)
+        p.FollowLinks = config.getboolean(section, 'follow_links', fallback=p.FollowLinks)
+        p.LazyFiles = config.getboolean(section, 'lazy_files', fallback=p.LazyFiles)
 
         root_path = config.get(section, 'root_path', fallback="")
         p.insert_files(root_path)
 
         return p
 
+    @property
+    def RootPaths(self):
+        """
+        Returns the root paths of the previous :meth:`insert_files` calls.
+        """
+        return [rootpath for rootpath, filters in self._insertions]
+
     @property
     def ProjectHomeRelative(self):
         """
@@ -130,28 +180,164 @@ class VSGProject(object):
         """
         return os.path.relpath(self.OutputPath, self.ProjectHome)
 
+    @property
+    def CompileFiles(self):
+        """
+        Returns the :class:`~vsgen.util.filelist.VSGPathTable` of compile files; assigning any list of files converts it to a table.
+        """
+        return self._loaded('_compile_files')
+
+    @CompileFiles.setter
+    def CompileFiles(self, value):
+        self._compile_files = self._files(value)
+
+    @property
+    def ContentFiles(self):
+        """
+        Returns the :class:`~vsgen.util.filelist.VSGPathTable` of content files; assigning any list of files converts it to a table.
+        """
+        return self._loaded('_content_files')
+
+    @ContentFiles.setter
+    def ContentFiles(self, value):
+        self._content_files = self._files(value)
+
+    @property
+    def Directories(self):
+        """
+        Returns the :class:`~vsgen.util.filelist.VSGPathTable` of directories; assigning any list of directories converts it to a table.
+        """
+        return self._loaded('_directories')
+
+    @Directories.setter
+    def Directories(self, value):
+        self._directories = self._files(value)
+
+    def _loaded(self, name):
+        """
+        Returns a file attribute, loading it first if it is still stored in a snapshot.
+
+        :param str name:  The name of the attribute.
+        """
+        value = getattr(self, name)
+        if isinstance(value, _imported('vsgen.util.snapshot', 'VSGSnapshotTable')):
+            value = value.load()
+            setattr(self, name, value)
+        return value
+
+    def __getstate__(self):
+        """
+        Returns the state of the project without its cached relative views.
+        """
+        state = self.__dict__.copy()
+        state['_views'] = {}
+        state['_directories_relative'] = None
+        return state
+
+    @contextlib.contextmanager
+    def rendering(self):
+        """
+        Returns a context manager that holds the lazy files while the project is rendered.
+
+        Each access of :attr:`CompileFiles`, :attr:`ContentFiles`, their ``*Relative`` views and :attr:`DirectoriesRelative` iterates the lazy files.  Within the context the root paths are traversed once, by the first access, and the later accesses reuse its files; the files are released when the context exits.  The context has no effect unless :attr:`LazyFiles` is set.
+        """
+        sources = []
+        for files in (self.CompileFiles, self.ContentFiles):
+            if isinstance(files, VSGFileStream):
+                sources.extend(s for s in files.sources if isinstance(s, VSGFileSource) and s not in sources)
+        for source in sources:
+            source.hold()
+        try:
+            yield self
+        finally:
+            for source in sources:
+                source.release()
+
+    @staticmethod
+    def _files(value):
+        """
+        Converts a collection of paths to the storage used by the file attributes.
+
+        :param value:  A collection of paths.
+        :return:  The value if it is already a :class:`~vsgen.util.filelist.VSGPathTable`, a lazy :class:`~vsgen.util.filelist.VSGFileStream` or an indexed :class:`~vsgen.util.index.VSGIndexedFiles`; a new :class:`~vsgen.util.filelist.VSGPathTable` otherwise.
+        """
+        if isinstance(value, (VSGPathTable, VSGFileStream, _imported('vsgen.util.index', 'VSGIndexedFiles'))):
+            return value
+        return VSGPathTable(value)
+
+    @property
+    def ProjectHome(self):
+        """
+        Returns the absolute directory of the project's source root folder; assigning a new value invalidates the cached relative views.
+        """
+        return self._project_home
+
+    @ProjectHome.setter
+    def ProjectHome(self, value):
+        self._project_home = value
+        self._views = {}
+        self._directories_relative = None
+
+    def _view(self, files):
+        """
+        Returns the cached :class:`~vsgen.util.filelist.VSGRelativeView` of a table.
+
+        :param VSGPathTable files:  The table of files.
+        """
+        view = self._views.get(id(files))
+        if view is None or view.table is not files:
+            view = self._views[id(files)] = VSGRelativeView(files, key=self.lower)
+        return view
+
+    def _relative(self, files):
+        """
+        Returns a generator iterating over the each file in a collection relative to :attr:`ProjectHome` directory.
+
+        The files are sorted unless :attr:`LazyFiles` is set, in which case they are streamed directory by directory in the order they are found.
+
+        :param files:  The collection of files.
+        """
+        if self.LazyFiles or not isinstance(files, VSGPathTable):
+            return (os.path.relpath(path, self.ProjectHome) for path in files)
+        return self._view(files).files(self.ProjectHome)
+
     @property
     def ContentFilesRelative(self):
         """
         Returns a generator iterating over the each file in :attr:`ContentFiles` relative to :attr:`ProjectHome` directory.
+
+        The files are sorted unless :attr:`LazyFiles` is set, in which case they are streamed directory by directory in the order they are found.
         """
-        return (os.path.relpath(path, self.ProjectHome) for path in sorted(self.ContentFiles, key=self.lower))
+        return self._relative(self.ContentFiles)
 
     @property
     def CompileFilesRelative(self):
         """
         Returns a generator iterating over the each file in :attr:`ContentFiles` relative to :attr:`ProjectHome` directory.
+
+        The files are sorted unless :attr:`LazyFiles` is set, in which case they are streamed directory by directory in the order they are found.
         """
-        return (os.path.relpath(path, self.ProjectHome) for path in sorted(self.CompileFiles, key=self.lower))
+        return self._relative(self.CompileFiles)
 
     @property
     def DirectoriesRelative(self):
         """
         Returns a generator iterating over the each directory referenced by the project, relative to :attr:`ProjectHome` directory.
         """
-        # Acquire all directories
-        directories = itertools.chain(self.Directories, (os.path.dirname(f) for f in itertools.chain(self.ContentFiles, self.CompileFiles)))
-        directories = set(os.path.relpath(d, self.ProjectHome) for d in directories)
+        tables = [self.Directories, self.ContentFiles, self.CompileFiles]
+        cacheable = all(isinstance(t, VSGPathTable) for t in tables)
+        if cacheable:
+            state = [(id(t), t.generation, len(t)) for t in tables]
+            if self._directories_relative and self._directories_relative[0] == state:
+                return list(self._directories_relative[1])
+
+            # Acquire all directories
+            directories = set(self._view(self.Directories).files(self.ProjectHome))
+            for files in tables[1:]:
+                directories.update(self._view(files).directories(self.ProjectHome))
+        else:
+            directories = itertools.chain(self.Directories, (os.path.dirname(f) for f in itertools.chain(self.ContentFiles, self.CompileFiles)))
+            directories = set(os.path.relpath(d, self.ProjectHome) for d in directories)
 
         # We need separate entries for parent directories of directories in the list
         for path in set(directories):
@@ -160,11 +346,49 @@ class VSGProject(object):
                 directories.add(subpath)
                 subpath = os.path.dirname(subpath)
 
-        return sorted(directories)
+        directories = sorted(directories)
+        if cacheable:
+            self._directories_relative = (state, directories)
+            return list(directories)
+        return directories
 
-    def insert_files(self, rootpath, directoryInFilter=None, directoryExFilter=None, compileInFilter=None, compileExFilter=None, contentInFilter=None, contentExFilter=None):
+    def _walk(self, rootpath, shared=True):
         """
-        Inserts files by recursive traversing the rootpath and inserting files according the addition filter parameters.
+        Walks the candidate files under the rootpath according to :attr:`FileManifest`, :attr:`FileSource` and :attr:`FollowLinks`, skipping anything excluded by a ``.vsgenignore`` file.
+
+        A manifest is used as is: it is not checked against the file system and its ``.vsgenignore`` files are not applied.
+
+        :param str rootpath:  The absolute path to the root directory.
+        :param bool shared:   Flag to share the listing through the :class:`~vsgen.util.scan.VSGScanService` so a root path is only walked once per process.
+        :return:  A generator of ``(root, dirnames, filenames)`` triplets compatible with :func:`os.walk`.
+        """
+        from vsgen.util.filesource import git_walk, link_walk, manifest_walk
+        from vsgen.util.scan import VSGScanService, scan_source
+
+        if not rootpath:
+            return iter([])
+        source = scan_source(self.FileSource, self.FileManifest, self.FollowLinks)
+        if self.FileManifest:
+            walker = functools.partial(manifest_walk, rootpath, self.FileManifest)
+        else:
+            if self.FileSource == 'walk' and self.FollowLinks:
+                walk = link_walk
+            elif self.FileSource == 'walk':
+                walk = os.walk
+            elif self.FileSource == 'git':
+                walk = git_walk
+            else:
+                raise ValueError('Unknown file source "{}"; expected one of "walk" or "git".'.format(self.FileSource))
+
+            def walker():
+                return ignore_walk(walk(rootpath))
+        return VSGScanService.walk(source, rootpath, walker) if shared else walker()
+
+    def iter_files(self, rootpath, directoryInFilter=None, directoryExFilter=None, compileInFilter=None, compileExFilter=None, contentInFilter=None, contentExFilter=None, shared=True):
+        """
+        Generates files by recursive traversing the rootpath and matching files according the addition filter parameters.
+
+        The candidate files are read from the :attr:`FileSource`; the filters are applied the same way regardless of the source.
 
         :param str rootpath:            The absolute path to the root directory.
         :param list directoryInFilter:  A list of fnmatch expressions to match directories to be included.  A `None` value will default to :attr:`DirectoryInFilter`.
@@ -173,6 +397,8 @@ class VSGProject(object):
         :param list compileExFilter:    A list of fnmatch expressions to match compile files to be excludes.  A `None` value will default to :attr:`CompileExFilter`.
         :param list contentInFilter:    A list of fnmatch expressions to match content files to be includes.  A `None` value will default to :attr:`ContentInFilter`.
         :param list contentExFilter:    A list of fnmatch expressions to match content files to be excludes.  A `None` value will default to :attr:`ContentExFilter`.
+        :param bool shared:             Flag to share the listing of the rootpath with other projects; a walk that is not shared keeps nothing in memory.
+        :return:  A generator of ``(kind, path)`` tuples where kind is either ``compile`` or ``content``.
         """
         # Overrides
         directoryInFilter = self.DirectoryInFilter if directoryInFilter is None else directoryInFilter
@@ -182,28 +408,209 @@ class VSGProject(object):
         contentInFilter = self.ContentInFilter if contentInFilter is None else contentInFilter
         contentExFilter = self.ContentExFilter if contentExFilter is None else contentExFilter
 
-        def filter(text, filters, explicit):
+        def filter(text, filters, explicit, option):
             """
             Convience filter function
 
             :param text text: The target text.
             :param list filters: The collection of fnmatch expressions
             :param bool explicit: Flag denoting an the empty filter collection return match failure.
+            :param str option: The name of the option the filters come from; only recorded when profiling.
             """
             if explicit:
                 return any(fnmatch.fnmatch(text, f) for f in filters)
             return not filters or any(fnmatch.fnmatch(text, f) for f in filters)
 
-        for root, dirnames, filenames in os.walk(rootpath):
+        from vsgen.util.profiler import VSGScanProfiler
 
+        walker = self._walk(rootpath, shared)
+
+        # Record the statistics of the scan when profiling
+        profile = VSGScanProfiler.profile(self.Name) if VSGScanProfiler.enabled else None
+        if profile:
+            walker = profile.walk(walker)
+            filter = profile.filter()
+
+        for root, dirnames, filenames in walker:
+            start = default_timer()
             searchdir = os.path.normpath(os.path.normcase(root))
 
             # If the root dir matches an excluded directory, stop any further searches
-            if filter(searchdir, directoryExFilter, True):
+            if filter(searchdir, directoryExFilter, True, 'directory_ex_filter'):
                 dirnames[:] = []
-            elif filter(searchdir, directoryInFilter, False):
-                for filepath in [os.path.join(root, filename) for filename in filenames]:
-                    if filter(filepath, compileInFilter, False) and not filter(filepath, compileExFilter, True):
-                        self.CompileFiles.append(filepath)
-                    elif filter(filepath, contentInFilter, False) and not filter(filepath, contentExFilter, True):
-                        self.ContentFiles.append(filepath)
+                if profile:
+                    profile.record(root, default_timer() - start, 0)
+                continue
+
+            # Visit the directories in a stable order so streamed files are reproducible
+            dirnames.sort()
+            files = []
+            if filter(searchdir, directoryInFilter, False, 'directory_in_filter'):
+                for filepath in [os.path.join(root, filename) for filename in sorted(filenames)]:
+                    if filter(filepath, compileInFilter, False, 'compile_in_filter') and not filter(filepath, compileExFilter, True, 'compile_ex_filter'):
+                        files.append(('compile', filepath))
+                    elif filter(filepath, contentInFilter, False, 'content_in_filter') and not filter(filepath, contentExFilter, True, 'content_ex_filter'):
+                        files.append(('content', filepath))
+                if profile:
+                    profile.record(root, default_timer() - start, len(filenames))
+            for f in files:
+                yield f
+
+    def scan_paths(self):
+        """
+        Returns the directories visited by the scans of the previous :meth:`insert_files` calls and the ``.vsgenignore`` files they applied.
+
+        The root paths are walked again the way :meth:`iter_files` walks them, so the directories excluded by the ``.vsgenignore`` files and the directory exclusion filters are not visited and the directories reached through followed symbolic links are.  A project reading its files from a :attr:`FileManifest` does not depend on any directory.
+
+        :return:  A list of paths whose changes could alter the project's files.
+        """
+        paths = []
+        if self.FileManifest:
+            return paths
+        for rootpath, filters in self._insertions:
+            for root, dirnames, filenames in self._walk(rootpath, shared=False):
+                if self._excluded(root, filters):
+                    dirnames[:] = []
+                    continue
+                paths.append(root)
+                if IGNORE_FILENAME in filenames:
+                    paths.append(os.path.join(root, IGNORE_FILENAME))
+        return paths
+
+    @staticmethod
+    def _excluded(dirpath, filters):
+        """
+        Returns True if a directory matches the directory exclusion filters of an :meth:`insert_files` call.
+
+        :param str dirpath:   The path of the directory.
+        :param dict filters:  The filters keyed by the :meth:`iter_files` parameter names.
+        """
+        searchdir = os.path.normpath(os.path.normcase(dirpath))
+        return any(fnmatch.fnmatch(searchdir, f) for f in filters['directoryExFilter'])
+
+    def excludes(self, dirpath):
+        """
+        Returns True if the scans of the previous :meth:`insert_files` calls never visit a directory because it is outside their root paths or matches their directory exclusion filters.
+
+        :param str dirpath:  The absolute path of the directory.
+        """
+        searchdir = os.path.normcase(os.path.normpath(dirpath))
+        for rootpath, filters in self._insertions:
+            root = os.path.normcase(os.path.normpath(rootpath))
+            if (searchdir == root or searchdir.startswith(root.rstrip(os.sep) + os.sep)) and not self._excluded(dirpath, filters):
+                return False
+        return True
+
+    def insert_files(self, rootpath, directoryInFilter=None, directoryExFilter=None, compileInFilter=None, compileExFilter=None, contentInFilter=None, contentExFilter=None):
+        """
+        Inserts files by recursive traversing the rootpath and inserting files according the addition filter parameters.
+
+        The files are generated by :meth:`iter_files`.  If :attr:`LazyFiles` is set the rootpath is not traversed; instead :attr:`CompileFiles` and :attr:`ContentFiles` become :class:`~vsgen.util.filelist.VSGFileStream` instances that traverse the rootpath each time they are iterated, or once while :meth:`rendering`.  Otherwise, if :attr:`FileIndex` is set, the files are stored in the index and :attr:`CompileFiles` and :attr:`ContentFiles` become :class:`~vsgen.util.index.VSGIndexedFiles` instances that query it.
+
+        :param str rootpath:            The absolute path to the root directory.
+        :param list directoryInFilter:  A list of fnmatch expressions to match directories to be included.  A `None` value will default to :attr:`DirectoryInFilter`.
+        :param list directoryExFilter:  A list of fnmatch expressions to match directories to be excluded.  A `None` value will default to :attr:`DirectoryExFilter`.
+        :param list compileInFilter:    A list of fnmatch expressions to match compile files to be included.  A `None` value will default to :attr:`CompileInFilter`.
+        :param list compileExFilter:    A list of fnmatch expressions to match compile files to be excludes.  A `None` value will default to :attr:`CompileExFilter`.
+        :param list contentInFilter:    A list of fnmatch expressions to match content files to be includes.  A `None` value will default to :attr:`ContentInFilter`.
+        :param list contentExFilter:    A list of fnmatch expressions to match content files to be excludes.  A `None` value will default to :attr:`ContentExFilter`.
+        """
+        # Overrides
+        filters = {
+            'directoryInFilter': self.DirectoryInFilter if directoryInFilter is None else directoryInFilter,
+            'directoryExFilter': self.DirectoryExFilter if directoryExFilter is None else directoryExFilter,
+            'compileInFilter': self.CompileInFilter if compileInFilter is None else compileInFilter,
+            'compileExFilter': self.CompileExFilter if compileExFilter is None else compileExFilter,
+            'contentInFilter': self.ContentInFilter if contentInFilter is None else contentInFilter,
+            'contentExFilter': self.ContentExFilter if contentExFilter is None else contentExFilter
+        }
+
+        # Remember the insertion so that it can be repeated by rescan
+        if rootpath:
+            self._insertions.append((rootpath, filters))
+
+        if self.LazyFiles:
+            if not isinstance(self.CompileFiles, VSGFileStream):
+                self.CompileFiles = VSGFileStream('compile', self.CompileFiles)
+            if not isinstance(self.ContentFiles, VSGFileStream):
+                self.ContentFiles = VSGFileStream('content', self.ContentFiles)
+            if rootpath:
+                source = VSGFileSource(functools.partial(self.iter_files, rootpath, shared=False, **filters))
+                self.CompileFiles.add_source(source)
+                self.ContentFiles.add_source(source)
+            return
+
+        if self.FileIndex:
+            self._index_files(rootpath, filters)
+            return
+
+        for kind, filepath in self.iter_files(rootpath, **filters):
+            if kind == 'compile':
+                self.CompileFiles.append(filepath)
+            else:
+                self.ContentFiles.append(filepath)
+            self._inserted.add(filepath)
+
+    def _index_files(self, rootpath, filters):
+        """
+        Updates the files found under a rootpath in the :attr:`FileIndex`.
+
+        The first call moves the explicit files into the index and replaces :attr:`CompileFiles` and :attr:`ContentFiles` with :class:`~vsgen.util.index.VSGIndexedFiles` instances.  The rootpath's listing is not shared with other projects, so the files are streamed into the index without being kept in memory.
+
+        :param str rootpath:  The absolute path to the root directory.
+        :param dict filters:  The filters keyed by the :meth:`iter_files` parameter names.
+        :return:  The number of files added to or removed from the index.
+        """
+        from vsgen.util.index import VSGFileIndex, VSGIndexedFiles
+
+        project = self.FileName or self.Name
+        changes = 0
+        if not isinstance(self.CompileFiles, VSGIndexedFiles):
+            index = VSGFileIndex.open(self.FileIndex)
+            explicit = itertools.chain((('compile', f) for f in self.CompileFiles), (('content', f) for f in self.ContentFiles))
+            changes += index.update(project, '', explicit)
+            changes += index.prune(project, [rootpath] if rootpath else [])
+            self.CompileFiles = VSGIndexedFiles(index, project, 'compile')
+            self.ContentFiles = VSGIndexedFiles(index, project, 'content')
+        if rootpath:
+            changes += self.CompileFiles.index.update(project, rootpath, self.iter_files(rootpath, shared=False, **filters))
+        return changes
+
+    def rescan(self, invalidate=True):
+        """
+        Repeats the previous :meth:`insert_files` calls, replacing the files they inserted with the files currently found under their root paths.
+
+        The wildcard patterns of the project's ``search_path`` option are expanded again with :func:`~vsgen.util.config.expand_dirs`; call :func:`~vsgen.util.config.clear_globs` first so that the expansions include the directories created since.
+
+        :param bool invalidate:  Flag to discard the shared listings of the root paths; a caller that already invalidated the changed paths may skip this step.
+        :return:  True if the project's files or search path have changed; False otherwise.  Projects with :attr:`LazyFiles` always return True since their files are only known when iterated.
+        """
+        from vsgen.util.scan import VSGScanService
+
+        insertions, inserted = self._insertions, self._inserted
+        if invalidate:
+            for rootpath, filters in insertions:
+                VSGScanService.invalidate(rootpath)
+
+        searched = False
+        if self._search_patterns:
+            search_path = expand_dirs(self._search_patterns)
+            searched = search_path != list(self.SearchPath)
+            self.SearchPath = search_path
+
+        # Lazy files are traversed each time they are iterated.
+        if self.LazyFiles:
+            return True
+
+        # Indexed files are updated in place.
+        if isinstance(self.CompileFiles, _imported('vsgen.util.index', 'VSGIndexedFiles')):
+            return sum(self._index_files(rootpath, filters) for rootpath, filters in insertions) > 0 or searched
+
+        before = (list(self.CompileFiles), list(self.ContentFiles))
+        self._insertions, self._inserted = [], set()
+        self.CompileFiles[:] = [f for f in self.CompileFiles if f not in inserted]
+        self.ContentFiles[:] = [f for f in self.ContentFiles if f not in inserted]
+        for rootpath, filters in insertions:
+            self.insert_files(rootpath, **filters)
+
+        return before != (list(self.CompileFiles), list(self.ContentFiles)) or searched
@@ -3,7 +3,7 @@
 This module provides a simple register utility for VSGenerate objects.
 """
 import sys
-import time
+import timeit
 
 
 class VSGRegisterable(object):
@@ -88,9 +88,9 @@ class VSGRegisterCommand(object):
         from vsgen.util.logger import VSGLogger
 
         VSGLogger.info(self._logname, self._message)
-        start = time.clock()
+        start = timeit.default_timer()
         for i in self._registerables:
             i.register()
-        end = time.clock()
+        end = timeit.default_timer()
         VSGLogger.info(self._logname, "Register %s items in %s seconds:", len(self._registerables), end - start)
-        self._start = time.clock()
+        self._start = timeit.default_timer()
@@ -6,7 +6,6 @@ This module provides the neccessary defintions to generate a Solution File.
 import os
 import uuid
 import errno
-import pkg_resources
 
 from vsgen.writer import VSGWritable, VSGJinjaRenderer
 
@@ -22,7 +21,7 @@ class VSGSolution(VSGWritable, VSGJinjaRenderer):
     """
     __writable_name__ = "VSG Solution"
 
-    __jinja_template__ = pkg_resources.resource_filename('vsgen', 'data/sln.jinja')
+    __jinja_template__ = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'sln.jinja')
 
     def __init__(self, **kwargs):
         """
@@ -6,27 +6,36 @@ The module defines the class VSGSuite.  The VSGSuite class groups a collection o
 """
 import sys
 import os
-import inspect
-import importlib
+import threading
+import functools
+import time
+import hashlib
 import argparse
+from timeit import default_timer
 
-from vsgen.solution import VSGSolution
-from vsgen.writer import VSGWriteCommand
-from vsgen.register import VSGRegisterCommand
-from vsgen.util.config import VSGConfigParser
+from vsgen.util.config import VSGConfigParser, clear_globs
 from vsgen.util.entrypoints import entrypoints, entrypoint
+from vsgen.util.logger import VSGLogger, VSGLogRecorder
+from vsgen.util.profiler import VSGScanProfiler
+from vsgen.util.scan import VSGScanService, scan_source
+
+# The modules needed to construct, write and snapshot a suite are imported by the methods using them, so building the command line parser stays cheap.
 
 
 class VSGSuite(object):
     """
     The VSGSuite class groups a collection of solutions and projects into a single class.
+
+    :cvar str __template__:  The path to the template configuration file of a suite created from arguments rather than a configuration file; see :meth:`template_config`.
     """
+    __template__ = None
 
-    def __init__(self, config):
+    def __init__(self, config, pipeline=None):
         """
         Constructor.
 
-        :param object config: The instance of the VSGConfigParser class
+        :param object config:    The instance of the VSGConfigParser class
+        :param object pipeline:  An optional :class:`~vsgen.util.pipeline.VSGPipeline` instance; each distinct project is put into it as soon as it is constructed.
         """
         # Resolve the root path
         root = config.get('vsgen', 'root', fallback=None)
@@ -35,11 +44,71 @@ class VSGSuite(object):
         if not os.path.isdir(root):
             raise ValueError('Expected option "root" (%s) does not resolve to valid directory.' % root)
 
-        # Build the VSG Solutions
-        self._solutions = [self._getsolution(config, s) for s in config.sections() if 'vsgen.solution' in s]
+        # Build the projects of each solution in a pool of threads
+        import multiprocessing
+        self._threads = config.getint('vsgen', 'threads', fallback=0) or multiprocessing.cpu_count()
+        if self._threads < 1:
+            raise ValueError('Expected option "threads" in section [vsgen] to be a positive number.')
+
+        # Build each project section once, no matter how many solutions reference it
+        self._projects = {}
+        self._projects_lock = threading.Lock()
+
+        # Build the VSG Solutions, sharing the listings of the root paths of several projects; the listings are kept for the whole command (see main)
+        self._pipeline = pipeline
+        VSGScanService.expect(self._scanwalks(config))
+        try:
+            self._solutions = [self._getsolution(config, s) for s in config.sections() if 'vsgen.solution' in s]
+            VSGLogger.info('Scanning VSG Projects', 'Created %s distinct projects for %s project references.', len(self._projects), sum(len(s.Projects) for s in self._solutions))
+            VSGScanService.log('Scanning VSG Projects')
+        finally:
+            self._pipeline = None
 
         return super(VSGSuite, self).__init__()
 
+    def __getstate__(self):
+        """
+        Returns the state of the suite without its locks.
+        """
+        state = self.__dict__.copy()
+        del state['_projects_lock']
+        state.pop('_snapshot_reader', None)
+        state['_projects'] = dict((k, v[1]) for k, v in self._projects.items())
+        return state
+
+    def __setstate__(self, state):
+        """
+        Restores the state of the suite with new locks.
+        """
+        self.__dict__.update(state)
+        self._projects = dict((k, [threading.Lock(), v]) for k, v in self._projects.items())
+        self._projects_lock = threading.Lock()
+
+    @classmethod
+    def _scanwalks(cls, config):
+        """
+        Returns the shareable walks of the distinct projects the suite constructs, once per project.
+
+        The projects with lazy or indexed files walk their root paths without sharing them, so they are not included.  The walks are tagged with the configuration, so declaring the walks of the same configuration again has no effect.
+
+        :param object config: The instance of the configparser class
+        :return: A list of ``(source, rootpath, tag)`` tuples for :meth:`~vsgen.util.scan.VSGScanService.expect`.
+        """
+        keys = set()
+        for section in (s for s in config.sections() if 'vsgen.solution' in s):
+            version = config.get(section, 'visual_studio_version', fallback=None)
+            keys.update((p, version) for p in config.getlist(section, 'projects', fallback=[]))
+
+        walks = []
+        for p, version in keys:
+            if p not in config or config.getboolean(p, 'lazy_files', fallback=False) or config.get(p, 'file_index', fallback=''):
+                continue
+            rootpath = config.get(p, 'root_path', fallback='')
+            if rootpath:
+                source = scan_source(config.get(p, 'file_source', fallback='walk'), config.get(p, 'file_manifest', fallback=''), config.getboolean(p, 'follow_links', fallback=False))
+                walks.append((source, rootpath, (id(config), p, version)))
+        return walks
+
     def _getsolution(self, config, section, **kwargs):
         """
         Creates a VSG solution from a configparser instance.
@@ -52,6 +121,7 @@ class VSGSuite(object):
         if section not in config:
             raise ValueError('Section [{}] not found in [{}]'.format(section, ', '.join(config.sections())))
 
+        from vsgen.solution import VSGSolution
         s = VSGSolution(**kwargs)
 
         s.Name = config.get(section, 'name', fallback=s.Name)
@@ -60,13 +130,56 @@ class VSGSuite(object):
         if not s.VSVersion:
             raise ValueError('Solution section [%s] requires a value for Visual Studio Version (visual_studio_version)' % section)
 
+        # Construct the projects concurrently since each one scans its own tree; the pool's map preserves their order.
+        def getproject(project_section):
+            return self._sharedproject(config, project_section, VSVersion=s.VSVersion)
+
         project_sections = config.getlist(section, 'projects', fallback=[])
-        for project_section in project_sections:
-            project = self._getproject(config, project_section, VSVersion=s.VSVersion)
-            s.Projects.append(project)
+        threads = min(self._threads, len(project_sections))
+        if threads > 1:
+            from multiprocessing.pool import ThreadPool
+            pool = ThreadPool(threads)
+            try:
+                s.Projects.extend(pool.map(getproject, project_sections))
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            s.Projects.extend(getproject(p) for p in project_sections)
 
         return s
 
+    def _sharedproject(self, config, section, **kwargs):
+        """
+        Returns the VSG project of a section, creating it with :meth:`_getproject` only the first time a section is requested with the same arguments.
+
+        Concurrent requests for the same project wait for the first one to complete, so every solution that references a section shares a single project instance.
+
+        :param object config: The instance of the configparser class
+        :param str section: The section name to read.
+        :param kwargs:  List of additional keyworded arguments to be passed into the VSGProject.
+        :return: A valid VSGProject instance.
+        """
+        key = (section, tuple(sorted(kwargs.items())))
+        with self._projects_lock:
+            entry = self._projects.get(key)
+            if entry is None:
+                entry = self._projects[key] = [threading.Lock(), None]
+
+        created = False
+        with entry[0]:
+            if entry[1] is None:
+                start = default_timer()
+                entry[1] = self._getproject(config, section, **kwargs)
+                VSGLogger.info('Scanning VSG Projects', 'Created project [%s] in %s seconds.', section, default_timer() - start)
+                created = True
+            project = entry[1]
+
+        # Hand the new project to the pipeline; this blocks while the pipeline is full.
+        if created and self._pipeline is not None:
+            self._pipeline.put(project)
+        return project
+
     def _getproject(self, config, section, **kwargs):
         """
         Creates a VSG project from a configparser instance.
@@ -87,23 +200,195 @@ class VSGSuite(object):
         return project_class.from_section(config, section, **kwargs)
 
     @classmethod
-    def from_file(cls, filename):
+    def template_config(cls, **kwargs):
         """
-        Creates an VSGSuite instance from a filename.
+        Returns the configuration of the suite's :attr:`__template__` with override values applied.
+
+        The template is parsed once per process; each call returns a cheap copy-on-write overlay of it (see :meth:`~vsgen.util.config.VSGConfigParser.from_template`).
+
+        :param kwargs:  List of keyworded override values; each value overrides the option of the same name in the first section that has it.
+        :return:  A :class:`~vsgen.util.config.VSGConfigParser` instance.
+        """
+        if not cls.__template__:
+            raise ValueError('Suite %s does not define a template configuration file.' % cls.__name__)
+        return VSGConfigParser.from_template(cls.__template__, **kwargs)
+
+    @classmethod
+    def read_config(cls, filename):
+        """
+        Reads a VSG configuration file, or its resolved options from the cache, with its root relative to the file.
 
         :param str filename:  The fully qualified path to the VSG configuration file.
+        :return:  A :class:`~vsgen.util.config.VSGConfigParser` instance.
         """
-        # Read the configuration file
+        def setroot(config):
+            """
+            Sets the root relative to the configuration file; the root is absolute since the resolved options are cached for the file's absolute path.
+            """
+            root = config.get('vsgen', 'root')
+            root = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(filename)), root))
+            config.set('vsgen', 'root', root)
+
         config = VSGConfigParser()
-        if filename not in config.read([filename]):
+        if filename not in config.read_cached(filename, prepare=setroot):
             raise ValueError('Could not read VSG configuration file %s.' % filename)
+        return config
 
-        # set the root
-        root = config.get('vsgen', 'root')
-        root = os.path.normpath(os.path.join(os.path.dirname(filename), root))
-        config.set('vsgen', 'root', root)
+    @classmethod
+    def from_file(cls, filename, snapshot=False, pipeline=None, config=None):
+        """
+        Creates an VSGSuite instance from a filename.
 
-        return VSGSuite(config)
+        :param str filename:     The fully qualified path to the VSG configuration file.
+        :param bool snapshot:    Flag to load the suite from its snapshot in the :func:`~vsgen.util.cache.cache_dir` if it is valid, and to save a snapshot otherwise.
+        :param object pipeline:  An optional :class:`~vsgen.util.pipeline.VSGPipeline` instance receiving the projects as they are constructed; see :meth:`stream`.
+        :param object config:    The configuration already read with :meth:`read_config`, if any.
+        """
+        since = time.time()
+        if snapshot:
+            from vsgen.util.cache import cache_dir
+            snapshot = os.path.join(cache_dir(), 'suite-{}.snapshot'.format(hashlib.sha1(os.path.abspath(filename).encode('utf-8')).hexdigest()))
+            suite = cls.from_snapshot(snapshot, [filename])
+            if suite is not None:
+                return suite
+
+        if config is None:
+            config = cls.read_config(filename)
+        suite = cls(config, pipeline)
+        if snapshot:
+            suite.snapshot(snapshot, [filename], since)
+        return suite
+
+    @classmethod
+    def stream(cls, filename, snapshot=False, parallel=True, size=0):
+        """
+        Generates the suite of a configuration file, writing and registering each project as soon as it is constructed.
+
+        The projects are passed from the threads constructing them to the writing threads through a bounded :class:`~vsgen.util.pipeline.VSGPipeline`, so rendering overlaps with scanning and the construction of projects waits while too many projects wait to be written.  The solutions, and any project that was not written while streaming, are written with :meth:`write` once the suite is constructed.
+
+        :param str filename:   The fully qualified path to the VSG configuration file.
+        :param bool snapshot:  Flag to load and save the suite's snapshot; see :meth:`from_file`.
+        :param bool parallel:  Flag to write the projects in a pool of threads rather than in a single thread.
+        :param int size:       The maximum number of constructed projects waiting to be written; 0 uses twice the number of writing threads.
+        :return:  The VSGSuite instance.
+        """
+        import multiprocessing
+        from vsgen.util.pipeline import VSGPipeline
+        from vsgen.writer import VSGWriter
+
+        lock = threading.Lock()
+
+        def consume(project):
+            VSGWriter.write_item(project)
+            with lock:
+                project.register()
+
+        start = default_timer()
+        with VSGPipeline(consume, multiprocessing.cpu_count() if parallel else 1, size) as pipeline:
+            suite = cls.from_file(filename, snapshot, pipeline)
+        VSGLogger.info('Streaming VSG Projects', 'Wrote %s projects in %s seconds while constructing the suite.', len(pipeline.consumed), default_timer() - start)
+        for project, error in pipeline.failures:
+            VSGLogger.error('Streaming VSG Projects', 'Could not write project %s: %s', project.Name, error)
+
+        suite.write(parallel, written=pipeline.consumed)
+        return suite
+
+    def _snapshot_files(self, projects):
+        """
+        Returns the files, other than the configuration files and the directories the projects' scans visit, whose changes invalidate a snapshot of the suite.
+
+        Subclasses whose projects depend on other files should extend this method.
+
+        :param list projects:  The projects of the suite.
+        :return:  A list of file paths.
+        """
+        from vsgen.util.filesource import git_index
+
+        files = []
+        for p in projects:
+            if p.FileManifest:
+                files.append(p.FileManifest)
+            if p.FileSource == 'git':
+                files.extend(f for f in (git_index(r) for r in p.RootPaths) if f)
+        return files
+
+    def snapshot(self, filename, inputs=(), since=None):
+        """
+        Saves the suite's resolved model (its solutions, projects, files and GUIDs) to a snapshot file.
+
+        The snapshot records the directories each project's scan visits (see :meth:`~vsgen.project.VSGProject.scan_paths`) and the :meth:`_snapshot_files`.
+
+        :param str filename:  The path to the snapshot file.
+        :param list inputs:   The configuration files the suite was built from.
+        :param float since:   The time the suite started to be built; the inputs modified since are recorded as changed so the snapshot is not valid for them.
+        :return:  True if the snapshot was written; False otherwise.
+        """
+        import pickle
+        from vsgen.util.snapshot import make_header, write_snapshot
+
+        self.close_snapshot()
+        projects = sorted(set(p for s in self._solutions for p in s.Projects), key=lambda x: x.Name)
+        paths = sorted(set(path for p in projects for path in p.scan_paths()))
+        header = make_header(inputs, paths + self._snapshot_files(projects), since)
+        tables = [getattr(p, a, None) for p in projects for a in ('_compile_files', '_content_files', '_directories')]
+        try:
+            write_snapshot(filename, header, self, tables)
+        except (IOError, OSError, pickle.PicklingError, TypeError, AttributeError) as e:
+            VSGLogger.warning('Saving VSG Snapshot', 'Could not save the snapshot %s: %s', filename, e)
+            return False
+        VSGLogger.info('Saving VSG Snapshot', 'Saved %s projects to the snapshot %s.', len(projects), filename)
+        return True
+
+    def close_snapshot(self):
+        """
+        Loads the projects' files that are still stored in the snapshot the suite was loaded from and closes the snapshot file.
+        """
+        reader = self.__dict__.pop('_snapshot_reader', None)
+        if reader is not None:
+            for p in set(p for s in self._solutions for p in s.Projects):
+                for name in ('_compile_files', '_content_files', '_directories'):
+                    if hasattr(p, name):
+                        p._loaded(name)
+            reader.close()
+
+    @classmethod
+    def from_snapshot(cls, filename, inputs=None, validate=None):
+        """
+        Loads a suite from a snapshot file if it is still valid.
+
+        The snapshot is valid if the configuration files' content and the modification times of the projects' directories and files it recorded are unchanged.  The projects' files are only loaded when they are used.
+
+        :param str filename:     The path to the snapshot file.
+        :param list inputs:      The configuration files the suite is expected to be built from; None skips the comparison of the files, but not of their content.
+        :param callable validate:  An optional hook called with the snapshot's header dictionary; it returns False to reject the snapshot.
+        :return:  The VSGSuite instance or None if the snapshot does not exist or is not valid.
+        """
+        from vsgen.util.snapshot import VSGSnapshotReader, validate_header
+
+        try:
+            reader = VSGSnapshotReader(filename)
+        except (IOError, OSError, ValueError) as e:
+            VSGLogger.debug('Loading VSG Snapshot', 'Could not read the snapshot %s: %s', filename, e)
+            return None
+
+        reason = validate_header(reader.header, inputs)
+        if reason is None and validate is not None and not validate(reader.header):
+            reason = 'it was rejected by the validation hook'
+        if reason is not None:
+            VSGLogger.info('Loading VSG Snapshot', 'Ignoring the snapshot %s: %s.', filename, reason)
+            reader.close()
+            return None
+
+        try:
+            suite = reader.load()
+        except Exception as e:
+            VSGLogger.warning('Loading VSG Snapshot', 'Could not load the snapshot %s: %s', filename, e)
+            reader.close()
+            return None
+        if not reader.closed:
+            suite._snapshot_reader = reader
+        VSGLogger.info('Loading VSG Snapshot', 'Loaded %s solutions from the snapshot %s.', len(suite._solutions), filename)
+        return suite
 
     @classmethod
     def make_parser(cls, **kwargs):
@@ -122,6 +407,18 @@ class VSGSuite(object):
         # 'Generate' command
         file_parser = subparsers.add_parser('generate', help='Generates solutions and projects based on one or more configuration files.')
         file_parser.add_argument('configuration_filenames', metavar='file', nargs='+', help='The configuration file that contains the [vsgen.*] sections contains the vsgen input.')
+        file_parser.add_argument('-j', '--jobs', metavar='N', type=_positive_int, default=1, help='The number of configuration files to generate concurrently in separate processes.')
+        file_parser.add_argument('--profile-scan', metavar='FILE', help='Profiles the scans of the projects\' root paths and writes a report of the most expensive directories and filter patterns to the file.')
+        file_parser.add_argument('--profile-format', choices=['text', 'json'], default='text', help='The format of the scan profile report.')
+        file_parser.add_argument('--stream', action='store_true', help='Writes each project as soon as it is constructed instead of once every project is constructed.')
+        file_parser.add_argument('--snapshot', action='store_true', help='Loads each suite from a snapshot of its solutions, projects and files when its configuration file and scanned directories are unchanged, and saves a snapshot otherwise.')
+
+        # 'Watch' command
+        watch_parser = subparsers.add_parser('watch', help='Generates solutions and projects based on a configuration file and regenerates the affected projects whenever files are added or removed.')
+        watch_parser.add_argument('configuration_filename', metavar='file', help='The configuration file that contains the [vsgen.*] sections contains the vsgen input.')
+        watch_parser.add_argument('--poll', action='store_true', help='Detect changes by polling the file system instead of using the platform\'s change notifications.')
+        watch_parser.add_argument('--interval', metavar='SECONDS', type=float, default=1.0, help='The time between two polls of the file system.')
+        watch_parser.add_argument('--debounce', metavar='SECONDS', type=float, default=0.5, help='The quiet time to wait for after a change before regenerating.')
 
         # 'Auto' command
         auto_parser = subparsers.add_parser('auto', help='Automatically generates a solution and project collection from vsgen preset and a single directory.')
@@ -140,10 +437,19 @@ class VSGSuite(object):
 
         :param kwargs:  List of additional keyworded arguments to be passed into the VSGSuite defined in the :meth:`~VSGSuite.make_parser` method.
         """
-        # Create a VSGSuite for each filename on the command line.
+        # Create a VSGSuite for each filename on the command line; the walks of all suites are declared first so their listings are shared between the files.
         if kwargs.get('suite_commands', None) == 'generate':
             filenames = kwargs.pop('configuration_filenames', [])
-            return [cls.from_file(f) for f in filenames]
+            if len(filenames) < 2:
+                return [cls.from_file(f, kwargs.get('snapshot', False)) for f in filenames]
+            configs = [cls.read_config(f) for f in filenames]
+            for config in configs:
+                VSGScanService.expect(cls._scanwalks(config))
+            return [cls.from_file(f, kwargs.get('snapshot', False), config=c) for f, c in zip(filenames, configs)]
+
+        # Create a VSGSuite for the watched filename.
+        if kwargs.get('suite_commands', None) == 'watch':
+            return [cls.from_file(kwargs.pop('configuration_filename'))]
 
         # Create a VSGSuit from the target directory and override commands
         if kwargs.get('suite_commands', None) == 'auto':
@@ -173,21 +479,185 @@ class VSGSuite(object):
         params.update({k: v for k, v in kwargs.items() if v is not None})
         return suite_class(**params)
 
-    def write(self, parallel=True):
+    @classmethod
+    def generate(cls, filenames, jobs=0, snapshot=False, stream=False):
+        """
+        Generates the suites of a collection of configuration files concurrently in a pool of processes.
+
+        The messages of each suite are recorded in its process and logged together, in the order of the filenames, once the suite is generated.  Each process generates its suite with this class, so the suites of a subclass are generated by the subclass.
+
+        :param list filenames:  The fully qualified paths to the VSG configuration files.
+        :param int jobs:        The number of processes; 0 uses one process per CPU.
+        :param bool snapshot:   Flag to load and save the snapshots of the suites; see :meth:`from_file`.
+        :param bool stream:     Flag to write each project as soon as it is constructed; see :meth:`stream`.
+        :return:  The list of filenames that failed to generate.
+        """
+        import multiprocessing
+
+        if jobs < 0:
+            raise ValueError('The number of processes must not be negative; got {}.'.format(jobs))
+
+        level = VSGLogger.getLogger(None).getEffectiveLevel()
+        tasks = [(cls, f, level, VSGScanProfiler.enabled, snapshot, stream) for f in filenames]
+        pool = multiprocessing.Pool(min(jobs or multiprocessing.cpu_count(), len(tasks)) or 1)
+        failures = []
+        try:
+            for filename, records, profiles, success in pool.imap(_generate, tasks):
+                VSGLogger.replay(records)
+                VSGScanProfiler.merge(profiles)
+                if not success:
+                    failures.append(filename)
+        finally:
+            pool.close()
+            pool.join()
+
+        VSGLogger.info('Generating VSG Suites', 'Generated %s of %s configuration files.', len(filenames) - len(failures), len(filenames))
+        for filename in failures:
+            VSGLogger.error('Generating VSG Suites', 'Failed to generate %s.', filename)
+        return failures
+
+    def write(self, parallel=True, written=()):
         """
         Writes the configuration to disk.
+
+        The writes and registrations run as a :class:`~vsgen.util.taskgraph.VSGTaskGraph` whose tasks start as soon as their dependencies complete: a project is registered once it is written and a solution is written once all of its projects are written.  The registrations still run one at a time, in the order of the projects' names; a project that fails to write is not registered, but the projects after it are.  A summary of the graph's critical path is logged.
+
+        :param bool parallel:  Flag to run independent tasks concurrently in the suite's pool of threads.
+        :param list written:   The projects that are already written and registered; they are neither written nor registered again.
+        :raises:  The first exception raised by a task, once the independent tasks are complete.
+        """
+        import multiprocessing
+        from vsgen.util.taskgraph import VSGTaskGraph
+        from vsgen.writer import VSGWriter
+
+        solutions = sorted(self._solutions, key=lambda x: x.Name)
+        written = set(written)
+        projects = sorted(set(p for s in solutions for p in s.Projects if p not in written), key=lambda x: x.Name)
+
+        graph = VSGTaskGraph()
+        registered = None
+        for p in projects:
+            write_key = graph.add(('write', id(p)), functools.partial(VSGWriter.write_item, p), label='Write project {}'.format(p.Name))
+            registered = graph.add(('register', id(p)), p.register, [write_key], label='Register project {}'.format(p.Name), after=[registered] if registered else [])
+        for s in solutions:
+            graph.add(('write', id(s)), s.write, [('write', id(p)) for p in set(s.Projects) if p not in written], label='Write solution {}'.format(s.Name))
+
+        threads = getattr(self, '_threads', 0) or multiprocessing.cpu_count()
+        failures = graph.run(threads if parallel else 1)
+
+        VSGLogger.info('Writing VSG Solution', 'Wrote %s files in %s seconds:', len(solutions), graph.span([('write', id(s)) for s in solutions]))
+        VSGLogger.info('Writing VSG Projects', 'Wrote %s files in %s seconds:', len(projects), graph.span([('write', id(p)) for p in projects]))
+        VSGLogger.info('Registering Project Registerables', 'Register %s items in %s seconds:', len(projects), graph.span([('register', id(p)) for p in projects]))
+        graph.log('Writing VSG Suite')
+
+        for task in failures[1:]:
+            VSGLogger.error('Writing VSG Suite', 'Task "%s" failed: %s', task.label, task.error)
+        if failures:
+            raise failures[0].error
+
+    def watch(self, poll=False, interval=1.0, debounce=0.5, parallel=True):
+        """
+        Watches the projects' root paths and rewrites the projects (and the solutions containing them) whose files are added, removed or renamed, or whose ``.vsgenignore`` files or other control files (see :meth:`_snapshot_files`) are modified.
+
+        The ``.git`` directories and the directories that the projects' scans do not visit, because of the ``.vsgenignore`` files or the directory exclusion filters, are not watched; the changes of the solution and project files the watch writes are ignored.
+
+        This method blocks until it is interrupted.
+
+        :param bool poll:        Flag to force polling the file system instead of using the platform's change notifications.
+        :param float interval:   The time in seconds between two polls of the file system.
+        :param float debounce:   The quiet time in seconds to wait for after a change before regenerating.
+        :param bool parallel:    Flag to enable asynchronous writing.
         """
-        # Write the Solution files
+        def contains(root, path):
+            return path == root or path.startswith(root.rstrip(os.sep) + os.sep)
+
         solutions = sorted(self._solutions, key=lambda x: x.Name)
-        with VSGWriteCommand('Writing VSG Solution', solutions, parallel) as command:
-            command.execute()
-
-        # Write the Projects files
-        projects = set(sorted((p for s in solutions for p in s.Projects), key=lambda x: x.Name))
-        with VSGWriteCommand('Writing VSG Projects', projects, parallel) as command:
-            command.execute()
-
-        # Register the registerables
-        registerables = set(sorted((p for s in solutions for p in s.Projects), key=lambda x: x.Name))
-        with VSGRegisterCommand('Registering Project Registerables', registerables) as command:
-            command.execute()
+        projects = sorted(set(p for s in solutions for p in s.Projects), key=lambda x: x.Name)
+        outputs = set(os.path.normpath(o.FileName) for o in solutions + projects)
+
+        from vsgen.util.watch import make_watcher
+        from vsgen.writer import VSGWriteCommand
+
+        # Watch the outermost root paths only
+        roots = sorted(set(os.path.normpath(r) for p in projects for r in p.RootPaths if os.path.isdir(r)))
+        roots = [r for r in roots if not any(contains(o, r) for o in roots if o != r)]
+        controls = dict((p, set(os.path.normpath(os.path.abspath(f)) for f in self._snapshot_files([p]))) for p in projects)
+        files = set(f for p in projects for f in controls[p])
+
+        # Skip the directories that no project's scan visits and the outputs written by the watch itself
+        def exclude(dirpath):
+            return all(p.excludes(dirpath) for p in projects)
+
+        with make_watcher(roots, poll, interval, files, exclude, outputs) as watcher:
+            VSGLogger.info('Watching VSG Projects', 'Watching %s directories for changes.', len(roots))
+            while True:
+                # Wait for a change and then until the changes settle.
+                changes = watcher.wait()
+                pending = changes
+                while pending:
+                    pending = watcher.wait(debounce)
+                    changes |= pending
+
+                changes = set(os.path.normpath(c) for c in changes) - outputs
+                for c in changes:
+                    VSGScanService.invalidate(c)
+                if changes:
+                    clear_globs()
+                touched = [p for p in projects if changes & controls[p] or any(contains(r, c) for r in p.RootPaths for c in changes)]
+                changed = [p for p in touched if p.rescan(invalidate=False)]
+                if not changed:
+                    continue
+
+                VSGLogger.info('Watching VSG Projects', 'Detected %s changes affecting %s projects.', len(changes), len(changed))
+                with VSGWriteCommand('Writing VSG Projects', changed, parallel) as command:
+                    command.execute()
+
+                changed_solutions = [s for s in solutions if any(p in changed for p in s.Projects)]
+                with VSGWriteCommand('Writing VSG Solution', changed_solutions, parallel) as command:
+                    command.execute()
+
+
+def _positive_int(value):
+    """
+    Converts a command line argument to an integer of at least 1.
+
+    :param str value:  The argument.
+    :return:  The integer.
+    :raises argparse.ArgumentTypeError:  If the argument is not an integer of at least 1.
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError('expected a positive integer; got {!r}'.format(value))
+    return number
+
+
+def _generate(task):
+    """
+    Generates the suite of a configuration file in a worker process of :meth:`VSGSuite.generate`.
+
+    :param tuple task:  The ``(suite_class, filename, level, profile, snapshot, stream)`` tuple of the VSGSuite class generating the suite, the configuration file, the parent's logging threshold, the flag to profile the scans, the flag to use snapshots and the flag to stream the projects.
+    :return:  A ``(filename, records, profiles, success)`` tuple.
+    """
+    suite_class, filename, level, profile, snapshot, stream = task
+    logger = VSGLogger.getLogger(None)
+    logger.setLevel(level)
+    if profile:
+        VSGScanProfiler.enable()
+    with VSGLogRecorder() as recorder:
+        try:
+            if stream:
+                suite_class.stream(filename, snapshot, False)
+            else:
+                for suite in suite_class.from_args(suite_commands='generate', configuration_filenames=[filename], snapshot=snapshot):
+                    suite.write(False)
+            success = True
+        except Exception:
+            VSGLogger.exception('Generating VSG Suites', 'Could not generate %s.', filename)
+            success = False
+        finally:
+            VSGScanService.clear()
+    profiles = VSGScanProfiler.export() if profile else []
+    return filename, recorder.records, profiles, success
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+This module provides all functionality for the files vsgen caches between runs.
+
+The cache directory is the ``VSGEN_CACHE_DIR`` environment variable if set; otherwise it is the platform's per user cache directory.  Cache files are written atomically so concurrent processes never read a partial file, and failing to read or write a cache file is never an error.
+"""
+
+import os
+import sys
+import json
+import tempfile
+
+from vsgen.util.logger import VSGLogger
+
+
+def cache_dir():
+    """
+    Returns the directory of vsgen's cache files.
+
+    :return:  The absolute path of the directory; it may not exist yet.
+    """
+    directory = os.environ.get('VSGEN_CACHE_DIR')
+    if directory:
+        return os.path.abspath(directory)
+    if sys.platform.startswith('win'):
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser(os.path.join('~', 'AppData', 'Local'))
+        return os.path.join(base, 'vsgen', 'Cache')
+    if sys.platform == 'darwin':
+        return os.path.expanduser(os.path.join('~', 'Library', 'Caches', 'vsgen'))
+    return os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser(os.path.join('~', '.cache')), 'vsgen')
+
+
+def _read(name, load, mode):
+    """
+    Reads a cache file.
+
+    :param str name:       The name of the file in the cache directory.
+    :param callable load:  The function decoding a value from a file object.
+    :param str mode:       The mode to open the file with.
+    :return:  The decoded value or None if the file does not exist or cannot be read.
+    """
+    try:
+        with open(os.path.join(cache_dir(), name), mode) as f:
+            return load(f)
+    except Exception:
+        return None
+
+
+def _write(name, value, dump, mode):
+    """
+    Writes a cache file atomically.
+
+    :param str name:       The name of the file in the cache directory.
+    :param object value:   The value to encode.
+    :param callable dump:  The function encoding a value to a file object.
+    :param str mode:       The mode to open the file with.
+    :return:  True if the file was written; False otherwise.
+    """
+    directory = cache_dir()
+    try:
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        fd, temp = tempfile.mkstemp(prefix=name, dir=directory)
+        try:
+            with os.fdopen(fd, mode) as f:
+                dump(value, f)
+            target = os.path.join(directory, name)
+            if hasattr(os, 'replace'):
+                os.replace(temp, target)
+            else:
+                if os.path.exists(target) and sys.platform.startswith('win'):
+                    os.remove(target)
+                os.rename(temp, target)
+        except Exception:
+            os.remove(temp)
+            raise
+    except Exception as e:
+        VSGLogger.debug(__name__, 'Could not write the cache file %s: %s', name, e)
+        return False
+    return True
+
+
+def secret(name, size=32):
+    """
+    Returns a secret key stored in the cache directory, creating it on first use.
+
+    The key file is created readable and writable by the user only.  On POSIX platforms a key file that is owned by another user, or that other users can access, is rejected, so a key planted in a shared cache directory is never trusted.
+
+    :param str name:  The name of the key file in the cache directory.
+    :param int size:  The number of random bytes of a new key.
+    :return:  The key as bytes or None if it cannot be read or created.
+    """
+    directory = cache_dir()
+    filename = os.path.join(directory, name)
+    try:
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        try:
+            fd = os.open(filename, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0), 0o600)
+        except OSError:
+            pass
+        else:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(os.urandom(size))
+
+        st = os.stat(filename)
+        if hasattr(os, 'getuid') and (st.st_uid != os.getuid() or st.st_mode & 0o077):
+            VSGLogger.warning(__name__, 'Ignoring the key file %s since other users can access it.', filename)
+            return None
+        with open(filename, 'rb') as f:
+            key = f.read()
+        return key if len(key) == size else None
+    except (IOError, OSError) as e:
+        VSGLogger.debug(__name__, 'Could not read the key file %s: %s', name, e)
+        return None
+
+
+def read_json(name):
+    """
+    Reads a JSON cache file.
+
+    :param str name:  The name of the file in the cache directory.
+    :return:  The decoded value or None if the file does not exist or cannot be read.
+    """
+    return _read(name, json.load, 'rt')
+
+
+def write_json(name, value):
+    """
+    Writes a JSON cache file atomically.
+
+    :param str name:      The name of the file in the cache directory.
+    :param object value:  The value to encode.
+    :return:  True if the file was written; False otherwise.
+    """
+    return _write(name, value, json.dump, 'wt')
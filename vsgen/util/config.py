@@ -3,12 +3,176 @@
 This module provides all functionality for extending Python's config parser functionality.
 
 The module defines the class VSGConfigParser.  The VSGConfigParser class provides the main functionality of using Python's native config parser.
+
+Parsing and interpolating a large configuration file is expensive, so :meth:`VSGConfigParser.read_cached` keeps the fully resolved sections and options of a file in a JSON file in the :func:`~vsgen.util.cache.cache_dir`.  There is one cache file per configuration file; it records a digest of the content of the configuration file, its location and its overrides, so any change to them is a cache miss that replaces the cache file.
+
+The interpolated values and the typed conversions of :meth:`VSGConfigParser.get`, :meth:`VSGConfigParser.getlist`, :meth:`VSGConfigParser.getfile` and :meth:`VSGConfigParser.getdir` are memoized.  Since any option may be referenced by another, every change to the parser invalidates all memoized values.  The memoized values are safe to share between the threads constructing projects concurrently.
+
+The wildcard patterns of :meth:`VSGConfigParser.getdirs` are expanded once per process and the expansions are shared by every parser; the distinct patterns of an option are expanded concurrently by a pool of threads that is shared by every expansion of the process, created on first use and closed when the process exits.  Call :func:`clear_globs` to discard the expansions if the directories change.
+
+Template configuration files are parsed once per process by :meth:`VSGConfigParser.from_template`, which returns copy-on-write overlays of the parsed template: an overlay shares the template's sections until it modifies one of them.
 """
 
 import os
 import glob
+import json
+import atexit
+import fnmatch
+import hashlib
+import threading
 import configparser
 
+from vsgen.util.cache import read_json, write_json
+from vsgen.util.logger import VSGLogger
+
+# The version of the resolved configuration cache files; increment it when their layout changes.
+CACHE_VERSION = 2
+
+_MISSING = object()
+
+_templates = {}
+_templates_lock = threading.Lock()
+
+_globs = {}
+_globs_lock = threading.Lock()
+
+_glob_pool = None
+_glob_pool_lock = threading.Lock()
+
+# The number of threads expanding the patterns of getdirs.
+GLOB_THREADS = 8
+
+
+def _scandirs(pattern):
+    """
+    Expands a wildcard pattern to the directories it matches.
+
+    The pattern is expanded one component at a time like :func:`glob.glob`, but only directories are matched and the type of each entry is read from :func:`os.scandir`, so matches are not stat-ed again.
+
+    :param str pattern:  The wildcard pattern.
+    :return:  A list of directory paths.
+    """
+    if not pattern:
+        return []
+    if not hasattr(os, 'scandir'):
+        return [f for f in glob.glob(pattern) if os.path.isdir(f)]
+
+    drive, path = os.path.splitdrive(pattern)
+    parts = path.replace(os.altsep or os.sep, os.sep).split(os.sep)
+    if parts[0] == '':
+        candidates, parts = [drive + os.sep], parts[1:]
+    else:
+        candidates = [drive]
+
+    # Only the paths appended by literal components need to be checked once expanded.
+    verified = False
+    for part in (p for p in parts if p):
+        if not glob.has_magic(part):
+            candidates = [os.path.join(c, part) for c in candidates]
+            verified = False
+            continue
+        verified = True
+        matches = []
+        for c in candidates:
+            try:
+                entries = list(os.scandir(c or os.curdir))
+            except OSError:
+                continue
+            for entry in entries:
+                if (entry.name[0] != '.' or part[0] == '.') and fnmatch.fnmatch(entry.name, part) and entry.is_dir():
+                    matches.append(os.path.join(c, entry.name))
+        candidates = matches
+    return candidates if verified else [c for c in candidates if c and os.path.isdir(c)]
+
+
+def _expand(pattern):
+    """
+    Returns the cached expansion of a wildcard pattern, expanding it on the first request.
+
+    Concurrent requests for the same pattern wait for the first one to complete.
+
+    :param str pattern:  The wildcard pattern.
+    :return:  A tuple of directory paths.
+    """
+    key = (os.getcwd(), pattern)
+    with _globs_lock:
+        entry = _globs.get(key)
+        if entry is None:
+            entry = _globs[key] = [threading.Lock(), None]
+    with entry[0]:
+        if entry[1] is None:
+            entry[1] = tuple(_scandirs(pattern))
+        return entry[1]
+
+
+def expand_dirs(patterns):
+    """
+    Expands wildcard patterns to the directories they match, using the cached expansions.
+
+    The patterns that are not cached are expanded concurrently.
+
+    :param list patterns:  The wildcard patterns.
+    :return:  A list of directory paths, in the order of the patterns.
+    """
+    patterns = list(patterns)
+    pending = set(p for p in patterns if (os.getcwd(), p) not in _globs)
+    if len(pending) > 1:
+        _pool().map(_expand, pending)
+    return [d for p in patterns for d in _expand(p)]
+
+
+def _pool():
+    """
+    Returns the pool of threads expanding the wildcard patterns, creating it on first use.
+
+    A forked process does not inherit the threads of its parent's pool, so it creates its own.
+
+    :return:  A :class:`~multiprocessing.pool.ThreadPool` instance.
+    """
+    global _glob_pool
+    with _glob_pool_lock:
+        if _glob_pool is None or _glob_pool[0] != os.getpid():
+            from multiprocessing.pool import ThreadPool
+            if _glob_pool is None:
+                atexit.register(_close_pool)
+            _glob_pool = (os.getpid(), ThreadPool(GLOB_THREADS))
+        return _glob_pool[1]
+
+
+def _close_pool():
+    """
+    Closes the pool of threads expanding the wildcard patterns.
+    """
+    global _glob_pool
+    with _glob_pool_lock:
+        pid, pool = _glob_pool or (None, None)
+        _glob_pool = None
+    if pid == os.getpid():
+        pool.close()
+        pool.join()
+
+
+def clear_globs():
+    """
+    Discards the cached expansions of the wildcard patterns.
+    """
+    with _globs_lock:
+        _globs.clear()
+
+
+def _is_resolved(value):
+    """
+    Returns whether a value decoded from a cache file has the layout of :meth:`VSGConfigParser.resolve`.
+
+    :param value:  The decoded value.
+    """
+    def options(value):
+        return isinstance(value, list) and all(isinstance(o, list) and len(o) == 2 and all(isinstance(t, str) for t in o) for o in value)
+
+    if not isinstance(value, list) or len(value) != 2 or not options(value[0]) or not isinstance(value[1], list):
+        return False
+    return all(isinstance(s, list) and len(s) == 2 and isinstance(s[0], str) and options(s[1]) for s in value[1])
+
 
 class VSGConfigParser(configparser.ConfigParser):
     """
@@ -24,9 +188,193 @@ class VSGConfigParser(configparser.ConfigParser):
         :param args:    List of arguments passed to the :class:`~configparser.ConfigParser`
         :param kwargs:  List of arbitrary keyworded arguments passed to :class:`~configparser.ConfigParser`
         """
+        self._memo = {}
+        self._memo_lock = threading.Lock()
+        self._memo_generation = 0
+        self._shared = set()
         kwargs.setdefault('interpolation', configparser.ExtendedInterpolation())
         return super(VSGConfigParser, self).__init__(*args, **kwargs)
 
+    @classmethod
+    def from_template(cls, filename, **overrides):
+        """
+        Returns an overlay of a template configuration file with overrides applied.
+
+        The template is parsed once per process, and again only if the file is modified.  Each call returns a new copy-on-write :meth:`overlay` of the parsed template, so the overrides of one call never affect another.
+
+        :param str filename:  The path to the template configuration file.
+        :param overrides:     List of keyworded option values applied with :meth:`update`.
+        :return:  A VSGConfigParser instance.
+        """
+        filename = os.path.abspath(filename)
+        try:
+            mtime = os.stat(filename).st_mtime
+        except OSError:
+            mtime = None
+        key = (cls, filename)
+        with _templates_lock:
+            template = _templates.get(key)
+            if template is None or template[0] != mtime:
+                config = cls()
+                if filename not in config.read([filename]):
+                    raise ValueError('Could not read VSG template configuration file %s.' % filename)
+                template = _templates[key] = (mtime, config)
+        return template[1].overlay(**overrides)
+
+    def overlay(self, **overrides):
+        """
+        Returns a copy-on-write copy of the parser with overrides applied.
+
+        The copy shares the parser's sections and only copies a section when it is modified, so copying a large template is cheap.  The parser itself must not be modified while it has overlays.
+
+        :param overrides:  List of keyworded option values applied with :meth:`update`.
+        :return:  A parser of the same class.
+        """
+        config = self.__class__.__new__(self.__class__)
+        config.__dict__.update(self.__dict__)
+        config._memo = {}
+        config._memo_lock = threading.Lock()
+        config._memo_generation = 0
+        config._sections = self._dict(self._sections)
+        config._shared = set(self._sections) | set([self.default_section])
+        config._proxies = self._dict()
+        config._proxies[self.default_section] = configparser.SectionProxy(config, self.default_section)
+        for section in self._sections:
+            config._proxies[section] = configparser.SectionProxy(config, section)
+        config.update(**overrides)
+        return config
+
+    def _unshare(self, section=None):
+        """
+        Copies a section shared with another parser before it is modified.
+
+        :param str section:  The name of the section; None copies all shared sections.
+        """
+        for s in ([section] if section is not None else list(self._shared)):
+            if s in self._shared:
+                self._shared.discard(s)
+                if s == self.default_section:
+                    self._defaults = self._dict(self._defaults)
+                elif s in self._sections:
+                    self._sections[s] = self._dict(self._sections[s])
+
+    def _invalidate(self):
+        """
+        Discards the memoized values.
+        """
+        with self._memo_lock:
+            self._memo_generation += 1
+            self._memo.clear()
+
+    def _memoized(self, key, compute):
+        """
+        Returns a memoized value, computing it on the first request.
+
+        :param tuple key:         The key of the value.
+        :param callable compute:  The function computing the value.
+        """
+        value = self._memo.get(key, _MISSING)
+        if value is _MISSING:
+            generation = self._memo_generation
+            value = compute()
+            with self._memo_lock:
+                # Discard the value if the parser changed while it was computed.
+                if generation == self._memo_generation:
+                    self._memo[key] = value
+        return value
+
+    def _escape(self, value):
+        """
+        Returns a value escaped so that the parser's interpolation returns it unchanged.
+
+        :param str value:  The value to escape.
+        """
+        if isinstance(self._interpolation, configparser.ExtendedInterpolation):
+            return value.replace('$', '$$')
+        if isinstance(self._interpolation, configparser.BasicInterpolation):
+            return value.replace('%', '%%')
+        return value
+
+    def resolve(self):
+        """
+        Returns the fully resolved sections and options of the parser.
+
+        Options that cannot be interpolated are kept unresolved.  The defaults are kept unresolved since they are resolved in the context of each section; every section holds the resolved values of its own options and of the defaults.
+
+        :return:  A tuple of the raw defaults and a list of (Section, Options) pairs, each Options a list of (Option, Value) pairs.
+        """
+        defaults = list(self._defaults.items())
+        sections = [(s, [(o, self._resolve(s, o)) for o in self.options(s)]) for s in self.sections()]
+        return defaults, sections
+
+    def _resolve(self, section, option):
+        """
+        Returns the resolved and escaped value of an option, or its raw value if it cannot be interpolated.
+
+        :param str section:  The section of the option.
+        :param str option:   The name of the option.
+        """
+        try:
+            return self._escape(self.get(section, option))
+        except configparser.InterpolationError:
+            # Keep the raw value so the error is raised when (and only if) the option is used.
+            return self.get(section, option, raw=True)
+
+    def load_resolved(self, resolved):
+        """
+        Replaces the parser's sections and options with resolved ones.
+
+        :param tuple resolved:  The value returned by :meth:`resolve`.
+        """
+        defaults, sections = resolved
+        self.clear()
+        self.read_dict({self.default_section: dict(defaults)})
+        self.read_dict(dict((s, dict(options)) for s, options in sections))
+
+    def read_cached(self, filename, overrides=None, prepare=None, encoding=None):
+        """
+        Reads a configuration file, loading its fully resolved sections and options from the cache when it is valid.
+
+        On a cache miss the file is parsed, the overrides are set and ``prepare`` is called before every option is interpolated and the result is cached.
+
+        :param str filename:       The configuration file to read.
+        :param dict overrides:     A dictionary of sections, each a dictionary of (Option, Value) pairs, set after reading the file.
+        :param callable prepare:   An optional function called with the parser after the overrides are set; its changes must depend only on the file, its location and the overrides.
+        :param str encoding:       The encoding of the configuration file.
+        :return:  A list containing the filename if it was read; an empty list otherwise.
+        """
+        overrides = overrides or {}
+        try:
+            with open(filename, 'rb') as f:
+                content = f.read()
+        except (IOError, OSError):
+            return []
+
+        path = os.path.abspath(filename)
+        digest = hashlib.sha1(content)
+        digest.update(json.dumps([CACHE_VERSION, path, type(self._interpolation).__name__, overrides], sort_keys=True).encode('utf-8'))
+        digest = digest.hexdigest()
+        name = 'config-{}.json'.format(hashlib.sha1(path.encode('utf-8')).hexdigest())
+
+        cached = read_json(name)
+        if isinstance(cached, dict) and cached.get('digest') == digest:
+            if _is_resolved(cached.get('resolved')):
+                self.load_resolved(cached['resolved'])
+                return [filename]
+            VSGLogger.debug(__name__, 'Ignoring the invalid cache file of %s.', filename)
+
+        if filename not in self.read([filename], encoding=encoding):
+            return []
+        for section, options in overrides.items():
+            for option, value in options.items():
+                self.set(section, option, value)
+        if prepare:
+            prepare(self)
+
+        write_json(name, {'digest': digest, 'resolved': self.resolve()})
+        VSGLogger.debug(__name__, 'Cached the resolved configuration file %s.', filename)
+        return [filename]
+
     def _convert_to_list(self, value, delimiters):
         """
         Return a list value translating from other types if necessary.
@@ -47,35 +395,61 @@ class VSGConfigParser(configparser.ConfigParser):
         """
         return os.path.normpath(value)
 
+    def get(self, section, option, raw=False, vars=None, fallback=configparser._UNSET, **kwargs):
+        """
+        Extends :meth:`~configparser.ConfigParser.get` by memoizing the interpolated values.
+
+        Raw values and values interpolated with ``vars`` are not memoized.
+        """
+        if raw or vars or kwargs:
+            return super(VSGConfigParser, self).get(section, option, raw=raw, vars=vars, fallback=fallback, **kwargs)
+        try:
+            return self._memoized(('get', section, option), lambda: super(VSGConfigParser, self).get(section, option))
+        except (configparser.NoSectionError, configparser.NoOptionError):
+            if fallback is configparser._UNSET:
+                raise
+            return fallback
+
     def getlist(self, section, option, raw=False, vars=None, fallback=[], delimiters=','):
         """
         A convenience method which coerces the option in the specified section to a list of strings.
+
+        :return:  A new list on every call, so it may be modified by the caller.
+        """
+        if raw or vars or not self.has_option(section, option):
+            v = self.get(section, option, raw=raw, vars=vars, fallback=fallback)
+            return self._convert_to_list(v, delimiters=delimiters)
+        return list(self._memoized(('list', section, option, delimiters), lambda: self._convert_to_list(self.get(section, option), delimiters=delimiters)))
+
+    def _getpath(self, section, option, raw, vars, fallback):
+        """
+        Returns the option in the specified section coerced to a path.
         """
-        v = self.get(section, option, raw=raw, vars=vars, fallback=fallback)
-        return self._convert_to_list(v, delimiters=delimiters)
+        if raw or vars or not self.has_option(section, option):
+            return self._convert_to_path(self.get(section, option, raw=raw, vars=vars, fallback=fallback))
+        return self._memoized(('path', section, option), lambda: self._convert_to_path(self.get(section, option)))
 
     def getfile(self, section, option, raw=False, vars=None, fallback="", validate=False):
         """
         A convenience method which coerces the option in the specified section to a file.
         """
-        v = self.get(section, option, raw=raw, vars=vars, fallback=fallback)
-        v = self._convert_to_path(v)
+        v = self._getpath(section, option, raw, vars, fallback)
         return v if not validate or os.path.isfile(v) else fallback
 
     def getdir(self, section, option, raw=False, vars=None, fallback="", validate=False):
         """
         A convenience method which coerces the option in the specified section to a directory.
         """
-        v = self.get(section, option, raw=raw, vars=vars, fallback=fallback)
-        v = self._convert_to_path(v)
+        v = self._getpath(section, option, raw, vars, fallback)
         return v if not validate or os.path.isdir(v) else fallback
 
     def getdirs(self, section, option, raw=False, vars=None, fallback=[]):
         """
         A convenience method which coerces the option in the specified section to a list of directories.
+
+        The wildcard patterns are expanded with :func:`expand_dirs`, so each distinct pattern is only expanded once per process.
         """
-        globs = self.getlist(section, option, fallback=[])
-        return [f for g in globs for f in glob.glob(g) if os.path.isdir(f)]
+        return expand_dirs(self.getlist(section, option, fallback=[]))
 
     def set(self, section, option, value=None):
         """
@@ -90,15 +464,72 @@ class VSGConfigParser(configparser.ConfigParser):
         if isinstance(value, bytes):
             value = value.decode('utf8')
 
+        self._invalidate()
+        self._unshare(section or self.default_section)
         return super(VSGConfigParser, self).set(section, option, value)
 
+    def read(self, filenames, encoding=None):
+        """
+        Extends :meth:`~configparser.ConfigParser.read` by discarding the memoized values.
+        """
+        self._invalidate()
+        self._unshare()
+        return super(VSGConfigParser, self).read(filenames, encoding=encoding)
+
+    def read_file(self, f, source=None):
+        """
+        Extends :meth:`~configparser.ConfigParser.read_file` by discarding the memoized values.
+        """
+        self._invalidate()
+        self._unshare()
+        return super(VSGConfigParser, self).read_file(f, source=source)
+
+    def __setitem__(self, key, value):
+        """
+        Extends :meth:`~configparser.ConfigParser.__setitem__` by discarding the memoized values and copying a shared section before it is replaced.
+        """
+        self._invalidate()
+        self._unshare(key)
+        return super(VSGConfigParser, self).__setitem__(key, value)
+
+    def add_section(self, section):
+        """
+        Extends :meth:`~configparser.ConfigParser.add_section` by discarding the memoized values.
+        """
+        self._invalidate()
+        return super(VSGConfigParser, self).add_section(section)
+
+    def remove_section(self, section):
+        """
+        Extends :meth:`~configparser.ConfigParser.remove_section` by discarding the memoized values.
+        """
+        self._invalidate()
+        self._shared.discard(section)
+        return super(VSGConfigParser, self).remove_section(section)
+
+    def remove_option(self, section, option):
+        """
+        Extends :meth:`~configparser.ConfigParser.remove_option` by discarding the memoized values.
+        """
+        self._invalidate()
+        self._unshare(section or self.default_section)
+        return super(VSGConfigParser, self).remove_option(section, option)
+
     def update(self, **kwargs):
         """
-        Extends :meth:`~configparser.ConfigParser.set` by auto formatting byte strings into unicode strings.
+        Overrides options with keyworded values; each value is set to the option of the same name in the first section that has it.
+
+        Empty values and values without a matching option are ignored.
+
+        :param kwargs:  List of keyworded option values.
+        :return:  A dictionary of the keyworded values that were not set.
         """
-        # Override the template values with the override values.
-        for s in config.sections():
-            for o in config.options(s):
-                override = kwargs.pop(o, None)
-                if override:
-                    config.set(s, o, override)
+        sections = self.sections()
+        unused = {}
+        for option, value in kwargs.items():
+            section = next((s for s in sections if self.has_option(s, self.optionxform(option))), None) if value else None
+            if section is None:
+                unused[option] = value
+            else:
+                self.set(section, self.optionxform(option), value)
+        return unused
@@ -1,12 +1,207 @@
 # -*- coding: utf-8 -*-
 """
 This module provides all functionality for extending Python's entrypoints functionality.
+
+The entry points of each section are indexed by name once per process without being loaded; an entry point is only loaded (i.e. its plugin imported) the first time it is requested.
+
+Scanning the installed distributions with ``pkg_resources`` is slow in large environments, so the names and targets of the ``vsgen`` entry points are also kept in an index in the :func:`~vsgen.util.cache.cache_dir`.  Each interpreter and virtual environment has its own index file, named after a hash of :data:`sys.executable` and :data:`sys.prefix`.  The index is keyed by a fingerprint of the environment (the installed distribution metadata of the :data:`sys.path` directories, other than the current directory, including the metadata of the develop installs their ``.egg-link`` files point to, and the distributions added to ``pkg_resources``' working set in-process) and is rebuilt automatically when the environment changes.
 """
 
 import os
-import glob
-import configparser
-import pkg_resources
+import sys
+import hashlib
+import importlib
+import threading
+
+from vsgen.util.cache import read_json, write_json
+
+INDEX_FILENAME = 'entrypoints-{}.json'
+
+_index = {}
+_loaded = {}
+_sections = None
+_lock = threading.RLock()
+
+
+class VSGEntryPoint(object):
+    """
+    The VSGEntryPoint class is an entry point read from the on-disk index; it is loaded without ``pkg_resources``.
+
+    :ivar str name:   The name of the entry point.
+    :ivar str value:  The target of the entry point in the ``module:attrs`` form.
+    """
+
+    def __init__(self, name, value):
+        """
+        Constructor.
+
+        :param str name:   The name of the entry point.
+        :param str value:  The target of the entry point in the ``module:attrs [extras]`` form.
+        """
+        self.name = name
+        self.value = value
+
+    def load(self):
+        """
+        Imports the entry point's module and returns its target.
+        """
+        module, _, attrs = self.value.split('[')[0].strip().partition(':')
+        target = importlib.import_module(module.strip())
+        for attr in attrs.strip().split('.') if attrs.strip() else []:
+            target = getattr(target, attr)
+        return target
+
+
+def _index_filename():
+    """
+    Returns the name of the index file of the running interpreter and environment.
+    """
+    environment = '{}\0{}'.format(sys.executable, sys.prefix).encode('utf-8', 'replace')
+    return INDEX_FILENAME.format(hashlib.sha1(environment).hexdigest()[:16])
+
+
+def _metadata(path, entry):
+    """
+    Returns the metadata directories of a distribution entry of a :data:`sys.path` directory.
+
+    An ``.egg-link`` file of a develop install is resolved to the ``.egg-info`` directories of the source tree it points to.
+
+    :param str path:   The :data:`sys.path` directory.
+    :param str entry:  The name of the entry.
+    :return:  A list of directory paths.
+    """
+    if not entry.endswith('.egg-link'):
+        return [os.path.join(path, entry)]
+    try:
+        with open(os.path.join(path, entry), 'rt') as f:
+            target = os.path.join(path, f.readline().strip())
+        return [os.path.join(target, e) for e in sorted(os.listdir(target)) if e.endswith('.egg-info')]
+    except (IOError, OSError):
+        return []
+
+
+def _fingerprint():
+    """
+    Returns a fingerprint of the installed distributions.
+
+    The current directory is not part of the fingerprint, so writing files to it does not invalidate the index.
+
+    :return:  A hexadecimal digest that changes whenever a distribution on :data:`sys.path` is installed, removed or has its entry points modified.
+    """
+    digest = hashlib.sha1(sys.executable.encode('utf-8', 'replace'))
+    cwd = os.getcwd()
+    for path in sys.path:
+        if not path or os.path.abspath(path) == cwd:
+            continue
+        digest.update(b'\0' + path.encode('utf-8', 'replace'))
+        try:
+            entries = sorted(os.listdir(path))
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.endswith(('.dist-info', '.egg-info', '.egg-link', '.pth')):
+                digest.update(b'\0' + entry.encode('utf-8', 'replace'))
+                for metadata in _metadata(path, entry):
+                    digest.update(b'\0' + metadata.encode('utf-8', 'replace'))
+                    try:
+                        digest.update(repr(os.stat(os.path.join(metadata, 'entry_points.txt')).st_mtime).encode('ascii'))
+                    except OSError:
+                        pass
+
+    # The distributions added to an imported pkg_resources' working set in-process.
+    pkg_resources = sys.modules.get('pkg_resources')
+    if pkg_resources is not None:
+        working_set = pkg_resources.working_set
+        for entry in working_set.entries:
+            if entry not in sys.path:
+                digest.update(b'\1' + '{} {}'.format(entry, sorted(working_set.entry_keys.get(entry, []))).encode('utf-8', 'replace'))
+    return digest.hexdigest()
+
+
+def _scan():
+    """
+    Scans the installed distributions for the ``vsgen`` entry points.
+
+    The working set of ``pkg_resources`` is scanned if it is imported, since it may have been modified in-process.
+
+    :return:  A dictionary of sections, each a dictionary of (Name, Target) pairs.
+    """
+    sections = {}
+    metadata = None
+    if 'pkg_resources' not in sys.modules:
+        try:
+            from importlib import metadata
+        except ImportError:
+            pass
+    if metadata is None:
+        import pkg_resources
+        for distribution in pkg_resources.working_set:
+            for section, eps in distribution.get_entry_map().items():
+                if section.startswith('vsgen'):
+                    sections.setdefault(section, {}).update((ep.name, str(ep).partition('=')[2].strip()) for ep in eps.values())
+        return sections
+
+    for distribution in metadata.distributions():
+        for ep in distribution.entry_points:
+            if ep.group.startswith('vsgen'):
+                sections.setdefault(ep.group, {})[ep.name] = ep.value
+    return sections
+
+
+def load_index(refresh=False):
+    """
+    Returns the on-disk index of the ``vsgen`` entry points, rebuilding it if it is stale.
+
+    :param bool refresh:  Flag to rebuild the index even if it is not stale.
+    :return:  A dictionary of sections, each a dictionary of (Name, Target) pairs.
+    """
+    fingerprint = _fingerprint()
+    filename = _index_filename()
+    index = None if refresh else read_json(filename)
+    if not index or index.get('fingerprint') != fingerprint:
+        index = {'fingerprint': fingerprint, 'sections': _scan()}
+        write_json(filename, index)
+    return index['sections']
+
+
+def _entrypoints(section, refresh=False):
+    """
+    Returns the index of the entry points of a section without loading them.
+
+    :param str section:   The section name in the entry point collection.
+    :param bool refresh:  Flag to discard the cached index and scan the installed distributions again.
+    :return:  A dictionary of (Name, EntryPoint) pairs.
+    """
+    global _sections
+    with _lock:
+        index = None if refresh else _index.get(section)
+        if index is None:
+            if refresh or _sections is None:
+                _sections = load_index(refresh)
+            index = dict((k, VSGEntryPoint(k, v)) for k, v in _sections.get(section, {}).items())
+            _index[section] = index
+        return index
+
+
+def clear():
+    """
+    Discards the cached entry point indexes and loaded entry points.
+    """
+    global _sections
+    with _lock:
+        _index.clear()
+        _loaded.clear()
+        _sections = None
+
+
+def names(section):
+    """
+    Returns the names of the entry points of a section without loading them.
+
+    :param str section: The section name in the entry point collection
+    :returns:  A sorted list of names.
+    """
+    return sorted(_entrypoints(section))
 
 
 def entrypoints(section):
@@ -16,18 +211,26 @@ def entrypoints(section):
     :param str section: The section name in the entry point collection
     :returns:  A dictionary of (Name, Class) pairs stored in the entry point collection.
     """
-    return {ep.name: ep.load() for ep in pkg_resources.iter_entry_points(section)}
+    return {name: entrypoint(section, name) for name in _entrypoints(section)}
 
 
 def entrypoint(section, option):
     """
     Returns the the entry point object given a section, option pair.
 
+    Only the requested entry point is loaded and the loaded object is cached.  If the option is not in the cached index the installed distributions are scanned again, so plugins installed after the first lookup are found.
+
     :param str section: The section name in the entry point collection
     :param str option: The option name in the entry point collection
     :return:  The entry point object if available.
     """
-    try:
-        return entrypoints(section)[option]
-    except KeyError:
-        raise KeyError('Cannot resolve type "{}" to a recognised vsgen "{}" type.'.format(option, section))
+    with _lock:
+        key = (section, option)
+        if key in _loaded:
+            return _loaded[key]
+
+        ep = _entrypoints(section).get(option) or _entrypoints(section, refresh=True).get(option)
+        if ep is None:
+            raise KeyError('Cannot resolve type "{}" to a recognised vsgen "{}" type.'.format(option, section))
+        _loaded[key] = ep.load()
+        return _loaded[key]
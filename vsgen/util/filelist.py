@@ -0,0 +1,564 @@
+# -*- coding: utf-8 -*-
+"""
+This module provides all functionality for the collections that hold a project's files.
+
+The module defines the classes VSGPathTable, VSGRelativeView, VSGFileStream and VSGFileSource.  The VSGPathTable class is a list compatible and insertion ordered set of paths that stores each distinct directory once and the VSGRelativeView class maintains a sorted, relative view of a VSGPathTable.  The VSGFileStream class is a lazy collection of files that generates its files each time it is iterated, so that a project's files can be rendered while they are found and without holding them in memory; the VSGFileSource class lets the streams sharing a source generate its files once while they are held, e.g. for the duration of a render.
+"""
+
+import os
+import array
+import itertools
+
+try:
+    from collections.abc import MutableSequence
+except ImportError:
+    from collections import MutableSequence
+
+
+def normalize(path):
+    """
+    Returns the normalized form of a path used to detect duplicate paths.
+
+    :param str path:  The path.
+    :return:  The path with its separators, redundant components and, on case insensitive platforms, its case normalized.
+    """
+    return os.path.normcase(os.path.normpath(path))
+
+
+class VSGPathTable(MutableSequence):
+    """
+    The VSGPathTable class presents a list compatible collection of distinct paths in insertion order.
+
+    The class is a :class:`~collections.abc.MutableSequence`, so it supports the methods of a list, such as ``pop``, ``count``, ``reverse`` and ``+=``, in addition to ``sort`` and ``copy``.  Since the paths are distinct, membership, ``index`` and ``count`` compare normalized paths.
+
+    The entries are kept in a list of ``(prefix index, basename)`` tuples whose directory prefixes are interned, since large projects repeat a few long directory prefixes across many files.  A dictionary keyed by the normalized paths indexes the entries, so membership tests and duplicate detection take constant time; it is updated along with each modification.
+    """
+
+    def __init__(self, paths=None):
+        """
+        Constructor.
+
+        :param list paths:  The initial paths of the collection.
+        """
+        self._prefixes = []
+        self._prefix_index = {}
+        self._entries = []
+        self._index = {}
+        self._generation = 0
+        if paths:
+            self.extend(paths)
+
+    @property
+    def generation(self):
+        """
+        Returns a counter that changes whenever existing entries are modified; appending entries does not change it.
+        """
+        return self._generation
+
+    def entry(self, i):
+        """
+        Returns the entry at an index.
+
+        :param int i:  The index of the entry.
+        :return:  A ``(prefix index, basename)`` tuple.
+        """
+        return self._entries[i]
+
+    def prefix(self, index):
+        """
+        Returns an interned directory prefix.
+
+        :param int index:  The index of the prefix.
+        :return:  The directory prefix including its trailing separator.
+        """
+        return self._prefixes[index]
+
+    def _entry(self, path):
+        """
+        Returns the entry of a path, interning its directory prefix if needed.
+
+        :param str path:  The path.
+        :return:  A ``(prefix index, basename)`` tuple.
+        """
+        name = os.path.basename(path)
+        prefix = path[:len(path) - len(name)]
+        parent = self._prefix_index.get(prefix)
+        if parent is None:
+            parent = self._prefix_index[prefix] = len(self._prefixes)
+            self._prefixes.append(prefix)
+        return parent, name
+
+    def _path(self, entry):
+        """
+        Returns the path of an entry.
+
+        :param tuple entry:  The ``(prefix index, basename)`` tuple.
+        """
+        return self._prefixes[entry[0]] + entry[1]
+
+    def _unique(self, paths):
+        """
+        Returns the entries of the paths that the collection does not already contain, adding them to the index.
+
+        :param list paths:  The paths.
+        :return:  A list of entries.
+        """
+        entries = []
+        for path in paths:
+            key = normalize(path)
+            if key not in self._index:
+                entry = self._index[key] = self._entry(path)
+                entries.append(entry)
+        return entries
+
+    def _forget(self, entries):
+        """
+        Removes entries from the index.
+
+        :param list entries:  The entries.
+        """
+        for entry in entries:
+            del self._index[normalize(self._path(entry))]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self):
+        prefixes = self._prefixes
+        for parent, name in self._entries:
+            yield prefixes[parent] + name
+
+    def __reversed__(self):
+        prefixes = self._prefixes
+        for parent, name in reversed(self._entries):
+            yield prefixes[parent] + name
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._path(e) for e in self._entries[i]]
+        return self._path(self._entries[i])
+
+    def __setitem__(self, i, value):
+        # A path already in the collection is not added again, so assigning it removes the replaced entries.
+        if isinstance(i, slice):
+            self._forget(self._entries[i])
+            entries = self._unique(value)
+            try:
+                self._entries[i] = entries
+            except ValueError:
+                self._forget(entries)
+                raise
+        else:
+            entry = self._entries[i]
+            self._forget([entry])
+            entries = self._unique([value])
+            if entries:
+                self._entries[i] = entries[0]
+            else:
+                del self._entries[i]
+        self._generation += 1
+
+    def __delitem__(self, i):
+        entries = self._entries[i] if isinstance(i, slice) else [self._entries[i]]
+        self._forget(entries)
+        del self._entries[i]
+        self._generation += 1
+
+    def __contains__(self, path):
+        return normalize(path) in self._index
+
+    def __eq__(self, other):
+        if isinstance(other, (VSGPathTable, list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def __add__(self, other):
+        return list(self) + list(other)
+
+    def __repr__(self):
+        return 'VSGPathTable({!r})'.format(list(self))
+
+    def index(self, path, start=0, stop=None):
+        """
+        Returns the index of a path.
+
+        :param str path:   The path.
+        :param int start:  The index to start the search at.
+        :param int stop:   The index to stop the search at.
+        :raises ValueError:  If the path is not in the collection between the indices.
+        """
+        entry = self._index.get(normalize(path))
+        if entry is None:
+            raise ValueError('{} is not in the path table'.format(path))
+        try:
+            return self._entries.index(entry, start, len(self) if stop is None else stop)
+        except ValueError:
+            raise ValueError('{} is not in the path table'.format(path))
+
+    def count(self, path):
+        """
+        Returns the number of occurrences of a path, which is 0 or 1.
+
+        :param str path:  The path.
+        """
+        return 1 if path in self else 0
+
+    def clear(self):
+        """
+        Removes all paths.
+        """
+        self._entries = []
+        self._index = {}
+        self._generation += 1
+
+    def copy(self):
+        """
+        Returns a shallow copy of the collection.
+        """
+        return VSGPathTable(self)
+
+    def reverse(self):
+        """
+        Reverses the paths in place.
+        """
+        self._entries.reverse()
+        self._generation += 1
+
+    def sort(self, key=None, reverse=False):
+        """
+        Sorts the paths in place.
+
+        :param key:           The function that returns the sort key of a path; if not provided the paths are sorted by value.
+        :param bool reverse:  Flag to sort in descending order.
+        """
+        key = key or (lambda path: path)
+        self._entries.sort(key=lambda e: key(self._path(e)), reverse=reverse)
+        self._generation += 1
+
+    def append(self, path):
+        """
+        Appends a path unless the collection already contains it.
+
+        :param str path:  The path.
+        :return:  True if the path was appended; False if it is a duplicate.
+        """
+        return self.extend([path]) == 1
+
+    def extend(self, paths):
+        """
+        Appends the paths of a collection that the collection does not already contain.
+
+        :param list paths:  The paths.
+        :return:  The number of paths appended.
+        """
+        entries = self._unique(paths)
+        self._entries.extend(entries)
+        return len(entries)
+
+    def insert(self, i, path):
+        """
+        Inserts a path before an index unless the collection already contains it.
+
+        :param int i:       The index.
+        :param str path:    The path.
+        """
+        entries = self._unique([path])
+        if entries:
+            self._entries.insert(i, entries[0])
+            self._generation += 1
+
+    def remove(self, path):
+        """
+        Removes a path.
+
+        :param str path:  The path.
+        """
+        del self[self.index(path)]
+
+    def directories(self):
+        """
+        Returns the distinct directories of the paths in the collection.
+
+        :return:  A list of directory paths.
+        """
+        return [os.path.dirname(self._prefixes[i]) for i in sorted(set(e[0] for e in self._entries))]
+
+    def relative(self, start):
+        """
+        Iterates over the paths relative to a directory, resolving each distinct directory prefix only once.
+
+        :param str start:  The directory the paths are made relative to.
+        :return:  A generator of relative paths in the order of the collection.
+        """
+        relative = {}
+        for parent, name in self._entries:
+            prefix = relative.get(parent)
+            if prefix is None:
+                prefix = relative[parent] = os.path.relpath(self._prefixes[parent] or os.curdir, start)
+            yield name if prefix == os.curdir else os.path.join(prefix, name)
+
+
+class VSGFileStream(object):
+    """
+    The VSGFileStream class presents a lazy, re-iterable collection of files of a single kind.
+
+    The collection iterates over the files added explicitly followed by the files of the same kind generated by each source; a file that normalizes to a file already produced by the iteration is skipped.
+    """
+
+    def __init__(self, kind, files=None):
+        """
+        Constructor.
+
+        :param str kind:    The kind of files in the collection (e.g. ``compile`` or ``content``).
+        :param list files:  The initial files of the collection.
+        """
+        self._kind = kind
+        self._files = list(files or [])
+        self._sources = []
+
+    def __iter__(self):
+        """
+        Iterates over the distinct explicit files and then over the distinct generated files.
+        """
+        seen = set()
+        for path in itertools.chain(self._files, (p for s in self._sources for k, p in s() if k == self._kind)):
+            key = normalize(path)
+            if key not in seen:
+                seen.add(key)
+                yield path
+
+    def __len__(self):
+        """
+        Returns the number of files; this generates all files.
+        """
+        return sum(1 for _ in self)
+
+    def __bool__(self):
+        """
+        Returns True if the collection contains at least one file; this generates files until the first is found.
+        """
+        return any(True for _ in self)
+
+    __nonzero__ = __bool__
+
+    def append(self, path):
+        """
+        Appends an explicit file.
+
+        :param str path:  The file path.
+        """
+        self._files.append(path)
+
+    def extend(self, paths):
+        """
+        Appends a collection of explicit files.
+
+        :param list paths:  The file paths.
+        """
+        self._files.extend(paths)
+
+    @property
+    def sources(self):
+        """
+        Returns the list of sources of generated files.
+        """
+        return list(self._sources)
+
+    def add_source(self, source):
+        """
+        Adds a source of generated files.
+
+        :param source:  A callable returning an iterable of ``(kind, path)`` tuples; only the paths matching the collection's kind are used.
+        """
+        self._sources.append(source)
+
+
+class VSGFileSource(object):
+    """
+    The VSGFileSource class presents a source of generated files for :class:`VSGFileStream` instances whose files can be held.
+
+    While the source is held, the first call generates the files as they are iterated and records them; later calls replay the recorded files and continue the generation where the previous iterations stopped.  Hence the streams sharing the source, and repeated iterations of a stream, generate the files once.  The files are discarded when the source is released.
+    """
+
+    def __init__(self, source):
+        """
+        Constructor.
+
+        :param source:  A callable returning an iterable of ``(kind, path)`` tuples.
+        """
+        self._source = source
+        self._holds = 0
+        self._state = None
+
+    def __call__(self):
+        """
+        Returns an iterable of the generated ``(kind, path)`` tuples.
+        """
+        if not self._holds:
+            return self._source()
+        if self._state is None:
+            self._state = [[], iter(self._source())]
+        return self._replay(self._state)
+
+    def __getstate__(self):
+        """
+        Returns the state of the source without its held files.
+        """
+        state = self.__dict__.copy()
+        state['_holds'] = 0
+        state['_state'] = None
+        return state
+
+    @staticmethod
+    def _replay(state):
+        """
+        Iterates over the recorded files and then over the files that are not generated yet.
+
+        :param list state:  The ``[files, iterator]`` list of the recorded files and the iterator of the generation; the iterator is None once the generation is complete.
+        """
+        files = state[0]
+        index = 0
+        while True:
+            if index < len(files):
+                yield files[index]
+                index += 1
+                continue
+            if state[1] is None:
+                return
+            try:
+                item = next(state[1])
+            except StopIteration:
+                state[1] = None
+                return
+            files.append(item)
+
+    def hold(self):
+        """
+        Holds the generated files until the matching :meth:`release`.
+        """
+        self._holds += 1
+
+    def release(self):
+        """
+        Releases the generated files held by the matching :meth:`hold`.
+        """
+        self._holds -= 1
+        if not self._holds:
+            self._state = None
+
+
+class VSGRelativeView(object):
+    """
+    The VSGRelativeView class maintains the paths of a :class:`VSGPathTable` sorted and relative to a start directory.
+
+    The view is cached and updated incrementally: paths appended to the table are sorted and merged into the view, and the view is only rebuilt when existing entries of the table are modified or when the start directory changes.  Each distinct directory prefix is resolved against the start directory only once.
+
+    :ivar VSGPathTable table:  The table of the view.
+    """
+
+    def __init__(self, table, key=None):
+        """
+        Constructor.
+
+        :param VSGPathTable table:  The table of the view.
+        :param key:                 The function that returns the sort key of a path; if not provided the paths are sorted by value.
+        """
+        self.table = table
+        self._key = key or (lambda path: path)
+        self.invalidate()
+
+    def invalidate(self):
+        """
+        Discards the cached view.
+        """
+        self._start = None
+        self._generation = None
+        self._count = 0
+        self._order = array.array('l')
+        self._prefixes = {}
+        self._directories = set()
+
+    def _relative_prefix(self, index):
+        """
+        Returns the directory prefix at an index relative to the start directory.
+
+        :param int index:  The index of the prefix.
+        """
+        relative = self._prefixes.get(index)
+        if relative is None:
+            relative = self._prefixes[index] = os.path.relpath(self.table.prefix(index) or os.curdir, self._start)
+        return relative
+
+    def _update(self, start):
+        """
+        Brings the view up to date with the table.
+
+        :param str start:  The start directory.
+        """
+        table = self.table
+        if start != self._start or table.generation != self._generation or len(table) < self._count:
+            self.invalidate()
+            self._start = start
+            self._generation = table.generation
+
+        count = len(table)
+        if count == self._count:
+            return
+
+        def key(i):
+            return self._key(table[i])
+
+        # Insert a few paths with a binary search; merge many paths with a sort over the two sorted runs.
+        added = sorted(range(self._count, count), key=key)
+        order = self._order
+        if len(added) * max(1, len(order)).bit_length() < len(order):
+            for i in added:
+                k = key(i)
+                lo, hi = 0, len(order)
+                while lo < hi:
+                    mid = (lo + hi) // 2
+                    if k < key(order[mid]):
+                        hi = mid
+                    else:
+                        lo = mid + 1
+                order.insert(lo, i)
+        else:
+            self._order = array.array('l', sorted(itertools.chain(order, added), key=key))
+
+        for parent in set(table.entry(i)[0] for i in range(self._count, count)):
+            self._directories.add(os.path.relpath(os.path.dirname(table.prefix(parent)) or os.curdir, start))
+        self._count = count
+
+    def files(self, start):
+        """
+        Returns the sorted paths relative to a start directory.
+
+        :param str start:  The start directory.
+        :return:  A generator of relative paths.
+        """
+        self._update(start)
+        return (self._relative(i) for i in self._order)
+
+    def _relative(self, i):
+        """
+        Returns the path of an entry relative to the start directory.
+
+        :param int i:  The index of the entry.
+        """
+        parent, name = self.table.entry(i)
+        prefix = self._relative_prefix(parent)
+        return name if prefix == os.curdir else os.path.join(prefix, name)
+
+    def directories(self, start):
+        """
+        Returns the distinct directories of the paths relative to a start directory.
+
+        :param str start:  The start directory.
+        :return:  A set of relative directories.
+        """
+        self._update(start)
+        return set(self._directories)
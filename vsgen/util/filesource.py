@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""
+This module provides all functionality for resolving the candidate files of a project from sources other than a live directory walk.
+
+Each source produces the same ``(root, dirnames, filenames)`` triplets as :func:`os.walk` so that the project's filters are applied identically regardless of where the candidate files come from.
+"""
+
+import io
+import os
+
+from vsgen.util.logger import VSGLogger
+
+
+def walk_paths(rootpath, paths):
+    """
+    Walks a collection of file paths as if they were read from the file system with :func:`os.walk`.
+
+    As with a top-down :func:`os.walk`, the caller may modify the ``dirnames`` list in-place to prune the directories that are visited.  Since a directory's triplet lists all of its subdirectories, the paths are first collected into a tree: the whole collection is consumed and held in memory before the first triplet is yielded.
+
+    :param str rootpath:  The absolute path to the root directory.
+    :param list paths:    A collection of file paths relative to ``rootpath``.
+    :return:  A generator of ``(root, dirnames, filenames)`` triplets.
+    """
+    tree = {}
+    for path in paths:
+        parts = os.path.normpath(path).split(os.sep)
+        node = tree
+        for part in parts[:-1]:
+            node = node.setdefault(part, {})
+        node.setdefault(None, []).append(parts[-1])
+
+    def walk(root, node):
+        dirnames = sorted(k for k in node if k is not None)
+        filenames = node.get(None, [])
+        yield root, dirnames, filenames
+        for dirname in dirnames:
+            if dirname in node:
+                for entry in walk(os.path.join(root, dirname), node[dirname]):
+                    yield entry
+
+    return walk(rootpath, tree)
+
+
+def git_files(rootpath):
+    """
+    Returns the files recorded in the git index under a directory.
+
+    :param str rootpath:  The absolute path to a directory inside a git working tree.
+    :return:  A list of file paths relative to ``rootpath``.
+    """
+    import subprocess
+
+    # Git's warnings are kept out of the listing and only reported if the command fails.
+    try:
+        process = subprocess.Popen(['git', 'ls-files', '-z', '--cached', '--stage'], cwd=rootpath, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        output, errors = process.communicate()
+    except OSError as e:
+        raise ValueError('Could not read the git index of "{}": {}'.format(rootpath, e))
+    if process.returncode != 0:
+        raise ValueError('Could not read the git index of "{}": {}'.format(rootpath, errors.decode('utf-8', 'replace').strip() or 'git exited with status {}'.format(process.returncode)))
+
+    # Each entry is "<mode> <object> <stage>\t<path>"; submodules (gitlinks) are not files and
+    # unmerged paths are listed once per stage.
+    paths = []
+    for entry in output.decode('utf-8').split('\0'):
+        if entry:
+            info, path = entry.split('\t', 1)
+            if not info.startswith('160000') and (not paths or paths[-1] != path):
+                paths.append(path)
+    return paths
+
+
+def git_index(rootpath):
+    """
+    Returns the index file of the git working tree containing a directory.
+
+    :param str rootpath:  The absolute path to a directory inside a git working tree.
+    :return:  The path to the index file, or to the ``.git`` file of a linked working tree; None if the directory is not in a working tree.
+    """
+    path = os.path.abspath(rootpath)
+    while True:
+        git = os.path.join(path, '.git')
+        if os.path.isdir(git):
+            return os.path.join(git, 'index')
+        if os.path.isfile(git):
+            return git
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
+
+
+def git_walk(rootpath):
+    """
+    Walks the files recorded in the git index under a directory as if they were read with :func:`os.walk`.
+
+    :param str rootpath:  The absolute path to a directory inside a git working tree.
+    :return:  A generator of ``(root, dirnames, filenames)`` triplets.
+    """
+    return walk_paths(rootpath, git_files(rootpath))
+
+
+def manifest_files(rootpath, manifest):
+    """
+    Reads the files listed in a manifest that are under a directory.
+
+    The manifest is either a text file with one path per line, such as the output of ``find``, or a tar or zip archive whose file members are used.  Relative paths are relative to ``rootpath``; absolute paths outside of ``rootpath`` and directory entries are skipped.  A text manifest is read line by line, but :func:`manifest_walk` collects all of its paths before walking them.
+
+    :param str rootpath:  The absolute path to the root directory.
+    :param str manifest:  The path to the manifest file or archive.
+    :return:  A generator of file paths relative to ``rootpath``.
+    """
+    import tarfile
+    import zipfile
+    if not os.path.isfile(manifest):
+        raise ValueError('Could not read the file manifest "{}": the file does not exist.'.format(manifest))
+    if tarfile.is_tarfile(manifest):
+        with tarfile.open(manifest) as archive:
+            names = [m.name for m in archive.getmembers() if m.isfile()]
+    elif zipfile.is_zipfile(manifest):
+        with zipfile.ZipFile(manifest) as archive:
+            names = [n for n in archive.namelist() if not n.endswith('/')]
+    else:
+        names = None
+
+    def paths(lines):
+        for line in lines:
+            path = line.rstrip('\r\n')
+            if not path or path.endswith(('/', os.sep)):
+                continue
+            if os.path.isabs(path):
+                path = os.path.relpath(path, rootpath)
+            path = os.path.normpath(path)
+            if path != os.pardir and not path.startswith(os.pardir + os.sep):
+                yield path
+
+    if names is not None:
+        for path in paths(names):
+            yield path
+        return
+
+    try:
+        with io.open(manifest, 'rt', encoding='utf-8') as f:
+            for path in paths(f):
+                yield path
+    except (IOError, OSError) as e:
+        raise ValueError('Could not read the file manifest "{}": {}'.format(manifest, e))
+
+
+def manifest_walk(rootpath, manifest):
+    """
+    Walks the files listed in a manifest as if they were read with :func:`os.walk`.
+
+    The listed paths are held in memory for the walk; see :func:`walk_paths`.
+
+    :param str rootpath:  The absolute path to the root directory.
+    :param str manifest:  The path to the manifest file or archive.
+    :return:  A generator of ``(root, dirnames, filenames)`` triplets.
+    """
+    return walk_paths(rootpath, manifest_files(rootpath, manifest))
+
+
+def link_walk(rootpath, aliases=None):
+    """
+    Walks a directory with :func:`os.walk`, following symbolic links to directories.
+
+    Each physical directory, identified by its ``(st_dev, st_ino)`` pair, is visited once: a directory reached again through another path is an alias and is pruned, which also breaks symbolic link cycles.  Within a directory, real subdirectories are visited before symbolic links so that the physical path is preferred.
+
+    As with a top-down :func:`os.walk`, the caller may modify the ``dirnames`` list in-place to prune the directories that are visited; a pruned directory does not claim its identity.
+
+    :param str rootpath:  The absolute path to the root directory.
+    :param list aliases:  An optional list that receives an ``(alias, path)`` tuple for each skipped alias and the path of the directory it refers to.
+    :return:  A generator of ``(root, dirnames, filenames)`` triplets.
+    """
+    def identity(path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_dev, st.st_ino
+
+    visited = {}
+    key = identity(rootpath)
+    if key is not None:
+        visited[key] = rootpath
+
+    for root, dirnames, filenames in os.walk(rootpath, followlinks=True):
+        yield root, dirnames, filenames
+
+        allowed = []
+        for dirname in sorted(dirnames, key=lambda d: os.path.islink(os.path.join(root, d))):
+            path = os.path.join(root, dirname)
+            key = identity(path)
+            if key is None:
+                continue
+            if key in visited:
+                VSGLogger.info(__name__, 'Skipping "%s"; it is an alias of "%s".', path, visited[key])
+                if aliases is not None:
+                    aliases.append((path, visited[key]))
+                continue
+            visited[key] = path
+            allowed.append(dirname)
+        dirnames[:] = [d for d in dirnames if d in allowed]
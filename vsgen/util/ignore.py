@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""
+This module provides all functionality for reading ``.vsgenignore`` files.
+
+The module defines the class VSGIgnoreFile.  A ``.vsgenignore`` file uses the same pattern format as a ``.gitignore`` file and applies to the directory it is in and all of its subdirectories; the rules of a file in a subdirectory take precedence over the rules of the files in its parents.
+"""
+
+import os
+import re
+import threading
+
+IGNORE_FILENAME = '.vsgenignore'
+
+
+class VSGIgnoreFile(object):
+    """
+    The VSGIgnoreFile class compiles the rules of a single ``.vsgenignore`` file into regular expressions.
+    """
+    _cache = {}
+    _cache_lock = threading.Lock()
+
+    def __init__(self, lines):
+        """
+        Constructor.
+
+        :param list lines:  The lines of the ignore file.
+        """
+        self._rules = [r for r in (self._compile(line) for line in lines) if r]
+
+    @classmethod
+    def from_file(cls, filename):
+        """
+        Creates a VSGIgnoreFile from a file; the compiled rules are cached until the file is modified.
+
+        :param str filename:  The absolute path to the ignore file.
+        :return:  A VSGIgnoreFile instance.
+        """
+        mtime = os.path.getmtime(filename)
+        with cls._cache_lock:
+            cached = cls._cache.get(filename)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        with open(filename, 'rt') as f:
+            ignore = cls(f.read().splitlines())
+        with cls._cache_lock:
+            cls._cache[filename] = (mtime, ignore)
+        return ignore
+
+    @staticmethod
+    def _compile(line):
+        """
+        Compiles a single pattern line into a ``(regex, negate, directory_only)`` rule.
+
+        :param str line:  The pattern line.
+        :return:  The rule or None if the line is blank or a comment.
+        """
+        # Trailing spaces are ignored unless they are escaped.
+        stripped = line.rstrip()
+        if stripped.endswith('\\') and len(line) > len(stripped):
+            stripped += ' '
+        line = stripped
+        if not line or line.startswith('#'):
+            return None
+
+        negate = line.startswith('!')
+        if negate:
+            line = line[1:]
+        elif line.startswith('\\!') or line.startswith('\\#'):
+            line = line[1:]
+
+        directory_only = line.endswith('/')
+        line = line.rstrip('/')
+        if not line:
+            return None
+
+        # A pattern with a separator is relative to the ignore file's directory; otherwise it matches at any depth.
+        anchored = '/' in line
+        line = line.lstrip('/')
+
+        regex = '' if anchored else '(?:.*/)?'
+        i, n = 0, len(line)
+        while i < n:
+            c = line[i]
+            if line.startswith('**/', i) and (i == 0 or line[i - 1] == '/'):
+                regex += '(?:.*/)?'
+                i += 3
+                continue
+            if line.startswith('**', i) and i + 2 == n and (i == 0 or line[i - 1] == '/'):
+                regex += '.*'
+                i += 2
+                continue
+            if c == '*':
+                regex += '[^/]*'
+            elif c == '?':
+                regex += '[^/]'
+            elif c == '\\' and i + 1 < n:
+                i += 1
+                regex += re.escape(line[i])
+            elif c == '[':
+                start = i + 2 if line[i + 1:i + 2] in ('!', '^') else i + 1
+                j = line.find(']', start + 1)
+                if j < 0:
+                    regex += re.escape(c)
+                else:
+                    chars = line[i + 1:j]
+                    if chars[0] in '!^':
+                        chars = '^' + chars[1:]
+                    regex += '[' + chars.replace('\\', '\\\\') + ']'
+                    i = j
+            else:
+                regex += re.escape(c)
+            i += 1
+
+        return re.compile(regex + r'\Z'), negate, directory_only
+
+    def match(self, path, isdir):
+        """
+        Matches a path against the rules; the last matching rule wins.
+
+        :param str path:    The '/' separated path relative to the ignore file's directory.
+        :param bool isdir:  Flag denoting the path is a directory.
+        :return:  True if the path is ignored, False if it is explicitly re-included and None if no rule matches.
+        """
+        result = None
+        for regex, negate, directory_only in self._rules:
+            if (isdir or not directory_only) and regex.match(path):
+                result = not negate
+        return result
+
+
+def ignore_walk(walker):
+    """
+    Applies the ``.vsgenignore`` files found during a top-down walk.
+
+    Ignored directories are pruned so they are never visited and ignored files are removed from the ``filenames``.
+
+    :param walker:  A generator of ``(root, dirnames, filenames)`` triplets compatible with :func:`os.walk`.
+    :return:  A generator of ``(root, dirnames, filenames)`` triplets.
+    """
+    stacks = {}
+    for root, dirnames, filenames in walker:
+        stack = stacks.pop(root, [])
+        if IGNORE_FILENAME in filenames:
+            stack = stack + [(root, VSGIgnoreFile.from_file(os.path.join(root, IGNORE_FILENAME)))]
+
+        if stack:
+            # Resolve the root's path relative to each ignore file once per directory.
+            prefixes = []
+            for base, ignore in stack:
+                prefix = os.path.relpath(root, base)
+                prefixes.append(('' if prefix == os.curdir else prefix.replace(os.sep, '/') + '/', ignore))
+
+            def ignored(name, isdir):
+                result = False
+                for prefix, ignore in prefixes:
+                    match = ignore.match(prefix + name, isdir)
+                    if match is not None:
+                        result = match
+                return result
+
+            dirnames[:] = [d for d in dirnames if not ignored(d, True)]
+            filenames = [f for f in filenames if not ignored(f, False)]
+
+        yield root, dirnames, filenames
+
+        if stack:
+            for d in dirnames:
+                stacks[os.path.join(root, d)] = stack
@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+"""
+This module provides all functionality for keeping the projects' files in a persistent SQLite index.
+
+The module defines the classes VSGFileIndex and VSGIndexedFiles.  The VSGFileIndex class stores the scanned files of any number of projects, with their kind and the root path they were found under, in a SQLite database; the VSGIndexedFiles class presents the files of one kind of one project as a collection that queries the index, so a project's files are never held in memory.
+"""
+
+import os
+import sqlite3
+import threading
+
+from vsgen.util.filelist import normalize
+
+
+class VSGFileIndex(object):
+    """
+    The VSGFileIndex class stores the files of projects in a SQLite database.
+
+    Updates only write the rows that changed, so an index that is kept between runs (or between rescans) only touches the files that were added or removed.  Each database file is opened once per process; use :meth:`open` to share the connection.
+    """
+    BATCH = 1000
+
+    _indexes = {}
+    _indexes_lock = threading.Lock()
+
+    def __init__(self, filename):
+        """
+        Constructor.
+
+        :param str filename:  The path to the database file; ``:memory:`` creates a temporary index.
+        """
+        self.filename = filename
+        self._lock = threading.RLock()
+        self._connection = sqlite3.connect(filename, check_same_thread=False)
+        with self._connection:
+            self._connection.execute('CREATE TABLE IF NOT EXISTS files (project TEXT NOT NULL, kind TEXT NOT NULL, key TEXT NOT NULL, sortkey TEXT NOT NULL, path TEXT NOT NULL, root TEXT NOT NULL, PRIMARY KEY (project, kind, key))')
+            self._connection.execute('CREATE INDEX IF NOT EXISTS files_order ON files (project, kind, sortkey, key)')
+            self._connection.execute('CREATE INDEX IF NOT EXISTS files_root ON files (project, root)')
+
+    @classmethod
+    def open(cls, filename):
+        """
+        Returns the index of a database file, opening it if needed.
+
+        :param str filename:  The path to the database file.
+        :return:  A VSGFileIndex instance.
+        """
+        key = os.path.normcase(os.path.abspath(filename))
+        with cls._indexes_lock:
+            index = cls._indexes.get(key)
+            if index is None:
+                index = cls._indexes[key] = cls(filename)
+            return index
+
+    @classmethod
+    def close_all(cls):
+        """
+        Closes all indexes opened with :meth:`open`.
+        """
+        with cls._indexes_lock:
+            indexes, cls._indexes = list(cls._indexes.values()), {}
+        for index in indexes:
+            index.close()
+
+    def close(self):
+        """
+        Closes the database connection.
+        """
+        with self._lock:
+            self._connection.close()
+
+    @staticmethod
+    def _row(project, kind, path, root):
+        """
+        Returns the row of a file.
+        """
+        return project, kind, normalize(path), path.lower(), path, root
+
+    def update(self, project, root, items):
+        """
+        Replaces the files a project found under a root path, writing only the rows that changed.
+
+        :param str project:  The identifier of the project.
+        :param str root:     The root path the files were found under; an empty value denotes the files that were added explicitly.
+        :param items:        An iterable of ``(kind, path)`` tuples; it is consumed in batches and never held in memory.
+        :return:  The number of rows inserted or deleted.
+        """
+        with self._lock:
+            connection = self._connection
+            with connection:
+                connection.execute('CREATE TEMP TABLE IF NOT EXISTS scan (kind TEXT NOT NULL, key TEXT NOT NULL, sortkey TEXT NOT NULL, path TEXT NOT NULL, PRIMARY KEY (kind, key))')
+                connection.execute('DELETE FROM scan')
+                batch = []
+                for kind, path in items:
+                    batch.append(self._row(project, kind, path, root)[1:5])
+                    if len(batch) >= self.BATCH:
+                        connection.executemany('INSERT OR IGNORE INTO scan VALUES (?, ?, ?, ?)', batch)
+                        batch = []
+                connection.executemany('INSERT OR IGNORE INTO scan VALUES (?, ?, ?, ?)', batch)
+
+                # Only the rows that differ from the scan are deleted or inserted.
+                changes = connection.total_changes
+                connection.execute('DELETE FROM files WHERE project = ? AND root = ? AND NOT EXISTS (SELECT 1 FROM scan WHERE scan.kind = files.kind AND scan.key = files.key)', (project, root))
+                connection.execute('INSERT OR IGNORE INTO files SELECT ?, kind, key, sortkey, path, ? FROM scan', (project, root))
+                changes = connection.total_changes - changes
+                connection.execute('DELETE FROM scan')
+            return changes
+
+    def prune(self, project, roots):
+        """
+        Removes the files a project found under root paths it no longer inserts.
+
+        :param str project:  The identifier of the project.
+        :param list roots:   The root paths to keep; the explicit files are always kept.
+        :return:  The number of rows deleted.
+        """
+        roots = [''] + list(roots)
+        with self._lock:
+            with self._connection:
+                cursor = self._connection.execute('DELETE FROM files WHERE project = ? AND root NOT IN ({})'.format(', '.join('?' * len(roots))), [project] + roots)
+            return cursor.rowcount
+
+    def add(self, project, kind, paths):
+        """
+        Adds files to a project without removing any.
+
+        :param str project:  The identifier of the project.
+        :param str kind:     The kind of the files.
+        :param paths:        An iterable of paths.
+        :return:  The number of files added.
+        """
+        with self._lock:
+            with self._connection:
+                cursor = self._connection.executemany('INSERT OR IGNORE INTO files VALUES (?, ?, ?, ?, ?, ?)', (self._row(project, kind, p, '') for p in paths))
+            return cursor.rowcount
+
+    def count(self, project, kind):
+        """
+        Returns the number of files of a kind in a project.
+
+        :param str project:  The identifier of the project.
+        :param str kind:     The kind of the files.
+        """
+        with self._lock:
+            return self._connection.execute('SELECT COUNT(*) FROM files WHERE project = ? AND kind = ?', (project, kind)).fetchone()[0]
+
+    def contains(self, project, kind, path):
+        """
+        Returns True if a project contains a file of a kind.
+
+        :param str project:  The identifier of the project.
+        :param str kind:     The kind of the file.
+        :param str path:     The path of the file.
+        """
+        with self._lock:
+            return self._connection.execute('SELECT 1 FROM files WHERE project = ? AND kind = ? AND key = ?', (project, kind, normalize(path))).fetchone() is not None
+
+    def files(self, project, kind):
+        """
+        Iterates over the files of a kind in a project, sorted case insensitively.
+
+        The files are queried in batches, so the index may be updated while the files are iterated.
+
+        :param str project:  The identifier of the project.
+        :param str kind:     The kind of the files.
+        :return:  A generator of paths.
+        """
+        sortkey, key = '', ''
+        while True:
+            with self._lock:
+                rows = self._connection.execute('SELECT sortkey, key, path FROM files WHERE project = ? AND kind = ? AND (sortkey > ? OR (sortkey = ? AND key > ?)) ORDER BY sortkey, key LIMIT ?', (project, kind, sortkey, sortkey, key, self.BATCH)).fetchall()
+            for sortkey, key, path in rows:
+                yield path
+            if len(rows) < self.BATCH:
+                return
+
+
+class VSGIndexedFiles(object):
+    """
+    The VSGIndexedFiles class presents the files of one kind of a project stored in a :class:`VSGFileIndex` as a collection.
+
+    :ivar VSGFileIndex index:  The index of the files.
+    :ivar str project:         The identifier of the project.
+    :ivar str kind:            The kind of the files (e.g. ``compile`` or ``content``).
+    """
+
+    def __init__(self, index, project, kind):
+        """
+        Constructor.
+
+        :param VSGFileIndex index:  The index of the files.
+        :param str project:         The identifier of the project.
+        :param str kind:            The kind of the files.
+        """
+        self.index = index
+        self.project = project
+        self.kind = kind
+
+    def __iter__(self):
+        return self.index.files(self.project, self.kind)
+
+    def __len__(self):
+        return self.index.count(self.project, self.kind)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    __nonzero__ = __bool__
+
+    def __contains__(self, path):
+        return self.index.contains(self.project, self.kind, path)
+
+    def __repr__(self):
+        return 'VSGIndexedFiles({!r}, {!r}, {!r})'.format(self.index.filename, self.project, self.kind)
+
+    def append(self, path):
+        """
+        Adds a file unless the collection already contains it.
+
+        :param str path:  The path.
+        :return:  True if the path was added; False if it is a duplicate.
+        """
+        return self.extend([path]) == 1
+
+    def extend(self, paths):
+        """
+        Adds the files of a collection that the collection does not already contain.
+
+        :param list paths:  The paths.
+        :return:  The number of paths added.
+        """
+        return self.index.add(self.project, self.kind, paths)
@@ -187,6 +187,18 @@ class VSGLogger(object):
         """
         cls.getLogger(name).exception(message, *args)
 
+    @classmethod
+    def replay(cls, records):
+        """
+        Logs records recorded by a :class:`VSGLogRecorder`, for example in another process.
+
+        :param list records:  The :class:`~logging.LogRecord` instances.
+        """
+        for record in records:
+            logger = logging.getLogger(record.name)
+            if logger.isEnabledFor(record.levelno):
+                logger.handle(record)
+
     def close(self):
         """
         Closes and unregisters all logging handlers.
@@ -195,6 +207,51 @@ class VSGLogger(object):
             self._unregisterHandler(self._handlers[0])
 
 
+class VSGLogRecorder(logging.Handler):
+    """
+    The VSGLogRecorder class records the messages of the VSG loggers instead of emitting them, so they can be sent to another process and replayed with :meth:`VSGLogger.replay`.
+    """
+
+    def __init__(self):
+        """
+        Constructor.
+        """
+        logging.Handler.__init__(self)
+        self.records = []
+        self._handlers = []
+
+    def __enter__(self):
+        """
+        Enter the runtime context related to this object; the recorder replaces the handlers of the VSG root logger.
+        """
+        logger = VSGLogger.getLogger(None)
+        self._handlers = logger.handlers[:]
+        for handler in self._handlers:
+            logger.removeHandler(handler)
+        logger.addHandler(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        """
+        Exit the runtime context related to this object; the original handlers are restored.
+        """
+        logger = VSGLogger.getLogger(None)
+        logger.removeHandler(self)
+        for handler in self._handlers:
+            logger.addHandler(handler)
+        return False
+
+    def emit(self, record):
+        """
+        Records a message, merging its arguments so the record can be pickled.
+        """
+        record.msg = self.format(record) if record.exc_info else record.getMessage()
+        record.args = None
+        record.exc_info = None
+        record.exc_text = None
+        self.records.append(record)
+
+
 if __name__ == "__main__":
 
     logfile = os.path.join(os.path.dirname(__file__), 'log.txt')
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+This module provides all functionality for consuming items while they are produced.
+
+The module defines the class VSGPipeline.  The VSGPipeline class passes the items of any number of producer threads to a pool of consumer threads through a bounded queue; a producer that gets ahead of the consumers blocks until the queue has room, so at most a bounded number of produced items wait to be consumed.
+"""
+
+import threading
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+
+class VSGPipeline(object):
+    """
+    The VSGPipeline class consumes items in a pool of threads while they are produced.
+
+    :ivar list consumed:  The items that were consumed successfully, in the order they were consumed.
+    :ivar list failures:  The ``(item, exception)`` pairs of the items whose consumption failed.
+    """
+
+    def __init__(self, consumer, workers=1, size=0):
+        """
+        Constructor.
+
+        :param callable consumer:  The function called with each item.
+        :param int workers:        The number of consumer threads.
+        :param int size:           The maximum number of items waiting to be consumed; 0 uses twice the number of workers.
+        """
+        self._consumer = consumer
+        self._queue = queue.Queue(size or 2 * max(workers, 1))
+        self._lock = threading.Lock()
+        self.consumed = []
+        self.failures = []
+        self._workers = [threading.Thread(target=self._work) for _ in range(max(workers, 1))]
+        for w in self._workers:
+            w.daemon = True
+            w.start()
+
+    def __enter__(self):
+        """
+        Enter the runtime context related to this object.
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        """
+        Exit the runtime context related to this object; waits for the items put so far to be consumed.
+        """
+        self.close()
+        return False
+
+    def _work(self):
+        """
+        The consumer threads' execution function.
+        """
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            try:
+                self._consumer(item)
+            except Exception as e:
+                with self._lock:
+                    self.failures.append((item, e))
+            else:
+                with self._lock:
+                    self.consumed.append(item)
+
+    def put(self, item):
+        """
+        Queues an item for consumption, blocking while the queue is full.
+
+        :param item:  The item; it must not be None.
+        """
+        self._queue.put(item)
+
+    def close(self):
+        """
+        Waits for the queued items to be consumed and stops the consumer threads.
+
+        :return:  The list of ``(item, exception)`` pairs of the items whose consumption failed.
+        """
+        workers, self._workers = self._workers, []
+        for w in workers:
+            self._queue.put(None)
+        for w in workers:
+            w.join()
+        return self.failures
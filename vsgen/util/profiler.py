@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+"""
+This module provides all functionality for profiling the scans of the projects' root paths.
+
+The module defines the classes VSGScanProfile and VSGScanProfiler.  When enabled, the VSGScanProfiler collects a VSGScanProfile for each project that records the directories visited, the files examined, how often each filter pattern is evaluated and matched and the time spent in each directory; the profiles are reported as text or JSON with the most expensive subtrees and patterns first.
+"""
+
+import os
+import json
+import fnmatch
+import threading
+from timeit import default_timer
+
+
+class VSGScanProfile(object):
+    """
+    The VSGScanProfile class records the scan statistics of a single project.
+
+    :ivar int directories:  The number of directories visited.
+    :ivar int files:        The number of files examined.
+    :ivar dict times:       The time in seconds spent in each directory, excluding its subdirectories.
+    :ivar dict patterns:    The ``[evaluations, matches, seconds]`` of each ``(option, pattern)`` pair.
+    """
+
+    def __init__(self, name):
+        """
+        Constructor.
+
+        :param str name:  The name of the project.
+        """
+        self.name = name
+        self.directories = 0
+        self.files = 0
+        self.times = {}
+        self.patterns = {}
+        self._lock = threading.Lock()
+
+    def walk(self, walker):
+        """
+        Times a walk, attributing the time to produce each ``(root, dirnames, filenames)`` triplet to its root.
+
+        :param walker:  A generator of ``(root, dirnames, filenames)`` triplets.
+        :return:  A generator of the same triplets.
+        """
+        walker = iter(walker)
+        while True:
+            start = default_timer()
+            try:
+                root, dirnames, filenames = next(walker)
+            except StopIteration:
+                return
+            self.record(root, default_timer() - start, 0)
+            yield root, dirnames, filenames
+
+    def filter(self):
+        """
+        Creates a filter function that evaluates each pattern separately so its cost and matches are recorded.
+
+        The function short-circuits the same way as the project's own filter, so the recorded evaluations are the evaluations of an unprofiled scan.  The patterns are recorded under the name of the option passed along with them.
+
+        :return:  A function with the signature ``filter(text, filters, explicit, option)``.
+        """
+        def filter(text, filters, explicit, option):
+            if not filters:
+                return not explicit
+            updates = []
+            result = False
+            for f in filters:
+                start = default_timer()
+                result = fnmatch.fnmatch(text, f)
+                updates.append(((option, f), result, default_timer() - start))
+                if result:
+                    break
+            with self._lock:
+                for key, matched, seconds in updates:
+                    stats = self.patterns.setdefault(key, [0, 0, 0.0])
+                    stats[0] += 1
+                    stats[1] += int(matched)
+                    stats[2] += seconds
+            return result
+
+        return filter
+
+    def record(self, root, seconds, files):
+        """
+        Records time spent and files examined in a directory.
+
+        :param str root:        The directory.
+        :param float seconds:   The time in seconds.
+        :param int files:       The number of files examined.
+        """
+        with self._lock:
+            if root not in self.times:
+                self.times[root] = 0.0
+                self.directories += 1
+            self.times[root] += seconds
+            self.files += files
+
+    def subtrees(self):
+        """
+        Returns the time spent in each directory including its subdirectories.
+
+        :return:  A dictionary of times in seconds keyed by directory.
+        """
+        with self._lock:
+            times = dict(self.times)
+        totals = dict(times)
+        for root, seconds in times.items():
+            parent = os.path.dirname(root)
+            while parent in times and parent != root:
+                totals[parent] += seconds
+                root, parent = parent, os.path.dirname(parent)
+        return totals
+
+    def summary(self, limit=None):
+        """
+        Returns the profile as a dictionary with the subtrees and patterns ranked by time.
+
+        :param int limit:  The maximum number of subtrees and patterns to include; all are included if None.
+        """
+        subtrees = sorted(self.subtrees().items(), key=lambda x: (-x[1], x[0]))
+        with self._lock:
+            patterns = sorted(self.patterns.items(), key=lambda x: (-x[1][2], x[0]))
+        return {
+            'project': self.name,
+            'directories': self.directories,
+            'files': self.files,
+            'seconds': sum(self.times.values()),
+            'subtrees': [{'directory': d, 'seconds': t} for d, t in subtrees[:limit]],
+            'patterns': [{'option': k[0], 'pattern': k[1], 'evaluations': v[0], 'matches': v[1], 'seconds': v[2]} for k, v in patterns[:limit]]
+        }
+
+
+class VSGScanProfiler(object):
+    """
+    The VSGScanProfiler class collects the scan profiles of all projects in the process; it is disabled by default.
+
+    :cvar bool enabled:  Flag denoting profiles are collected.
+    """
+    enabled = False
+
+    _profiles = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def enable(cls):
+        """
+        Discards any collected profiles and starts collecting profiles.
+        """
+        with cls._lock:
+            cls._profiles = {}
+            cls.enabled = True
+
+    @classmethod
+    def disable(cls):
+        """
+        Stops collecting profiles; the collected profiles are kept.
+        """
+        cls.enabled = False
+
+    @classmethod
+    def profile(cls, name):
+        """
+        Returns the profile of a project, creating it if needed.
+
+        :param str name:  The name of the project.
+        :return:  A VSGScanProfile instance.
+        """
+        with cls._lock:
+            profile = cls._profiles.get(name)
+            if profile is None:
+                profile = cls._profiles[name] = VSGScanProfile(name)
+            return profile
+
+    @classmethod
+    def export(cls):
+        """
+        Exports the collected profiles so they can be sent to another process and merged with :meth:`merge`.
+
+        :return:  A list of ``(name, directories, files, times, patterns)`` tuples.
+        """
+        with cls._lock:
+            profiles = list(cls._profiles.values())
+        return [(p.name, p.directories, p.files, dict(p.times), dict(p.patterns)) for p in profiles]
+
+    @classmethod
+    def merge(cls, profiles):
+        """
+        Merges exported profiles into the collected profiles.
+
+        :param list profiles:  The profiles returned by :meth:`export`.
+        """
+        for name, directories, files, times, patterns in profiles:
+            profile = cls.profile(name)
+            with profile._lock:
+                profile.directories += sum(1 for root in times if root not in profile.times)
+                profile.files += files
+                for root, seconds in times.items():
+                    profile.times[root] = profile.times.get(root, 0.0) + seconds
+                for key, stats in patterns.items():
+                    profile.patterns[key] = [a + b for a, b in zip(profile.patterns.get(key, [0, 0, 0.0]), stats)]
+
+    @classmethod
+    def report(cls, format='text', limit=20):
+        """
+        Reports the collected profiles, most expensive project first.
+
+        :param str format:  The format of the report; either ``text`` or ``json``.
+        :param int limit:   The maximum number of subtrees and patterns reported per project; all are reported if None.
+        :return:  The report.
+        """
+        with cls._lock:
+            profiles = list(cls._profiles.values())
+        summaries = sorted((p.summary(limit) for p in profiles), key=lambda s: (-s['seconds'], s['project']))
+
+        if format == 'json':
+            return json.dumps(summaries, indent=2, sort_keys=True)
+        if format != 'text':
+            raise ValueError('Unknown report format "{}"; expected one of "text" or "json".'.format(format))
+
+        lines = []
+        for s in summaries:
+            lines.append('Project {project}: {directories} directories, {files} files, {seconds:.3f}s'.format(**s))
+            lines.append('  Subtrees:')
+            lines.extend('    {seconds:10.3f}s  {directory}'.format(**t) for t in s['subtrees'])
+            lines.append('  Patterns:')
+            lines.extend('    {seconds:10.3f}s  {evaluations:8d} evaluated  {matches:8d} matched  {option} {pattern}'.format(**p) for p in s['patterns'])
+        return '\n'.join(lines) + '\n'
+
+    @classmethod
+    def write(cls, filename, format='text', limit=20):
+        """
+        Writes the report to a file.
+
+        :param str filename:  The path of the report file.
+        :param str format:    The format of the report; either ``text`` or ``json``.
+        :param int limit:     The maximum number of subtrees and patterns reported per project; all are reported if None.
+        """
+        report = cls.report(format, limit)
+        with open(filename, 'wt') as f:
+            f.write(report)
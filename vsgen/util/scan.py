@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+"""
+This module provides all functionality for sharing directory scans between projects.
+
+The module defines the class VSGScanService.  The VSGScanService walks each root path referenced by several projects once and replays the recorded listing to every project that inserts files from it, so that each project applies its own filters to a shared listing.
+
+A shared listing records the whole walk, including the directories a project's ``directory_ex_filter`` prunes, so only the root paths that are expected to be walked more than once by the same source are shared; every other root path is walked, and pruned, by its project alone.  A shared listing is released once the last expected walk of its source and root path starts.  The expected walks may be declared for the whole command, e.g. for the suites of several configuration files, in which case :meth:`VSGScanService.clear` releases any listing left once the command is done.
+"""
+
+import os
+import threading
+
+from vsgen.util.logger import VSGLogger
+
+
+def scan_source(file_source='walk', file_manifest='', follow_links=False):
+    """
+    Returns the name of the source of a project's listing.
+
+    :param str file_source:    The project's file source, ``walk`` or ``git``.
+    :param str file_manifest:  The path to the project's manifest, if any.
+    :param bool follow_links:  Flag to follow symbolic links to directories when walking the file system.
+    :return:  The name of the source; the walks of a root path are only shared between projects with the same source.
+    """
+    if file_manifest:
+        return 'manifest:' + os.path.normpath(file_manifest)
+    if file_source == 'walk' and follow_links:
+        return 'walk+links'
+    return file_source
+
+
+class VSGScanListing(object):
+    """
+    The VSGScanListing class records the ``(root, dirnames, filenames)`` triplets of a walk as they are produced so they can be replayed any number of times.
+    """
+
+    def __init__(self, walker):
+        """
+        Constructor.
+
+        :param walker:  A generator of ``(root, dirnames, filenames)`` triplets compatible with a top-down :func:`os.walk`.
+        """
+        self._walker = walker
+        self._entries = []
+        self._error = None
+        self._lock = threading.Lock()
+
+    def _entry(self, index):
+        """
+        Returns the recorded entry at an index, advancing the walk if needed.
+
+        :param int index:  The index of the entry.
+        :return:  The entry or None if the walk finished before the index.
+        """
+        with self._lock:
+            while index >= len(self._entries) and self._walker is not None:
+                try:
+                    root, dirnames, filenames = next(self._walker)
+                except StopIteration:
+                    self._walker = None
+                except Exception as e:
+                    self._walker, self._error = None, e
+                else:
+                    self._entries.append((root, tuple(dirnames), tuple(filenames)))
+            if self._error is not None and index >= len(self._entries):
+                raise self._error
+            return self._entries[index] if index < len(self._entries) else None
+
+    def replay(self):
+        """
+        Replays the listing as if it were walked with :func:`os.walk`.
+
+        As with a top-down :func:`os.walk`, the caller may modify the ``dirnames`` list in-place to prune the directories that are visited.
+
+        :return:  A generator of ``(root, dirnames, filenames)`` triplets.
+        """
+        allowed = None
+        index = 0
+        while True:
+            entry = self._entry(index)
+            if entry is None:
+                return
+            index += 1
+
+            root, dirnames, filenames = entry
+            if allowed is None:
+                allowed = set()
+            elif root in allowed:
+                allowed.remove(root)
+            else:
+                continue
+
+            dirnames = list(dirnames)
+            yield root, dirnames, list(filenames)
+            allowed.update(os.path.join(root, d) for d in dirnames)
+
+
+class VSGScanService(object):
+    """
+    The VSGScanService class shares the listings of root paths between the projects that are expected to walk them.
+
+    :cvar int walks:  The number of root paths walked.
+    :cvar int saved:  The number of walks saved by replaying a shared listing.
+    """
+    walks = 0
+    saved = 0
+
+    _listings = {}
+    _expected = {}
+    _declared = set()
+    _lock = threading.Lock()
+
+    @classmethod
+    def expect(cls, walks):
+        """
+        Declares walks that are about to happen; the listing of a source and root path is only shared if it is expected more than once.
+
+        Each walk is identified by a tag, such as the project that walks it, so declaring the same walk again, even once it is walked, has no effect until :meth:`clear`.
+
+        :param list walks:  The ``(source, rootpath, tag)`` tuples of the expected walks, where source is the name returned by :func:`scan_source`.
+        """
+        with cls._lock:
+            for source, rootpath, tag in walks:
+                key = (source, os.path.normpath(rootpath))
+                if (key, tag) not in cls._declared:
+                    cls._declared.add((key, tag))
+                    cls._expected[key] = cls._expected.get(key, 0) + 1
+
+    @classmethod
+    def walk(cls, source, rootpath, walker):
+        """
+        Returns a walk of a root path, sharing the listing with the other expected walks of the same source and root path.
+
+        :param str source:      The name of the source of the listing.
+        :param str rootpath:    The absolute path to the root directory.
+        :param walker:          A callable returning a generator of ``(root, dirnames, filenames)`` triplets for the root path; it is only called if no listing is shared.
+        :return:  A generator of ``(root, dirnames, filenames)`` triplets.
+        """
+        root = os.path.normpath(rootpath)
+        key = (source, root)
+        with cls._lock:
+            expected = cls._expected.get(key, 0)
+            if expected > 1:
+                cls._expected[key] = expected - 1
+            else:
+                cls._expected.pop(key, None)
+            listing = cls._listings.get(key)
+            if listing is None:
+                cls.walks += 1
+                if expected <= 1:
+                    return walker()
+                listing = cls._listings[key] = VSGScanListing(walker())
+            else:
+                cls.saved += 1
+                if expected <= 1:
+                    del cls._listings[key]
+        return listing.replay()
+
+    @classmethod
+    def invalidate(cls, rootpath):
+        """
+        Discards the listings of any source that contain a path so that the next walk reads the current contents.
+
+        :param str rootpath:  The absolute path of a changed directory or file.
+        """
+        path = os.path.normpath(rootpath)
+        with cls._lock:
+            for key in list(cls._listings):
+                root = key[1]
+                if path == root or path.startswith(root.rstrip(os.sep) + os.sep) or root.startswith(path.rstrip(os.sep) + os.sep):
+                    del cls._listings[key]
+
+    @classmethod
+    def clear(cls):
+        """
+        Discards all listings and expected walks and resets the counters.
+        """
+        with cls._lock:
+            cls._listings = {}
+            cls._expected = {}
+            cls._declared = set()
+            cls.walks = 0
+            cls.saved = 0
+
+    @classmethod
+    def log(cls, logname):
+        """
+        Logs the counters.
+
+        :param str logname:  The python logger log name.
+        """
+        VSGLogger.info(logname, "Walked %s root paths; %s walks saved by sharing listings.", cls.walks, cls.saved)
@@ -0,0 +1,363 @@
+# -*- coding: utf-8 -*-
+"""
+This module provides all functionality for saving a suite's resolved model to a snapshot file and loading it back.
+
+A snapshot file starts with a header describing the inputs the model was built from: the hashes of the configuration files and the modification times of the directories and files whose changes could alter the projects' files.  An input modified after the model started to be built, or so shortly before that its modification time cannot tell, is recorded as changed so the snapshot is never valid for it.  The header is stored as JSON.  The pickled model follows the header, and the :class:`~vsgen.util.filelist.VSGPathTable` instances of the model that may be loaded lazily are stored after it, each on its own.  Loading the model replaces them with :class:`VSGSnapshotTable` placeholders so the file lists are not loaded with the model; each table is only loaded from the memory mapped file the first time it is used, and the file is closed once every table is loaded.
+
+Since unpickling data can run arbitrary code, the file ends with an HMAC of its content keyed by a secret that only the user can read (see :func:`~vsgen.util.cache.secret`); a file whose HMAC does not match is rejected before anything is decoded.
+"""
+
+import io
+import os
+import sys
+import hmac
+import json
+import mmap
+import struct
+import pickle
+import hashlib
+import tempfile
+
+from vsgen.util.cache import secret
+from vsgen.util.filelist import VSGPathTable
+
+MAGIC = b'VSGSNAP\0'
+
+# The version of the snapshot files; increment it when their layout changes.
+VERSION = 4
+
+# The name of the key file of the snapshots' HMAC in the cache directory.
+KEY_FILENAME = 'snapshot.key'
+
+_LENGTH = struct.Struct('<Q')
+
+# The coarsest resolution, in seconds, of the file systems' modification times.
+MTIME_RESOLUTION = 2.0
+
+
+class VSGSnapshotTable(object):
+    """
+    The VSGSnapshotTable class is a placeholder for a :class:`~vsgen.util.filelist.VSGPathTable` that is not loaded from its snapshot file yet.
+    """
+
+    def __init__(self, reader, offset, length):
+        """
+        Constructor.
+
+        :param VSGSnapshotReader reader:  The reader of the snapshot file; it must be open when the table is first loaded.
+        :param int offset:                The offset of the pickled table in the file.
+        :param int length:                The length of the pickled table.
+        """
+        self._reader = reader
+        self._offset = offset
+        self._length = length
+        self._value = None
+
+    def load(self):
+        """
+        Loads the table; later calls return the same table.
+
+        :return:  A :class:`~vsgen.util.filelist.VSGPathTable` instance.
+        """
+        if self._value is None:
+            self._value = pickle.loads(self._reader.read(self._offset, self._length))
+            self._reader.loaded(self)
+        return self._value
+
+    @staticmethod
+    def resolve(value):
+        """
+        Returns a value, loading it first if it is a placeholder.
+
+        :param value:  Any value.
+        """
+        return value.load() if isinstance(value, VSGSnapshotTable) else value
+
+
+class _SnapshotPickler(pickle.Pickler):
+    """
+    Pickles a model, storing a selection of its tables separately.
+    """
+
+    def __init__(self, file, tables, lazy):
+        pickle.Pickler.__init__(self, file, pickle.HIGHEST_PROTOCOL)
+        self._tables = tables
+        self._lazy = dict((id(t), t) for t in lazy if isinstance(t, VSGPathTable))
+        self._ids = {}
+
+    def persistent_id(self, obj):
+        if id(obj) not in self._lazy:
+            return None
+        pid = self._ids.get(id(obj))
+        if pid is None:
+            data = pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
+            pid = self._ids[id(obj)] = ('table', len(self._tables), len(data))
+            self._tables.extend(data)
+        return pid
+
+
+class _SnapshotUnpickler(pickle.Unpickler):
+    """
+    Unpickles a model, replacing its tables with placeholders.
+    """
+
+    def __init__(self, file, reader, base):
+        pickle.Unpickler.__init__(self, file)
+        self._reader = reader
+        self._base = base
+        self.tables = {}
+
+    def persistent_load(self, pid):
+        kind, offset, length = pid
+        if kind != 'table':
+            raise pickle.UnpicklingError('Unknown snapshot object {!r}.'.format(kind))
+        if offset not in self.tables:
+            self.tables[offset] = VSGSnapshotTable(self._reader, self._base + offset, length)
+        return self.tables[offset]
+
+
+def hash_file(filename):
+    """
+    Returns the hash of a file's content.
+
+    :param str filename:  The path to the file.
+    :return:  A hexadecimal digest or None if the file cannot be read.
+    """
+    digest = hashlib.sha1()
+    try:
+        with open(filename, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 16), b''):
+                digest.update(block)
+    except (IOError, OSError):
+        return None
+    return digest.hexdigest()
+
+
+def _mtime(path):
+    """
+    Returns the modification time of a path or None if it does not exist.
+    """
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def _changed(path, since):
+    """
+    Returns whether a path may have been modified after a time.
+
+    :param str path:     The path.
+    :param float since:  The time; None never considers the path modified.
+    """
+    mtime = _mtime(path)
+    return since is not None and mtime is not None and mtime >= since - MTIME_RESOLUTION
+
+
+def tree_state(paths, since=None):
+    """
+    Returns the state of the directories and files a model depends on.
+
+    Adding, removing or renaming a file changes the modification time of its directory, so the state of a scanned tree is the modification time of each of the directories its scan visited and of the ignore files it applied.
+
+    :param list paths:   The directories and files whose modification times are recorded.
+    :param float since:  The time the model started to be built; the paths modified since are recorded as changed.
+    :return:  A dictionary of (Path, Modification Time) pairs; the modification time of a changed path is None.
+    """
+    return dict((os.path.abspath(p), None if _changed(p, since) else _mtime(p)) for p in paths)
+
+
+def make_header(inputs, paths, since=None):
+    """
+    Creates the header of a snapshot.
+
+    :param list inputs:  The configuration files the model was built from.
+    :param list paths:   The directories and files whose changes could alter the model.
+    :param float since:  The time the model started to be built; the inputs and paths modified since are recorded as changed.
+    :return:  A dictionary describing the inputs of the model.
+    """
+    return {
+        'version': VERSION,
+        'python': list(sys.version_info[:2]),
+        'inputs': dict((os.path.abspath(f), None if _changed(f, since) else hash_file(f)) for f in inputs),
+        'state': tree_state(paths, since)
+    }
+
+
+def validate_header(header, inputs=None):
+    """
+    Validates the header of a snapshot against the current inputs.
+
+    :param dict header:  The header of the snapshot.
+    :param list inputs:  The configuration files the model is expected to be built from; None skips the comparison of the files, but not of their content.
+    :return:  The reason the snapshot is stale or None if it is valid.
+    """
+    if header.get('version') != VERSION or header.get('python') != list(sys.version_info[:2]):
+        return 'the snapshot was written by another version'
+    if inputs is not None and set(os.path.abspath(f) for f in inputs) != set(header['inputs']):
+        return 'the configuration files differ'
+    for filename, digest in header['inputs'].items():
+        if digest is None or hash_file(filename) != digest:
+            return '{} changed'.format(filename)
+    for path, mtime in header['state'].items():
+        if _mtime(path) != mtime:
+            return '{} changed'.format(path)
+    return None
+
+
+def write_snapshot(filename, header, model, lazy=()):
+    """
+    Writes a snapshot file atomically.
+
+    :param str filename:  The path to the snapshot file.
+    :param dict header:   The header of the snapshot.
+    :param object model:  The model.
+    :param list lazy:     The tables of the model to load lazily; the model must resolve their :class:`VSGSnapshotTable` placeholders when it uses them.
+    :raises IOError:      If the key of the snapshots' HMAC cannot be read or created.
+    """
+    key = secret(KEY_FILENAME)
+    if key is None:
+        raise IOError('Could not read the key of the snapshot files.')
+
+    stream, tables = io.BytesIO(), bytearray()
+    _SnapshotPickler(stream, tables, lazy).dump(model)
+    header = json.dumps(header, sort_keys=True).encode('utf-8')
+    model = stream.getvalue()
+
+    digest = hmac.new(key, digestmod=hashlib.sha256)
+
+    directory = os.path.dirname(os.path.abspath(filename))
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+    fd, temp = tempfile.mkstemp(prefix=os.path.basename(filename), dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            for chunk in (MAGIC, _LENGTH.pack(len(header)), header, _LENGTH.pack(len(model)), model, tables):
+                f.write(chunk)
+                digest.update(chunk)
+            f.write(digest.digest())
+        if hasattr(os, 'replace'):
+            os.replace(temp, filename)
+        else:
+            if os.path.exists(filename) and sys.platform.startswith('win'):
+                os.remove(filename)
+            os.rename(temp, filename)
+    except Exception:
+        os.remove(temp)
+        raise
+
+
+class VSGSnapshotReader(object):
+    """
+    The VSGSnapshotReader class reads a snapshot file's header and, on request, its model.
+
+    The file's HMAC is checked before its header is decoded.  The file stays memory mapped until every table of the loaded model is loaded or the reader is closed, so the tables can be loaded when first used; the tables that are not loaded yet cannot be loaded once it is closed.  An open reader prevents replacing the file on some platforms.
+
+    :ivar dict header:  The header of the snapshot.
+    :ivar bool closed:  True once the memory mapped file is closed.
+    """
+
+    def __init__(self, filename):
+        """
+        Constructor.
+
+        :param str filename:  The path to the snapshot file.
+        :raises ValueError:   If the file is not a snapshot file or its HMAC does not match.
+        """
+        with open(filename, 'rb') as f:
+            self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._pending = None
+        self.closed = False
+        try:
+            offset = len(MAGIC)
+            if self._buffer[:offset] != MAGIC:
+                raise ValueError('{} is not a vsgen snapshot file.'.format(filename))
+            if not self._verify():
+                raise ValueError('{} was not written by this user or was modified.'.format(filename))
+            header, offset = self._chunk(offset)
+            self.header = json.loads(header.decode('utf-8'))
+            self._model = offset
+        except Exception:
+            self.close()
+            raise
+
+    def __enter__(self):
+        """
+        Enter the runtime context related to this object.
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        """
+        Exit the runtime context related to this object; closes the reader.
+        """
+        self.close()
+        return False
+
+    def close(self):
+        """
+        Closes the memory mapped file.
+        """
+        if not self.closed:
+            self._buffer.close()
+            self.closed = True
+
+    def _verify(self):
+        """
+        Returns whether the HMAC at the end of the file matches its content.
+        """
+        key = secret(KEY_FILENAME)
+        size = hashlib.sha256().digest_size
+        end = len(self._buffer) - size
+        if key is None or end < len(MAGIC):
+            return False
+        digest = hmac.new(key, digestmod=hashlib.sha256)
+        for offset in range(0, end, 1 << 20):
+            digest.update(self._buffer[offset:min(offset + (1 << 20), end)])
+        return hmac.compare_digest(digest.digest(), self._buffer[end:])
+
+    def read(self, offset, length):
+        """
+        Reads a part of the file.
+
+        :param int offset:  The offset of the part.
+        :param int length:  The length of the part.
+        :raises ValueError:  If the reader is closed.
+        """
+        return self._buffer[offset:offset + length]
+
+    def loaded(self, table):
+        """
+        Records that a table is loaded; the reader is closed once every table of the model is loaded.
+
+        :param VSGSnapshotTable table:  The table.
+        """
+        if self._pending is not None:
+            self._pending.discard(id(table))
+            if not self._pending:
+                self.close()
+
+    def _chunk(self, offset):
+        """
+        Reads a length prefixed chunk of the file.
+
+        :param int offset:  The offset of the chunk's length.
+        :return:  A tuple of the chunk and the offset after it.
+        """
+        length, = _LENGTH.unpack(self._buffer[offset:offset + _LENGTH.size])
+        offset += _LENGTH.size
+        return self._buffer[offset:offset + length], offset + length
+
+    def load(self):
+        """
+        Loads the model; its tables are loaded when first used.
+
+        :return:  The model.
+        """
+        data, base = self._chunk(self._model)
+        unpickler = _SnapshotUnpickler(io.BytesIO(data), self, base)
+        model = unpickler.load()
+        self._pending = set(id(t) for t in unpickler.tables.values())
+        if not self._pending:
+            self.close()
+        return model
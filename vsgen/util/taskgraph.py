@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+"""
+This module provides all functionality for running a graph of dependent tasks.
+
+The module defines the class VSGTaskGraph.  The VSGTaskGraph class runs each task as soon as the tasks it depends on are complete, in a pool of threads, and reports the graph's critical path: the chain of dependent tasks whose durations add up to the longest time.
+"""
+
+import threading
+from timeit import default_timer
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+from vsgen.util.logger import VSGLogger
+
+
+class VSGTask(object):
+    """
+    The VSGTask class is a node of a :class:`VSGTaskGraph`.
+
+    :ivar key:                The key of the task in its graph.
+    :ivar str label:          The display name of the task.
+    :ivar list dependencies:  The keys of the tasks that must complete before this task starts.
+    :ivar list after:         The keys of the tasks that must complete, fail or be skipped before this task starts.
+    :ivar float start:        The time the task started; None if it did not run.
+    :ivar float end:          The time the task completed; None if it did not run.
+    :ivar error:              The exception raised by the task; None if it succeeded or did not run.
+    """
+
+    def __init__(self, key, function, dependencies, label, after=()):
+        """
+        Constructor.
+
+        :param key:               The key of the task in its graph.
+        :param callable function: The function to call.
+        :param list dependencies: The keys of the tasks that must complete before this task starts.
+        :param str label:         The display name of the task.
+        :param list after:        The keys of the tasks that must complete, fail or be skipped before this task starts.
+        """
+        self.key = key
+        self.function = function
+        self.dependencies = list(dependencies)
+        self.after = list(after)
+        self.label = label
+        self.dependents = []
+        self.followers = []
+        self.start = None
+        self.end = None
+        self.error = None
+
+    @property
+    def duration(self):
+        """
+        Returns the duration of the task in seconds; 0 if it did not run.
+        """
+        return self.end - self.start if self.end is not None else 0.0
+
+    def run(self):
+        """
+        Calls the task's function, recording its times and its exception.
+        """
+        self.start = default_timer()
+        try:
+            self.function()
+        except Exception as e:
+            self.error = e
+        self.end = default_timer()
+
+
+class VSGTaskGraph(object):
+    """
+    The VSGTaskGraph class runs a collection of tasks in the order of their dependencies.
+
+    A task can only depend on tasks already added to the graph, so the graph cannot have cycles and the order the tasks are added in is a valid serial order.  A task whose dependency fails is skipped; a task that only runs after another one runs whether the other one succeeds or not.
+    """
+
+    def __init__(self):
+        """
+        Constructor.
+        """
+        self._tasks = {}
+        self._order = []
+        self.start = None
+        self.end = None
+
+    def __len__(self):
+        return len(self._order)
+
+    def __getitem__(self, key):
+        return self._tasks[key]
+
+    def add(self, key, function, dependencies=(), label=None, after=()):
+        """
+        Adds a task to the graph.
+
+        :param key:                The hashable key of the task.
+        :param callable function:  The function to call.
+        :param list dependencies:  The keys of the tasks, already in the graph, that must complete before this task starts.
+        :param str label:          The display name of the task; if not provided the key's text is used.
+        :param list after:         The keys of the tasks, already in the graph, that must complete, fail or be skipped before this task starts; their failures are not propagated to this task.
+        :return:  The key of the task.
+        """
+        if key in self._tasks:
+            raise ValueError('Task {!r} is already in the graph.'.format(key))
+        missing = [d for d in list(dependencies) + list(after) if d not in self._tasks]
+        if missing:
+            raise ValueError('Task {!r} depends on tasks that are not in the graph: {!r}.'.format(key, missing))
+        task = self._tasks[key] = VSGTask(key, function, dependencies, label or str(key), after)
+        for d in task.dependencies:
+            self._tasks[d].dependents.append(task)
+        for d in task.after:
+            self._tasks[d].followers.append(task)
+        self._order.append(task)
+        return key
+
+    def run(self, threads=1):
+        """
+        Runs the tasks, each as soon as its dependencies are complete.
+
+        :param int threads:  The number of threads running tasks concurrently; 1 runs the tasks one after another in the order they were added.
+        :return:  The list of failed tasks, in the order they were added.
+        """
+        self.start = default_timer()
+        if threads <= 1 or len(self._order) <= 1:
+            for task in self._order:
+                if not any(self._tasks[d].error is not None or self._tasks[d].end is None for d in task.dependencies):
+                    task.run()
+        else:
+            self._run_threads(threads)
+        self.end = default_timer()
+        return [t for t in self._order if t.error is not None]
+
+    def _run_threads(self, threads):
+        """
+        Runs the tasks in a pool of threads.
+
+        :param int threads:  The number of threads.
+        """
+        ready = queue.Queue()
+        lock = threading.Lock()
+        waiting = dict((t.key, len(t.dependencies) + len(t.after)) for t in self._order)
+        remaining = [len(self._order)]
+        skipped = set()
+        done = threading.Event()
+
+        def complete(task):
+            # Schedule the dependents of a task, or skip them (and theirs) if it did not succeed; schedule its followers either way.
+            with lock:
+                stack = [task]
+                while stack:
+                    t = stack.pop()
+                    remaining[0] -= 1
+                    for dependent in t.dependents:
+                        waiting[dependent.key] -= 1
+                        if t.error is not None or t.key in skipped:
+                            if dependent.key not in skipped:
+                                skipped.add(dependent.key)
+                                stack.append(dependent)
+                        elif waiting[dependent.key] == 0 and dependent.key not in skipped:
+                            ready.put(dependent)
+                    for follower in t.followers:
+                        waiting[follower.key] -= 1
+                        if waiting[follower.key] == 0 and follower.key not in skipped:
+                            ready.put(follower)
+                if remaining[0] == 0:
+                    done.set()
+
+        def work():
+            while True:
+                task = ready.get()
+                if task is None:
+                    return
+                try:
+                    task.run()
+                finally:
+                    complete(task)
+
+        for task in self._order:
+            if not task.dependencies and not task.after:
+                ready.put(task)
+        workers = [threading.Thread(target=work) for _ in range(min(threads, len(self._order)))]
+        for w in workers:
+            w.daemon = True
+            w.start()
+        done.wait()
+        for w in workers:
+            ready.put(None)
+        for w in workers:
+            w.join()
+
+    def critical_path(self):
+        """
+        Returns the critical path of the completed tasks.
+
+        :return:  The list of tasks of the longest chain of dependent tasks, weighted by their durations.
+        """
+        length, previous = {}, {}
+        for task in self._order:
+            predecessors = task.dependencies + task.after
+            before = max(predecessors, key=lambda d: length[d]) if predecessors else None
+            length[task.key] = task.duration + (length[before] if before is not None else 0.0)
+            previous[task.key] = before
+        if not length:
+            return []
+        key = max(self._order, key=lambda t: length[t.key]).key
+        path = []
+        while key is not None:
+            path.append(self._tasks[key])
+            key = previous[key]
+        return path[::-1]
+
+    def span(self, keys):
+        """
+        Returns the time between the start of the first and the end of the last of a collection of tasks.
+
+        :param list keys:  The keys of the tasks.
+        :return:  The time in seconds; 0 if none of the tasks ran.
+        """
+        tasks = [self._tasks[k] for k in keys if self._tasks[k].end is not None]
+        return max(t.end for t in tasks) - min(t.start for t in tasks) if tasks else 0.0
+
+    def log(self, name):
+        """
+        Logs a summary of the completed tasks and their critical path.
+
+        :param str name:  The python logger log name.
+        """
+        path = self.critical_path()
+        VSGLogger.info(name, 'Completed %s tasks (%s seconds of work) in %s seconds.', len(self._order), sum(t.duration for t in self._order), (self.end or 0.0) - (self.start or 0.0))
+        if path:
+            VSGLogger.info(name, 'Critical path of %s seconds: %s', sum(t.duration for t in path), ' -> '.join('{} ({:.3f}s)'.format(t.label, t.duration) for t in path))
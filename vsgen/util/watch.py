@@ -0,0 +1,335 @@
+# -*- coding: utf-8 -*-
+"""
+This module provides all functionality for watching directories for file changes.
+
+The module defines the classes VSGInotifyWatcher and VSGPollingWatcher.  Both watchers report the paths that were added, removed or renamed under a collection of root directories, and the control files (the ``.vsgenignore`` files and any additional files such as manifests) that were modified; the VSGInotifyWatcher uses Linux's inotify API and the VSGPollingWatcher periodically compares the entries of the directories and the modification times of the control files.
+
+Both watchers skip the ``.git`` directories, the directories excluded by ``.vsgenignore`` files and the directories an optional exclusion function rejects, and ignore the changes of the paths they are told to ignore, such as the files the watch writes itself.
+"""
+
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+
+from vsgen.util.ignore import IGNORE_FILENAME, ignore_walk
+from vsgen.util.logger import VSGLogger
+
+
+def _mtime(path):
+    """
+    Returns the modification time of a path or None if it does not exist.
+    """
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def _excluded(dirpath, exclude=None):
+    """
+    Returns True if a directory is not watched.
+
+    :param str dirpath:      The absolute path of the directory.
+    :param exclude:          An optional function that returns True for the absolute path of a directory that is not watched.
+    """
+    return os.path.basename(dirpath) == '.git' or bool(exclude and exclude(dirpath))
+
+
+def _walk(root, exclude=None):
+    """
+    Walks the directories to watch under a root directory.
+
+    :param str root:         The absolute path of the directory.
+    :param exclude:          An optional function that returns True for the absolute path of a directory that is not watched.
+    :return:  A generator of ``(root, dirnames, filenames)`` triplets compatible with :func:`os.walk`.
+    """
+    for dirpath, dirnames, filenames in ignore_walk(os.walk(root)):
+        dirnames[:] = [d for d in dirnames if not _excluded(os.path.join(dirpath, d), exclude)]
+        yield dirpath, dirnames, filenames
+
+
+class VSGPollingWatcher(object):
+    """
+    The VSGPollingWatcher class reports the directories whose entries change and the control files that are modified by periodically comparing the directories' entries and the control files' modification times.
+    """
+
+    def __init__(self, roots, interval=1.0, files=(), exclude=None, ignore=()):
+        """
+        Constructor.
+
+        :param list roots:       The absolute paths of the directories to watch recursively.
+        :param float interval:   The time in seconds between two scans of the directories.
+        :param list files:       The absolute paths of additional files whose modifications are reported.
+        :param exclude:          An optional function that returns True for the absolute path of a directory that is not watched.
+        :param list ignore:      The absolute paths whose creation, removal or renaming is not reported.
+        """
+        self._roots = list(roots)
+        self._files = [os.path.normpath(f) for f in files]
+        self._exclude = exclude
+        self._ignore = set(os.path.normpath(i) for i in ignore)
+        self._interval = interval
+        self._snapshot = self._scan()
+
+    def __enter__(self):
+        """
+        Enter the runtime context related to this object.
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        """
+        Exit the runtime context related to this object.
+        """
+        self.close()
+        return False
+
+    def _scan(self):
+        """
+        Returns the entries of every directory under the roots and the modification time of every ``.vsgenignore`` file under the roots and of the additional files.
+        """
+        snapshot = dict((f, _mtime(f)) for f in self._files)
+        for root in self._roots:
+            for dirpath, dirnames, filenames in _walk(root, self._exclude):
+                snapshot[dirpath] = frozenset(n for n in dirnames + filenames if os.path.join(dirpath, n) not in self._ignore)
+                if IGNORE_FILENAME in filenames:
+                    path = os.path.join(dirpath, IGNORE_FILENAME)
+                    snapshot[path] = _mtime(path)
+        return snapshot
+
+    def wait(self, timeout=None):
+        """
+        Waits for changes.
+
+        :param float timeout:  The maximum time in seconds to wait; a None value waits until a change is detected.
+        :return:  The set of directories that have changed.
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            delay = self._interval if deadline is None else max(0, min(self._interval, deadline - time.time()))
+            time.sleep(delay)
+            snapshot = self._scan()
+            changes = set(p for p in set(snapshot) | set(self._snapshot) if snapshot.get(p) != self._snapshot.get(p))
+            self._snapshot = snapshot
+            if changes or (deadline is not None and time.time() >= deadline):
+                return changes
+
+    def close(self):
+        """
+        Releases the watcher's resources.
+        """
+        self._snapshot = {}
+
+
+class VSGInotifyWatcher(object):
+    """
+    The VSGInotifyWatcher class reports the paths that are created, deleted or moved, and the control files that are modified, using Linux's inotify API.
+
+    If a directory created while watching cannot be watched, for instance because the inotify watch limit is reached, the watcher falls back to a :class:`VSGPollingWatcher`.
+    """
+    IN_MODIFY = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_MOVE_SELF = 0x00000800
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ONLYDIR = 0x01000000
+    IN_ISDIR = 0x40000000
+    IN_NONBLOCK = 0x00000800
+    IN_CLOEXEC = 0x00080000
+
+    MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+
+    EVENT = struct.Struct('iIII')
+
+    def __init__(self, roots, interval=1.0, files=(), exclude=None, ignore=()):
+        """
+        Constructor.
+
+        :param list roots:       The absolute paths of the directories to watch recursively.
+        :param float interval:   The time in seconds between two scans of the directories if the watcher falls back to polling.
+        :param list files:       The absolute paths of additional files whose modifications are reported.
+        :param exclude:          An optional function that returns True for the absolute path of a directory that is not watched.
+        :param list ignore:      The absolute paths whose changes are not reported.
+        """
+        if not self.available():
+            raise OSError(errno.ENOSYS, 'inotify is not available on this platform')
+
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self._fd = self._libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self._fd < 0:
+            e = ctypes.get_errno()
+            raise OSError(e, os.strerror(e))
+
+        self._roots = list(roots)
+        self._files = set(os.path.normpath(f) for f in files)
+        self._exclude = exclude
+        self._ignore = set(os.path.normpath(i) for i in ignore)
+        self._interval = interval
+        self._watches = {}
+        self._control = set()
+        self._fallback = None
+        try:
+            for root in self._roots:
+                self._add(root)
+
+            # Watch the directories of the additional files outside of the roots for those files only.
+            watched = set(self._watches.values())
+            for dirpath in set(os.path.dirname(f) for f in self._files) - watched:
+                wd = self._watch(dirpath)
+                if wd is not None:
+                    self._control.add(wd)
+        except OSError:
+            self.close()
+            raise
+
+    def __enter__(self):
+        """
+        Enter the runtime context related to this object.
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        """
+        Exit the runtime context related to this object.
+        """
+        self.close()
+        return False
+
+    @staticmethod
+    def available():
+        """
+        Returns True if the inotify API is available on this platform.
+        """
+        if not sys.platform.startswith('linux'):
+            return False
+        library = ctypes.util.find_library('c')
+        return bool(library) and hasattr(ctypes.CDLL(library), 'inotify_init1')
+
+    def _watch(self, dirpath):
+        """
+        Watches a single directory.
+
+        :param str dirpath:  The absolute path of the directory.
+        :return:  The watch descriptor or None if the directory does not exist.
+        """
+        wd = self._libc.inotify_add_watch(self._fd, dirpath.encode(sys.getfilesystemencoding()), self.MASK)
+        if wd < 0:
+            e = ctypes.get_errno()
+            if e in (errno.ENOENT, errno.ENOTDIR):
+                return None
+            raise OSError(e, '{}: {}'.format(os.strerror(e), dirpath))
+        self._watches[wd] = dirpath
+        return wd
+
+    def _add(self, root):
+        """
+        Watches a directory and all of its subdirectories.
+
+        :param str root:  The absolute path of the directory.
+        """
+        for dirpath, dirnames, filenames in _walk(root, self._exclude):
+            wd = self._watch(dirpath)
+            self._control.discard(wd)
+
+    def wait(self, timeout=None):
+        """
+        Waits for changes.
+
+        :param float timeout:  The maximum time in seconds to wait; a None value waits until a change is detected.
+        :return:  The set of paths that have changed.
+        """
+        if self._fallback is not None:
+            return self._fallback.wait(timeout)
+
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return set()
+
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except OSError as e:
+            if e.errno == errno.EAGAIN:
+                return set()
+            raise
+
+        changes = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, cookie, length = self.EVENT.unpack_from(data, offset)
+            offset += self.EVENT.size
+            name = data[offset:offset + length].rstrip(b'\0').decode(sys.getfilesystemencoding())
+            offset += length
+
+            if mask & self.IN_Q_OVERFLOW:
+                changes.update(self._roots)
+                continue
+
+            dirpath = self._watches.get(wd)
+            if dirpath is None:
+                continue
+            if mask & self.IN_IGNORED:
+                del self._watches[wd]
+                continue
+
+            # Report the modified control files and the changes of the directories outside the roots to the additional files only.
+            path = os.path.join(dirpath, name) if name else dirpath
+            if path in self._ignore or (mask & self.IN_ISDIR and _excluded(path, self._exclude)):
+                continue
+            if mask & (self.IN_MODIFY | self.IN_CLOSE_WRITE):
+                if path in self._files or (name == IGNORE_FILENAME and wd not in self._control):
+                    changes.add(path)
+                continue
+            if wd in self._control and path not in self._files:
+                continue
+            changes.add(path)
+            if mask & self.IN_ISDIR and mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                try:
+                    self._add(path)
+                except OSError as e:
+                    # Any change may be missed from now on, so report every root.
+                    VSGLogger.warning(__name__, 'Could not watch %s with inotify (%s); falling back to polling.', path, e)
+                    self.close()
+                    self._fallback = VSGPollingWatcher(self._roots, self._interval, self._files, self._exclude, self._ignore)
+                    changes.update(self._roots)
+                    break
+        return changes
+
+    def close(self):
+        """
+        Releases the watcher's resources.
+        """
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+        self._watches = {}
+        if self._fallback is not None:
+            self._fallback.close()
+
+
+def make_watcher(roots, poll=False, interval=1.0, files=(), exclude=None, ignore=()):
+    """
+    Creates the best available watcher for a collection of directories.
+
+    :param list roots:      The absolute paths of the directories to watch recursively.
+    :param bool poll:       Flag to force the polling watcher.
+    :param float interval:  The polling watcher's time in seconds between two scans of the directories.
+    :param list files:      The absolute paths of additional files whose modifications are reported.
+    :param exclude:         An optional function that returns True for the absolute path of a directory that is not watched.
+    :param list ignore:     The absolute paths whose changes are not reported.
+    :return:  A VSGInotifyWatcher instance if available; a VSGPollingWatcher instance otherwise.
+    """
+    if not poll and VSGInotifyWatcher.available():
+        try:
+            return VSGInotifyWatcher(roots, interval, files, exclude, ignore)
+        except OSError as e:
+            VSGLogger.warning(__name__, 'Could not watch with inotify (%s); falling back to polling.', e)
+    return VSGPollingWatcher(roots, interval, files, exclude, ignore)
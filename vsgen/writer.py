@@ -4,10 +4,9 @@ This module provides a simple multi-threaded writer utility for VSGProjects and
 """
 import os
 import sys
-import time
+import timeit
 import threading
 import itertools
-import jinja2
 import errno
 
 
@@ -18,7 +17,9 @@ class VSGJinjaRenderer(object):
 
     def render(self, template, filename, context={}, filters={}):
         """
-        Renders a Jinja2 template to text.
+        Renders a Jinja2 template to a file.
+
+        The text is streamed to the file as it is rendered so that templates iterating over lazy collections are written while the collections are generated.
         """
         filename = os.path.normpath(filename)
         path, file = os.path.split(filename)
@@ -28,14 +29,16 @@ class VSGJinjaRenderer(object):
             if exception.errno != errno.EEXIST:
                 raise
 
+        # Jinja2 is only imported when something is rendered.
+        import jinja2
+
         path, file = os.path.split(template)
         loader = jinja2.FileSystemLoader(path)
         env = jinja2.Environment(loader=loader, trim_blocks=True, lstrip_blocks=True)
         env.filters.update(filters)
         template = env.get_template(file)
-        text = template.render(context)
         with open(filename, 'wt') as f:
-            f.write(text)
+            template.stream(context).dump(f)
 
 
 class VSGWritable(object):
@@ -122,9 +125,9 @@ class VSGWriteCommand(object):
         from vsgen.util.logger import VSGLogger
 
         VSGLogger.info(self._logname, self._message)
-        start = time.clock()
+        start = timeit.default_timer()
         VSGWriter.write(self._writables, self._parallel)
-        end = time.clock()
+        end = timeit.default_timer()
         VSGLogger.info(self._logname, "Wrote %s files in %s seconds:", len(self._writables), end - start)
 
 
@@ -150,6 +153,20 @@ class VSGWriter(threading.Thread):
         The Thread's execution function.
         """
         for pyitem in self._pylist:
+            VSGWriter.write_item(pyitem)
+
+    @staticmethod
+    def write_item(pyitem):
+        """
+        Writes a single VSG object; a project's lazy files are generated once for the whole write (see :meth:`~vsgen.project.VSGProject.rendering`).
+
+        :param object pyitem: A VSG object (PrProject, VSGSolution, etc)
+        """
+        rendering = getattr(pyitem, 'rendering', None)
+        if rendering is None:
+            pyitem.write()
+            return
+        with rendering():
             pyitem.write()
 
     @staticmethod